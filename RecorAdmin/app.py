@@ -2,10 +2,8 @@ import json
 import os
 import traceback
 
-from recor_category_transformer.libs.services.category_transformer_service import (
-    CategoryTransformerService,
-)
-from recor_admin.libs.models.reset_request import ResetRequest
+from recor_admin.libs.services.reset_service import ResetService
+from recor_layer.services.registry import registry
 
 
 def lambda_handler(event, context):
@@ -33,7 +31,7 @@ def lambda_handler(event, context):
     try:
         request_type = event.get("request_type").lower()
         if request_type == "reset":
-            service = ResetRequest()
+            service = registry.get(ResetService)
         else:
             raise Exception("Invalid request type")
         service.run()
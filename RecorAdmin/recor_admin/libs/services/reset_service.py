@@ -1,4 +1,6 @@
+from recor_layer.services.aws.dynamodb.category_snapshot import CategorySnapshotStore
 from recor_layer.services.aws.dynamodb.dynamodb_service import DynamoDBService
+from recor_layer.services.registry import registry
 from recor_layer.services.woocommerce.woocommerce_service import WooCommerceService
 
 
@@ -11,8 +13,10 @@ class ResetService:
         """
         Initializes the ResetService.
         """
-        self.dynamodb_service = DynamoDBService(region_name)
-        self.woocommerce_service = WooCommerceService()
+        self.dynamodb_service = registry.get(DynamoDBService, region_name)
+        self.woocommerce_service = registry.get(WooCommerceService)
+        self.category_snapshot_store = CategorySnapshotStore(self.dynamodb_service)
+        self.counter_table_name = "iml-counter"
 
     def run(self) -> None:
         """
@@ -46,6 +50,7 @@ class ResetService:
         )
         self.dynamodb_service.delete_all_dynamodb_items("iml-category-id-table")
         print("SUCCESS: Successfully deleted ids from iml-category-id-table")
+        self.category_snapshot_store.bump_version()
 
         # Delete all categories from Woocommerce
         self.woocommerce_service.delete_categories(woocommerce_category_ids)
@@ -2,6 +2,8 @@ import json
 import os
 import traceback
 
+from recor_layer.metrics import metrics
+from recor_layer.services.registry import registry
 from recor_category_transformer.libs.services.category_transformer_service import (
     CategoryTransformerService,
 )
@@ -32,7 +34,7 @@ def lambda_handler(event, context):
     try:
         max_batch_categories = int(os.getenv("IML_MAX_BATCH_CATEGORIES"))
         max_total_categories = int(os.getenv("IML_MAX_TOTAL_CATEGORIES"))
-        CategoryTransformerService().run(
+        registry.get(CategoryTransformerService).run(
             max_batch_categories=max_batch_categories,
             max_total_categories=max_total_categories,
         )
@@ -41,6 +43,8 @@ def lambda_handler(event, context):
 
         print(f"ERROR: {e}")
         traceback.print_exc()
+    finally:
+        metrics.flush()
 
     return {
         "statusCode": 200,
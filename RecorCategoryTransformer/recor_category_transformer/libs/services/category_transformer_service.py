@@ -1,7 +1,12 @@
 from typing import Dict, List, Set
 
+from recor_layer.log import log
+from recor_layer.metrics import metrics
+from recor_layer.services.aws.dynamodb.category_snapshot import CategorySnapshotStore
 from recor_layer.services.aws.dynamodb.dynamodb_service import DynamoDBService
+from recor_layer.services.cache.ttl_cache import category_id_cache
 from recor_layer.services.iml.iml_service import ImlService
+from recor_layer.services.registry import registry
 from recor_layer.services.woocommerce.woocommerce_service import WooCommerceService
 from recor_layer.transformers.iml.iml_category_transformer import ImlCategoryTransformer
 
@@ -38,45 +43,65 @@ class CategoryTransformerService:
     def __init__(self, region_name: str = "us-east-1"):
         """Initializes the CategoryTransformerService with necessary services."""
         self.iml_category_transformer = ImlCategoryTransformer()
-        self.woocommerce_service = WooCommerceService()
-        self.iml_service = ImlService()
-        self.dynamodb_service = DynamoDBService(region_name)
+        self.woocommerce_service = registry.get(WooCommerceService)
+        self.iml_service = registry.get(ImlService)
+        self.dynamodb_service = registry.get(DynamoDBService, region_name)
+        self.category_snapshot_store = CategorySnapshotStore(self.dynamodb_service)
+        self.category_snapshot = None
 
     def _fetch_existing_category_map(self, category_ids: Set[str]) -> Dict[str, int]:
-        """Fetches the mapping of IML category IDs to WooCommerce category IDs from DynamoDB."""
+        """
+        Fetches the mapping of IML category IDs to WooCommerce category IDs.
+
+        IDs are resolved from the category snapshot loaded at the start of the run.
+        The ones it does not map are read from DynamoDB, which also covers the
+        categories written since.
+        """
+        category_id_map = {}
+        if self.category_snapshot is not None:
+            category_id_map = self.category_snapshot.get_many(category_ids)
+            category_ids = category_ids - category_id_map.keys()
+        if not category_ids:
+            return category_id_map
+
         keys = [{"category_id": category_id} for category_id in category_ids]
         category_items = self.dynamodb_service.get_batch_items(
-            "iml-category-id-table", keys
+            "iml-category-id-table",
+            keys,
+            attributes=("category_id", "woocommerce_category_id"),
         )
-        return {
-            item["category_id"]: item.get("woocommerce_category_id")
-            for item in category_items
-        }
+        category_id_map.update(
+            {
+                item["category_id"]: item.get("woocommerce_category_id")
+                for item in category_items
+            }
+        )
+        return category_id_map
 
     def _transform_iml_categories(
         self, iml_categories: List[Dict], category_id_map: Dict[str, int]
     ) -> List[Dict]:
         """Transforms a list of IML categories into WooCommerce category format."""
-        return [
-            self.iml_category_transformer.transform(
-                {
-                    **iml_category,
-                    ImlCategoryTransformer.CATEGORY_ID_MAP: category_id_map,
-                }
-            )
-            for iml_category in iml_categories
-        ]
+        return self.iml_category_transformer.transform_many(
+            iml_categories, {ImlCategoryTransformer.CATEGORY_ID_MAP: category_id_map}
+        )
 
     def _write_categories_to_woocommerce(
         self, new_categories: List[Dict]
     ) -> List[Dict]:
         """Creates new categories in WooCommerce."""
-        print("ATTEMPT: Updating WooCommerce categories: ", new_categories)
+        log.attempt("Creating %d WooCommerce categories", len(new_categories))
         response = self.woocommerce_service.batch_update_categories(
             new_categories=new_categories, old_categories=[]
         )  # We are only creating, not updating
-        print("SUCCESS: Batch updated categories, response: ", response)
-        return response.get("create", [])
+        woocommerce_create_response = response.get("create", [])
+        log.success(
+            "Batch updated categories: %d of %d created",
+            sum("error" not in category for category in woocommerce_create_response),
+            len(new_categories),
+        )
+        log.debug("Batch updated categories, response: %s", response)
+        return woocommerce_create_response
 
     def _save_category_mappings(
         self, woocommerce_create_response: List[Dict]
@@ -86,9 +111,8 @@ class CategoryTransformerService:
         items_to_write = []
         for new_woocommerce_category in woocommerce_create_response:
             if "error" in new_woocommerce_category:
-                print(
-                    "ERROR: Unable to create WooCommerce category: ",
-                    new_woocommerce_category,
+                log.error(
+                    "Unable to create WooCommerce category: %s", new_woocommerce_category
                 )
                 continue  # Important: Handle errors in individual category creation
             woocommerce_category_id = new_woocommerce_category["id"]
@@ -102,8 +126,11 @@ class CategoryTransformerService:
 
         if items_to_write:
             self.dynamodb_service.put_batch_items(
-                "iml-category-id-table", items_to_write
+                "iml-category-id-table", items_to_write, key_names=("category_id",)
             )
+            # Replace cached entries, including IDs cached as missing
+            category_id_cache.put_many(new_category_id_map)
+            self.category_snapshot_store.bump_version()
         return new_category_id_map
 
     def run(self, max_batch_categories: int, max_total_categories: int):
@@ -114,23 +141,28 @@ class CategoryTransformerService:
             max_batch_categories: The maximum number of categories to process in each batch.
             max_total_categories: The maximum number of categories to process in total.
         """
-        all_categories = self.iml_service.get_category_list()  # Use ImlService
+        with metrics.span("iml_fetch") as span:
+            all_categories = self.iml_service.get_category_list()  # Use ImlService
+            span.add(items=len(all_categories))
+        self.category_snapshot = self.category_snapshot_store.load()
         if len(all_categories) > max_total_categories:
-            print(
-                f"Transforming ({max_total_categories}/{len(all_categories)}) categories"
+            log.attempt(
+                "Transforming (%d/%d) categories", max_total_categories, len(all_categories)
             )
             remaining_categories = all_categories[:max_total_categories]
         else:
             remaining_categories = all_categories
 
         while len(remaining_categories) > 0:
-            print(
-                f"Transforming first {max_batch_categories} of remaining {len(remaining_categories)} categories"
+            log.attempt(
+                "Transforming first %d of remaining %d categories",
+                max_batch_categories,
+                len(remaining_categories),
             )
             categories = remaining_categories[:max_batch_categories]
             remaining_categories = remaining_categories[max_batch_categories:]
             self.transform_and_write_categories(categories, all_categories)
-        print("SUCCESS: transformed categories")
+        log.success("transformed categories")
 
     def transform_and_write_categories(
         self, categories: List[Dict], all_categories: List[Dict]
@@ -149,9 +181,10 @@ class CategoryTransformerService:
             )
 
         # Identify Existing Categories
-        old_category_id_map = self._fetch_existing_category_map(
-            set(parent_category_id_map.keys())
-        )
+        with metrics.span("category_lookup", items=len(parent_category_id_map)):
+            old_category_id_map = self._fetch_existing_category_map(
+                set(parent_category_id_map.keys())
+            )
 
         new_iml_category_ids = (
             parent_category_id_map.keys() - old_category_id_map.keys()
@@ -197,9 +230,17 @@ class CategoryTransformerService:
             if str(iml_category["category_id"]) in category_ids
         ]
         if new_iml_categories:
-            new_categories = self._transform_iml_categories(
-                new_iml_categories, category_id_map
-            )
-            woocommerce_response = self._write_categories_to_woocommerce(new_categories)
-            new_category_mappings = self._save_category_mappings(woocommerce_response)
+            with metrics.span("transform", items=len(new_iml_categories)):
+                new_categories = self._transform_iml_categories(
+                    new_iml_categories, category_id_map
+                )
+            with metrics.span("woocommerce_batch", items=len(new_categories)):
+                woocommerce_response = self._write_categories_to_woocommerce(
+                    new_categories
+                )
+            with metrics.span("mapping_write", items=len(woocommerce_response)):
+                new_category_mappings = self._save_category_mappings(
+                    woocommerce_response
+                )
             category_id_map.update(new_category_mappings)
+            metrics.count("categories_created", len(new_category_mappings))
@@ -2,6 +2,8 @@ import json
 import os
 import traceback
 
+from recor_layer.metrics import metrics
+from recor_layer.services.registry import registry
 from recor_product_getter.libs.services.product_getter_service import (
     ProductGetterService,
 )
@@ -32,14 +34,19 @@ def lambda_handler(event, context):
     try:
         max_batch_items = int(os.getenv("IML_MAX_BATCH_ITEMS"))
         max_total_items = int(os.getenv("IML_MAX_TOTAL_ITEMS"))
-        ProductGetterService().run(
-            max_batch_items=max_batch_items, max_total_items=max_total_items
+        checkpoint_interval = int(os.getenv("IML_CHECKPOINT_INTERVAL", 1))
+        registry.get(ProductGetterService).run(
+            max_batch_items=max_batch_items,
+            max_total_items=max_total_items,
+            checkpoint_interval=checkpoint_interval,
         )
 
     except Exception as e:
 
         print(f"ERROR: {e}")
         traceback.print_exc()
+    finally:
+        metrics.flush()
 
     return {
         "statusCode": 200,
@@ -1,13 +1,99 @@
 import os
-from json import dumps
-from typing import Iterator, List
+import threading
+from dataclasses import dataclass, field
+from queue import Queue
+from typing import Callable, Iterator, List, Optional, Tuple
 
-import ijson
-from recor_layer.services.aws.sqs.sqs_service import SQSService
+from recor_layer.log import log
+from recor_layer.metrics import metrics
+from recor_layer.services.aws.sqs.claim_check import check_in, get_claim_check_store
+from recor_layer.services.aws.sqs.message_codec import encode_messages, get_codec
+from recor_layer.services.aws.sqs.sqs_service import (
+    MAX_BATCH_ENTRIES,
+    MAX_MESSAGE_BYTES,
+    JsonMessagePacker,
+    SQSService,
+    message_attributes_bytes,
+    message_group_partition,
+)
 from recor_layer.services.iml.iml_service import ImlService
-from recor_product_getter.libs.services.utils.file_response import FileResponse
+from recor_layer.services.registry import registry
+from recor_product_getter.libs.services.utils.checkpointer import Checkpointer
+from recor_product_getter.libs.services.utils.completion_tracker import (
+    CompletionTracker,
+)
+from recor_product_getter.libs.services.utils.content_decoder import ContentDecoder
+from recor_product_getter.libs.services.utils.file_response import (
+    DEFAULT_BUFFER_SIZE,
+    open_file_response,
+)
+from recor_product_getter.libs.services.utils.item_coalescer import ItemCoalescer
+from recor_product_getter.libs.services.utils.item_info_parser import ItemInfoParser
 from requests import Response
 
+DEFAULT_PUBLISHER_WORKERS = 4
+DEFAULT_COALESCE_WINDOW = 50
+DEFAULT_QUEUE_PARTITIONS = 1
+# Upper bound of a message payload offloaded to the claim-check store
+CLAIM_CHECK_MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+
+@dataclass
+class PublishBatch:
+    """
+    A group of SQS messages handed from the parser to a publisher worker.
+    """
+
+    batch_count: int
+    message_bodies: List[str]
+    item_count: int
+    max_update_seq: Optional[int] = None
+    partition: int = 0
+
+
+def _update_seq(item: dict) -> Optional[int]:
+    update_seq = item.get("update_seq")
+    return None if update_seq is None else int(update_seq)
+
+
+def _max_update_seq(current: Optional[int], item: dict) -> Optional[int]:
+    update_seq = _update_seq(item)
+    if update_seq is None or (current is not None and current >= update_seq):
+        return current
+    return update_seq
+
+
+@dataclass
+class PartitionBuffer:
+    """
+    Items and encoded messages of a partition that have not been published yet.
+    """
+
+    packer: JsonMessagePacker
+    messages: List[Tuple[str, List[dict]]] = field(default_factory=list)
+    min_update_seq: Optional[int] = None
+
+    def track(self, item: dict) -> None:
+        """
+        Records the update_seq of an item added to the partition.
+        """
+        update_seq = _update_seq(item)
+        if update_seq is not None and (
+            self.min_update_seq is None or update_seq < self.min_update_seq
+        ):
+            self.min_update_seq = update_seq
+
+    def reset_update_seq(self) -> None:
+        """
+        Recomputes the lowest buffered update_seq after messages were published.
+        """
+        self.min_update_seq = None
+        for _, message_items in self.messages:
+            for item in message_items:
+                self.track(item)
+        for item in self.packer.items:
+            self.track(item)
+
 
 class ImlItemPublisherService:
     """
@@ -18,11 +104,35 @@ class ImlItemPublisherService:
         """
         Initializes the ImlItemPublisherService.
         """
-        self.iml_service = ImlService()
+        self.iml_service = registry.get(ImlService)
         self.queue_url = os.getenv("SQS_QUEUE_URL")
         if not self.queue_url:
             raise ValueError("SQS_QUEUE_URL environment variable must be set")
         self.sqs_service = SQSService(self.queue_url)  # Use SQSService
+        self.message_codec = get_codec(os.getenv("IML_MESSAGE_CODEC"))
+        self.claim_check_store = get_claim_check_store(os.getenv("CLAIM_CHECK_URL"))
+        self.coalesce_window = int(
+            os.getenv("IML_COALESCE_WINDOW", DEFAULT_COALESCE_WINDOW)
+        )
+        # Message groups only exist on FIFO queues, so standard queues keep one
+        # partition and fill every message and batch
+        self.queue_partitions = 1
+        if self.sqs_service.is_fifo:
+            self.queue_partitions = max(
+                1, int(os.getenv("IML_QUEUE_PARTITIONS", DEFAULT_QUEUE_PARTITIONS))
+            )
+        self.max_message_bytes = MAX_MESSAGE_BYTES - message_attributes_bytes(
+            self.message_codec.message_attributes()
+        )
+        self.publisher_workers = max(
+            1, int(os.getenv("IML_PUBLISHER_WORKERS", DEFAULT_PUBLISHER_WORKERS))
+        )
+        self.publisher_queue_size = max(
+            1,
+            int(
+                os.getenv("IML_PUBLISHER_QUEUE_SIZE", 2 * self.publisher_workers)
+            ),
+        )
 
     def _get_item_info_response(self, counter: int) -> Response:
         """
@@ -45,112 +155,362 @@ class ImlItemPublisherService:
             raise Exception(f"Error fetching item info from IML: {e}") from e
 
     def _extract_items_from_response(
-        self, response: Response, max_total_items: int
+        self, decoder: ContentDecoder, parser: ItemInfoParser
     ) -> Iterator[dict]:
         """
-        Extracts item data from the IML response.
+        Extracts item data from the IML response in a single streaming pass.
 
         Args:
-            response: The response object from the IML system.
-            max_total_items: The maximum number of items to extract.
+            decoder: Decompresses the IML response body as it is downloaded.
+            parser: The parser that yields items and records the last_update_seq.
 
         Returns:
             An iterator yielding individual item dictionaries.
         """
-        total_item_count = 0
-        for item in ijson.items(
-            FileResponse(response.iter_content(chunk_size=65536)),
-            "items.item",
-            use_float=True,
-        ):
-            if total_item_count >= max_total_items:
-                print(
-                    f"WARNING: Extracted {total_item_count} items, but maximum total is {max_total_items}."
-                )
-                break
-            total_item_count += 1
-            yield item
+        return parser.items(
+            open_file_response(decoder.iter_content(chunk_size=DEFAULT_BUFFER_SIZE))
+        )
 
-    def _send_batch_to_sqs(self, batch_items: List[dict], batch_count: int) -> None:
+    def _send_batch_to_sqs(
+        self,
+        message_bodies: List[str],
+        item_count: int,
+        batch_count: int,
+        partition: int = 0,
+    ) -> None:
         """
-        Sends a batch of items to the SQS queue using SQSService.
+        Sends a batch of messages to the SQS queue using SendMessageBatch.
+
+        Messages over the SQS size limit are written to the claim-check store
+        and replaced with messages that point to them. Messages are sent in
+        their packed order, which is the order within their FIFO message group.
 
         Args:
-            batch_items: The list of items to send in the batch.
+            message_bodies: The message bodies to send in the batch.
+            item_count: The number of items across the message bodies.
             batch_count: The current batch number.
+            partition: The partition of the batch, used as the FIFO message group.
         """
-        print(
-            f"ATTEMPT: Publishing Batch {batch_count} with {len(batch_items)} Items to {self.queue_url}"
+        message_group_id = f"partition-{partition}"
+        log.attempt(
+            "Publishing Batch %d with %d Messages and %d Items to %s",
+            batch_count,
+            len(message_bodies),
+            item_count,
+            self.queue_url,
         )
-        self.sqs_service.send_message(message_body=dumps(batch_items))
-        print(
-            f"SUCCESS: Published Batch {batch_count} with {len(batch_items)} Items to {self.queue_url}"
+        with metrics.span("sqs_publish", items=item_count) as span:
+            message_attributes = self.message_codec.message_attributes()
+            messages = []
+            claim_check_count = 0
+            for message_body in message_bodies:
+                message_bytes = len(message_body.encode("utf-8"))
+                span.add(bytes=message_bytes)
+                if message_bytes <= self.max_message_bytes:
+                    messages.append((message_body, message_attributes))
+                    continue
+                # Offloaded in place, so the message group keeps its order
+                messages.append(
+                    check_in(
+                        self.claim_check_store, message_body, self.message_codec.name
+                    )
+                )
+                claim_check_count += 1
+
+            if claim_check_count:
+                metrics.count("sqs_claim_checks", claim_check_count)
+            self.sqs_service.send_messages(messages, message_group_id)
+        log.success(
+            "Published Batch %d with %d Messages and %d Items to %s",
+            batch_count,
+            len(message_bodies),
+            item_count,
+            self.queue_url,
         )
 
-    def _extract_last_update_seq(self, response: Response) -> int:
+    def _publish_worker(
+        self,
+        work_queue: "Queue[Optional[PublishBatch]]",
+        tracker: CompletionTracker,
+        checkpointer: Checkpointer,
+        errors: List[Exception],
+        stop_event: threading.Event,
+    ) -> None:
         """
-        Extracts the last update sequence from the IML response.
+        Publishes batches from the work queue until it receives a sentinel.
+
+        After a failure in any worker the remaining batches are drained without
+        being published, so the parser is never left blocked on a full queue.
 
         Args:
-            response: The response object from the IML system.
+            work_queue: The bounded queue of batches to publish.
+            tracker: Tracks which batches have been published.
+            checkpointer: Persists the update_seq of the published batches.
+            errors: Collects the errors raised while publishing.
+            stop_event: Set once any worker has failed.
+        """
+        while True:
+            batch = work_queue.get()
+            try:
+                if batch is None:
+                    return
+                if stop_event.is_set():
+                    continue
+                self._send_batch_to_sqs(
+                    batch.message_bodies,
+                    batch.item_count,
+                    batch.batch_count,
+                    batch.partition,
+                )
+                checkpointer.update(
+                    *tracker.complete(batch.batch_count, batch.max_update_seq)
+                )
+            except Exception as e:
+                errors.append(e)
+                stop_event.set()
+            finally:
+                work_queue.task_done()
+
+    def _encode(
+        self, message: Optional[Tuple[str, List[dict]]], max_message_bytes: int
+    ) -> List[Tuple[str, List[dict]]]:
+        """
+        Encodes a packed JSON message with the message codec.
+
+        Args:
+            message: A (json_body, items) tuple from a JsonMessagePacker, or None.
+            max_message_bytes: The maximum size of an encoded message body in bytes.
 
         Returns:
-            The last update sequence number.
+            The encoded (message_body, items) tuples, split if the encoding is too large.
+        """
+        if message is None:
+            return []
+        return list(encode_messages(self.message_codec, [message], max_message_bytes))
 
-        Raises:
-            ValueError: If the last_update_seq is not found or is invalid.
+    def _partition(self, item: dict) -> int:
         """
-        print("ATTEMPT: Extracting last_update_seq from IML response")
-        for last_update_seq in ijson.items(
-            FileResponse(response.iter_content(chunk_size=65536)),
-            "last_update_seq",
-        ):
-            try:
-                last_update_seq_int = int(last_update_seq)
-                print(f"Found last update seq={last_update_seq_int}")
-                return last_update_seq_int
-            except ValueError:
-                raise ValueError(
-                    f"Invalid last_update_seq value: {last_update_seq}"
-                ) from None
-        raise ValueError("last_update_seq not found in IML response")
+        Returns:
+            The partition, and therefore FIFO message group, of an item.
+        """
+        if self.queue_partitions == 1:
+            return 0
+        return message_group_partition(
+            str(item.get("short_code", "")), self.queue_partitions
+        )
+
+    def _produce_batches(
+        self, items: Iterator[dict], max_batch_items: int
+    ) -> Iterator[PublishBatch]:
+        """
+        Packs items into messages and groups the messages into batches.
 
-    def run(self, counter: int, max_batch_items: int, max_total_items: int) -> int:
+        Items are packed by their raw JSON size scaled by the codec's packing
+        ratio, then encoded; encoded messages over the SQS limit are split.
+        With a claim-check store configured, messages are only limited by
+        max_batch_items and oversized ones are offloaded when published.
+
+        Items are packed separately per partition so every message, and every
+        batch, belongs to a single partition. Each batch carries the highest
+        update_seq that is safe to checkpoint once it and every earlier batch
+        are published: no lower update_seq is still buffered in a partition.
+
+        Args:
+            items: The items to publish.
+            max_batch_items: The maximum number of items to include in each SQS message.
+
+        Returns:
+            An iterator yielding batches of up to MAX_BATCH_ENTRIES messages.
+        """
+        max_message_bytes = self.max_message_bytes
+        if self.claim_check_store is not None:
+            max_message_bytes = CLAIM_CHECK_MAX_MESSAGE_BYTES
+
+        partitions = [
+            PartitionBuffer(
+                JsonMessagePacker(
+                    int(max_message_bytes * self.message_codec.packing_ratio),
+                    max_batch_items,
+                )
+            )
+            for _ in range(self.queue_partitions)
+        ]
+        batch_count = 0
+        published_update_seq = None
+
+        def emit(partition: int) -> PublishBatch:
+            nonlocal batch_count, published_update_seq
+            buffer = partitions[partition]
+            batch_count += 1
+            for _, message_items in buffer.messages:
+                for message_item in message_items:
+                    published_update_seq = _max_update_seq(
+                        published_update_seq, message_item
+                    )
+            batch = PublishBatch(
+                batch_count,
+                [message_body for message_body, _ in buffer.messages],
+                sum(len(message_items) for _, message_items in buffer.messages),
+                partition=partition,
+            )
+            buffer.messages = []
+            buffer.reset_update_seq()
+
+            checkpoint_update_seq = published_update_seq
+            buffered_update_seqs = [
+                buffer.min_update_seq
+                for buffer in partitions
+                if buffer.min_update_seq is not None
+            ]
+            if buffered_update_seqs and checkpoint_update_seq is not None:
+                checkpoint_update_seq = min(
+                    checkpoint_update_seq, min(buffered_update_seqs) - 1
+                )
+            batch.max_update_seq = checkpoint_update_seq
+            return batch
+
+        for item in items:
+            partition = self._partition(item)
+            buffer = partitions[partition]
+            buffer.track(item)
+            buffer.messages.extend(
+                self._encode(buffer.packer.add(item), max_message_bytes)
+            )
+            if len(buffer.messages) >= MAX_BATCH_ENTRIES:
+                yield emit(partition)
+
+        # Send any remaining messages in the last batches
+        for partition, buffer in enumerate(partitions):
+            buffer.messages.extend(
+                self._encode(buffer.packer.flush(), max_message_bytes)
+            )
+            if buffer.messages:
+                yield emit(partition)
+
+    def run(
+        self,
+        counter: int,
+        max_batch_items: int,
+        max_total_items: int,
+        write_checkpoint: Optional[Callable[[int], None]] = None,
+        checkpoint_interval: int = 1,
+    ) -> int:
         """
         Runs the item publishing process.
 
+        The IML response is parsed and packed into batches on the calling thread,
+        which feeds a bounded queue consumed by IML_PUBLISHER_WORKERS publisher
+        threads. A full queue blocks the parser until a worker catches up.
+        Copies of the same short_code within IML_COALESCE_WINDOW items, at most
+        one batch of items, are coalesced into the newest one before publishing.
+
+        For FIFO queues, items are partitioned by a hash of their short_code
+        into IML_QUEUE_PARTITIONS message groups, and every partition is
+        published by a single worker, so its messages keep their order.
+
         Args:
             counter: The starting counter value for retrieving items.
             max_batch_items: The maximum number of items to include in each SQS message.
             max_total_items: The maximum number of items to process in total.
+            write_checkpoint: Optional callback that persists the highest update_seq
+                              of the items published so far.
+            checkpoint_interval: The number of published batches between checkpoints.
 
         Returns:
-            The last update sequence number from the IML response.
+            The update sequence number to resume from: the last update sequence
+            from the IML response if every item was published, otherwise the
+            highest update_seq of the published items.
+
+        Raises:
+            Exception: The first error raised by a publisher worker.
         """
-        response = self._get_item_info_response(counter)
+        with metrics.span("iml_fetch"):
+            response = self._get_item_info_response(counter)
+        decoder = ContentDecoder(response)
+        parser = ItemInfoParser(max_total_items)
+        # Holding back more than a batch of items would delay publishing and
+        # checkpoints until the parser catches up
+        coalescer = ItemCoalescer(
+            min(self.coalesce_window, max_batch_items * MAX_BATCH_ENTRIES)
+        )
 
-        batch_item_count = 0
-        batch_count = 0
-        batch_items = []
+        if self.sqs_service.is_fifo:
+            work_queues = [
+                Queue(maxsize=self.publisher_queue_size)
+                for _ in range(self.publisher_workers)
+            ]
+        else:
+            work_queues = [Queue(maxsize=self.publisher_queue_size)]
+        tracker = CompletionTracker()
+        checkpointer = Checkpointer(write_checkpoint, checkpoint_interval)
+        errors = []
+        stop_event = threading.Event()
+        workers = [
+            threading.Thread(
+                target=self._publish_worker,
+                args=(
+                    work_queues[index % len(work_queues)],
+                    tracker,
+                    checkpointer,
+                    errors,
+                    stop_event,
+                ),
+                name=f"iml-publisher-{index}",
+                daemon=True,
+            )
+            for index in range(self.publisher_workers)
+        ]
+        for worker in workers:
+            worker.start()
 
-        for item in self._extract_items_from_response(response, max_total_items):
-            batch_items.append(item)
-            batch_item_count += 1
+        # Parse time includes the download and decompression it waits on
+        items = metrics.timed_iter(
+            "iml_parse",
+            self._extract_items_from_response(decoder, parser),
+            bytes_processed=lambda: decoder.decoded_bytes,
+        )
+        batch_count = 0
+        try:
+            for batch in self._produce_batches(
+                coalescer.coalesce(items), max_batch_items
+            ):
+                if stop_event.is_set():
+                    break
+                batch_count = batch.batch_count
+                work_queues[batch.partition % len(work_queues)].put(batch)
+        finally:
+            for index in range(len(workers)):
+                work_queues[index % len(work_queues)].put(None)
+            for worker in workers:
+                worker.join()
+            items.close()
+            response.close()
 
-            if batch_item_count == max_batch_items:
-                batch_count += 1
-                self._send_batch_to_sqs(batch_items, batch_count)
-                batch_items = []
-                batch_item_count = 0
+        log.success("IML Item Info Response: %s", decoder.summary())
+        metrics.record(
+            "iml_decompress",
+            decoder.decompression_seconds,
+            bytes=decoder.download_bytes,
+        )
+        metrics.count("iml_duplicate_items", coalescer.duplicate_count)
 
-        # Send any remaining items in the last batch
-        if batch_items:
-            batch_count += 1
-            self._send_batch_to_sqs(batch_items, batch_count)
+        if errors:
+            raise errors[0]
 
-        print(
-            f"SUCCESS: Published {batch_count * max_batch_items} Items to {self.queue_url}"
+        log.success(
+            "Published %d/%d Batches with %d Items to %s, dropped %d duplicate Items",
+            tracker.contiguous_count,
+            batch_count,
+            parser.total_item_count - coalescer.duplicate_count,
+            self.queue_url,
+            coalescer.duplicate_count,
         )
 
-        last_update_seq = self._extract_last_update_seq(response)
-        return last_update_seq
+        if parser.limit_reached:
+            if tracker.max_update_seq is None:
+                return counter
+            return tracker.max_update_seq
+
+        if parser.last_update_seq is None:
+            raise ValueError("last_update_seq not found in IML response")
+        return parser.last_update_seq
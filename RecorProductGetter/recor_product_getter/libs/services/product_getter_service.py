@@ -1,4 +1,6 @@
+from recor_layer.log import log
 from recor_layer.services.aws.dynamodb.dynamodb_service import DynamoDBService
+from recor_layer.services.registry import registry
 from recor_product_getter.libs.services.iml.iml_item_publisher_service import (
     ImlItemPublisherService,
 )
@@ -13,22 +15,44 @@ class ProductGetterService:
         """
         Initializes the ProductGetterService.
         """
-        self.dynamodb_service = DynamoDBService(region_name)
-        self.iml_item_publisher_service = ImlItemPublisherService()
+        self.dynamodb_service = registry.get(DynamoDBService, region_name)
+        self.iml_item_publisher_service = registry.get(ImlItemPublisherService)
         self.counter_table_name = "iml-counter"  # Store table name as attribute
 
-    def run(self, max_batch_items: int, max_total_items: int) -> None:
+    def _write_counter(self, update_seq: int) -> None:
+        """
+        Stores the item_info_since counter in DynamoDB.
+
+        Args:
+            update_seq: The update sequence to resume the next run from.
+        """
+        self.dynamodb_service.put_item(
+            table_name=self.counter_table_name,
+            item={
+                "counter_name": "item_info_since",
+                "counter": update_seq,
+            },
+        )
+
+    def run(
+        self, max_batch_items: int, max_total_items: int, checkpoint_interval: int = 1
+    ) -> None:
         """
         Runs the product getting process.
 
+        The counter is checkpointed every checkpoint_interval published batches,
+        so an interrupted run resumes from the last published item.
+
         Args:
             max_batch_items: Maximum number of items to retrieve in a single batch.
             max_total_items: Maximum number of total items to retrieve.
+            checkpoint_interval: Number of published batches between counter checkpoints.
         """
         # Get current update sequence from DynamoDB
         response = self.dynamodb_service.get_batch_items(
             table_name=self.counter_table_name,
             keys=[{"counter_name": "item_info_since"}],
+            attributes=("counter_name", "counter"),
         )
 
         current_update_seq = 0
@@ -40,18 +64,18 @@ class ProductGetterService:
 
         # Get updated item sequence from IML
         iml_update_seq = self.iml_item_publisher_service.run(
-            current_update_seq, max_batch_items, max_total_items
+            current_update_seq,
+            max_batch_items,
+            max_total_items,
+            write_checkpoint=self._write_counter,
+            checkpoint_interval=checkpoint_interval,
         )
 
         # Update the counter in DynamoDB
-        self.dynamodb_service.put_item(
-            table_name=self.counter_table_name,
-            item={
-                "counter_name": "item_info_since",
-                "counter": iml_update_seq,
-            },
-        )
+        self._write_counter(iml_update_seq)
 
-        print(
-            f"SUCCESS: Updated item_info_since={iml_update_seq} counter in {self.counter_table_name}"
+        log.success(
+            "Updated item_info_since=%d counter in %s",
+            iml_update_seq,
+            self.counter_table_name,
         )
@@ -0,0 +1,49 @@
+import threading
+from typing import Callable, Optional
+
+
+class Checkpointer:
+    """
+    Persists the published update_seq every few completed batches.
+
+    Publisher workers report progress concurrently; checkpoints are written one
+    at a time and never move backwards.
+    """
+
+    def __init__(
+        self,
+        write_checkpoint: Optional[Callable[[int], None]] = None,
+        checkpoint_interval: int = 1,
+    ):
+        """
+        Initializes the Checkpointer.
+
+        Args:
+            write_checkpoint: Called with the update_seq to persist. Checkpointing
+                              is disabled when not provided.
+            checkpoint_interval: The number of completed batches between checkpoints.
+        """
+        self.write_checkpoint = write_checkpoint
+        self.checkpoint_interval = max(1, checkpoint_interval)
+        self._lock = threading.Lock()
+        self.checkpoint_count = 0
+        self.update_seq: Optional[int] = None
+
+    def update(self, contiguous_count: int, update_seq: Optional[int]) -> None:
+        """
+        Writes a checkpoint if enough batches have completed since the last one.
+
+        Args:
+            contiguous_count: The number of batches completed without gaps.
+            update_seq: The highest update_seq published within those batches.
+        """
+        if self.write_checkpoint is None or update_seq is None:
+            return
+        with self._lock:
+            if contiguous_count - self.checkpoint_count < self.checkpoint_interval:
+                return
+            if self.update_seq is not None and update_seq <= self.update_seq:
+                return
+            self.write_checkpoint(update_seq)
+            self.checkpoint_count = contiguous_count
+            self.update_seq = update_seq
@@ -0,0 +1,46 @@
+import threading
+from typing import Dict, Optional, Tuple
+
+
+class CompletionTracker:
+    """
+    Tracks batches that complete out of order and exposes the contiguous prefix.
+
+    Batches are numbered from 1 in the order they were produced. The tracker
+    reports the highest batch number up to which every batch has completed, and
+    the highest update_seq published within that prefix.
+    """
+
+    def __init__(self):
+        """
+        Initializes the CompletionTracker.
+        """
+        self._lock = threading.Lock()
+        self._completed: Dict[int, Optional[int]] = {}
+        self.contiguous_count = 0
+        self.max_update_seq: Optional[int] = None
+
+    def complete(
+        self, batch_count: int, max_update_seq: Optional[int] = None
+    ) -> Tuple[int, Optional[int]]:
+        """
+        Marks a batch as completed.
+
+        Args:
+            batch_count: The number of the completed batch.
+            max_update_seq: The highest update_seq of the items in the batch.
+
+        Returns:
+            The highest batch number up to which every batch has completed and
+            the highest update_seq published within those batches.
+        """
+        with self._lock:
+            self._completed[batch_count] = max_update_seq
+            while self.contiguous_count + 1 in self._completed:
+                self.contiguous_count += 1
+                update_seq = self._completed.pop(self.contiguous_count)
+                if update_seq is not None and (
+                    self.max_update_seq is None or update_seq > self.max_update_seq
+                ):
+                    self.max_update_seq = update_seq
+            return self.contiguous_count, self.max_update_seq
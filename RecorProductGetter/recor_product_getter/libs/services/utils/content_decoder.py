@@ -0,0 +1,124 @@
+import time
+import zlib
+from typing import Iterator
+
+from requests import Response
+
+# zlib window bits for each supported Content-Encoding
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+DEFLATE_WBITS = zlib.MAX_WBITS
+RAW_DEFLATE_WBITS = -zlib.MAX_WBITS
+
+
+class ContentDecoder:
+    """
+    Incrementally decompresses a streamed response body.
+
+    The raw bytes are read from the socket without urllib3's own decoding, so the
+    download size and the time spent decompressing can be reported.
+    """
+
+    def __init__(self, response: Response):
+        """
+        Initializes the ContentDecoder.
+
+        Args:
+            response: A response requested with stream=True.
+        """
+        self.response = response
+        self.content_encoding = (
+            response.headers.get("Content-Encoding", "identity").strip().lower()
+        )
+        self.download_bytes = 0
+        self.decoded_bytes = 0
+        self.decompression_seconds = 0.0
+        # Deflate bytes read before any output, replayed if the body is raw deflate
+        self._deflate_head = b""
+
+    def _decompressor(self):
+        """
+        Returns:
+            A zlib decompressor for the Content-Encoding, or None if uncompressed.
+
+        Raises:
+            ValueError: If the Content-Encoding is not supported.
+        """
+        if self.content_encoding == "gzip":
+            return zlib.decompressobj(GZIP_WBITS)
+        if self.content_encoding == "deflate":
+            return zlib.decompressobj(DEFLATE_WBITS)
+        if self.content_encoding in ("identity", ""):
+            return None
+        raise ValueError(f"Unsupported Content-Encoding: {self.content_encoding}")
+
+    def _decompress(self, decompressor, chunk: bytes):
+        """
+        Decompresses a chunk, handling raw deflate bodies and multi-member gzip.
+
+        Returns:
+            The decompressor to use for the next chunk and the decoded bytes.
+        """
+        detecting = self.content_encoding == "deflate" and not self.decoded_bytes
+        if detecting:
+            self._deflate_head += chunk
+        try:
+            decoded = decompressor.decompress(chunk)
+        except zlib.error:
+            if not detecting:
+                raise
+            # Some servers send deflate without the zlib header. The zlib header
+            # may span chunks, so every byte read so far is decoded again
+            decompressor = zlib.decompressobj(RAW_DEFLATE_WBITS)
+            decoded = decompressor.decompress(self._deflate_head)
+        if decoded:
+            self._deflate_head = b""
+
+        while (
+            self.content_encoding == "gzip"
+            and decompressor.eof
+            and decompressor.unused_data
+        ):
+            unused_data = decompressor.unused_data
+            decompressor = zlib.decompressobj(GZIP_WBITS)
+            decoded += decompressor.decompress(unused_data)
+        return decompressor, decoded
+
+    def iter_content(self, chunk_size: int) -> Iterator[bytes]:
+        """
+        Yields the decoded response body.
+
+        Args:
+            chunk_size: The number of bytes to read from the socket at a time.
+
+        Returns:
+            An iterator yielding decoded chunks of the response body.
+        """
+        decompressor = self._decompressor()
+        for chunk in self.response.raw.stream(chunk_size, decode_content=False):
+            self.download_bytes += len(chunk)
+            if decompressor is None:
+                decoded = chunk
+            else:
+                start = time.perf_counter()
+                decompressor, decoded = self._decompress(decompressor, chunk)
+                self.decompression_seconds += time.perf_counter() - start
+            if decoded:
+                self.decoded_bytes += len(decoded)
+                yield decoded
+
+        if decompressor is not None:
+            decoded = decompressor.flush()
+            if decoded:
+                self.decoded_bytes += len(decoded)
+                yield decoded
+
+    def summary(self) -> str:
+        """
+        Returns:
+            A summary of the bytes transferred and the decompression time.
+        """
+        return (
+            f"Downloaded {self.download_bytes} bytes ({self.content_encoding}), "
+            f"decoded {self.decoded_bytes} bytes, "
+            f"decompressed in {self.decompression_seconds:.3f}s"
+        )
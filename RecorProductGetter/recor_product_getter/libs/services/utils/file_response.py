@@ -1,14 +1,20 @@
-from typing import Iterator
+import io
+from typing import Iterator, Optional
 
 """
 ijson works with file-like objects; that is, objects with a read method
 wrap the response to make it look like a file that can be read
 """
 
+DEFAULT_BUFFER_SIZE = 65536
 
-class FileResponse:
+
+class FileResponse(io.RawIOBase):
     """
-    Wraps a response object to provide a file-like interface for ijson.
+    Wraps a response object to provide a raw, file-like interface for ijson.
+
+    Chunks from the iterator are copied straight into the caller's buffer, so
+    read requests are honoured regardless of how the response was chunked.
     """
 
     def __init__(self, data: Iterator[bytes]):
@@ -18,21 +24,51 @@ class FileResponse:
         Args:
             data: An iterator of bytes, typically from a response's iter_content.
         """
+        super().__init__()
         self.data = data
+        self._chunk: Optional[memoryview] = None
+
+    def readable(self) -> bool:
+        return True
 
-    def read(self, n: int) -> bytes:
+    def readinto(self, buffer) -> int:
         """
-        Reads up to n bytes from the data iterator.
+        Reads bytes from the data iterator into a pre-allocated buffer.
 
         Args:
-            n: The number of bytes to read.
+            buffer: A writable buffer to fill.
 
         Returns:
-            The bytes read.
+            The number of bytes read, 0 once the data iterator is exhausted.
         """
-        if n == 0:
-            return b""
-        try:
-            return next(self.data, b"")
-        except StopIteration:
-            return b""
+        size = len(buffer)
+        filled = 0
+        while filled < size:
+            if not self._chunk:
+                chunk = next(self.data, None)
+                if chunk is None:
+                    break
+                self._chunk = memoryview(chunk)
+                continue
+
+            n = min(size - filled, len(self._chunk))
+            buffer[filled : filled + n] = self._chunk[:n]
+            self._chunk = self._chunk[n:]
+            filled += n
+        return filled
+
+
+def open_file_response(
+    data: Iterator[bytes], buffer_size: int = DEFAULT_BUFFER_SIZE
+) -> io.BufferedReader:
+    """
+    Wraps an iterator of bytes in a buffered reader.
+
+    Args:
+        data: An iterator of bytes, typically from a response's iter_content.
+        buffer_size: The size of the reader's buffer in bytes.
+
+    Returns:
+        A buffered reader that returns full reads of the requested size.
+    """
+    return io.BufferedReader(FileResponse(data), buffer_size=buffer_size)
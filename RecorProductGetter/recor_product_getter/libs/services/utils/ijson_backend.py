@@ -0,0 +1,29 @@
+from functools import lru_cache
+from types import ModuleType
+
+import ijson
+from recor_layer.log import log
+
+# Fastest first; the pure python backend is always available
+PREFERRED_BACKENDS = ("yajl2_c", "yajl2_cffi", "yajl2", "python")
+
+
+@lru_cache(maxsize=None)
+def select_ijson_backend() -> ModuleType:
+    """
+    Selects the fastest ijson backend available in this environment.
+
+    Returns:
+        The ijson backend module.
+
+    Raises:
+        ImportError: If no ijson backend can be loaded.
+    """
+    for backend_name in PREFERRED_BACKENDS:
+        try:
+            backend = ijson.get_backend(backend_name)
+        except ImportError:
+            continue
+        log.success("Selected ijson backend %s", backend_name)
+        return backend
+    raise ImportError(f"No ijson backend available from {PREFERRED_BACKENDS}")
@@ -0,0 +1,62 @@
+from collections import OrderedDict
+from typing import Iterable, Iterator
+
+
+def _update_seq(item: dict) -> int:
+    return int(item.get("update_seq") or 0)
+
+
+class ItemCoalescer:
+    """
+    Drops superseded copies of an item within a sliding window of short_codes.
+
+    Items leave the window in the order they were last seen, so when the feed is
+    ordered by update_seq the items are still emitted in update_seq order and
+    every item in the window is newer than any item already emitted.
+    """
+
+    def __init__(self, window_size: int):
+        """
+        Initializes the ItemCoalescer.
+
+        Args:
+            window_size: The number of distinct short_codes held back to find
+                         duplicates. Coalescing is disabled when less than 1.
+        """
+        self.window_size = window_size
+        self.duplicate_count = 0
+
+    def coalesce(self, items: Iterable[dict]) -> Iterator[dict]:
+        """
+        Yields the items, keeping only the newest update_seq of each short_code
+        found within the window.
+
+        Args:
+            items: The items to coalesce.
+
+        Returns:
+            An iterator yielding the coalesced items.
+        """
+        if self.window_size < 1:
+            yield from items
+            return
+
+        window = OrderedDict()
+        for item in items:
+            short_code = item.get("short_code")
+            if short_code is None:
+                # Held back too, so nothing is emitted ahead of an older item
+                window[object()] = item
+            else:
+                existing_item = window.pop(short_code, None)
+                if existing_item is not None:
+                    self.duplicate_count += 1
+                    if _update_seq(existing_item) > _update_seq(item):
+                        item = existing_item
+                window[short_code] = item
+
+            if len(window) > self.window_size:
+                yield window.popitem(last=False)[1]
+
+        while window:
+            yield window.popitem(last=False)[1]
@@ -0,0 +1,105 @@
+from types import ModuleType
+from typing import BinaryIO, Iterator, Optional
+
+from ijson.common import ObjectBuilder
+from recor_layer.log import log
+from recor_product_getter.libs.services.utils.file_response import (
+    DEFAULT_BUFFER_SIZE,
+)
+from recor_product_getter.libs.services.utils.ijson_backend import (
+    select_ijson_backend,
+)
+
+ITEMS_PREFIX = "items.item"
+LAST_UPDATE_SEQ_PREFIX = "last_update_seq"
+CONTAINER_START_EVENTS = ("start_map", "start_array")
+CONTAINER_END_EVENTS = ("end_map", "end_array")
+
+
+class ItemInfoParser:
+    """
+    Single pass, event driven parser for the IML item_info_since document.
+
+    Items under `items` are yielded one at a time while `last_update_seq` is
+    recorded wherever it appears in the document, so the response stream is
+    only read once and memory use stays bounded by the size of a single item.
+    Parsing stops as soon as max_total_items have been yielded.
+    """
+
+    def __init__(self, max_total_items: int, backend: Optional[ModuleType] = None):
+        """
+        Initializes the ItemInfoParser.
+
+        Args:
+            max_total_items: The maximum number of items to yield.
+            backend: The ijson backend to parse with. Defaults to the fastest available.
+        """
+        self.max_total_items = max_total_items
+        self.backend = backend or select_ijson_backend()
+        self.total_item_count = 0
+        self.last_update_seq: Optional[int] = None
+        self.limit_reached = False
+
+    def _set_last_update_seq(self, value) -> None:
+        """
+        Records the last update sequence found in the document.
+
+        Raises:
+            ValueError: If the last_update_seq value is invalid.
+        """
+        try:
+            self.last_update_seq = int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid last_update_seq value: {value}") from None
+        log.success("Found last update seq=%d", self.last_update_seq)
+
+    def items(self, file: BinaryIO) -> Iterator[dict]:
+        """
+        Parses the document and yields its items.
+
+        Once max_total_items have been yielded, the rest of the document is not
+        read: limit_reached is set and last_update_seq is only known if it came
+        before the items.
+
+        Args:
+            file: A file-like object with the IML item_info_since document.
+
+        Returns:
+            An iterator yielding individual item dictionaries.
+        """
+        builder = None
+
+        for prefix, event, value in self.backend.parse(
+            file, buf_size=DEFAULT_BUFFER_SIZE, use_float=True
+        ):
+            if builder is not None:
+                builder.event(event, value)
+                if prefix == ITEMS_PREFIX and event in CONTAINER_END_EVENTS:
+                    item = builder.value
+                    builder = None
+                    self.total_item_count += 1
+                    yield item
+                continue
+
+            if prefix == LAST_UPDATE_SEQ_PREFIX:
+                self._set_last_update_seq(value)
+                continue
+
+            if prefix != ITEMS_PREFIX:
+                continue
+
+            if self.total_item_count >= self.max_total_items:
+                log.warning(
+                    "Extracted %d items, but maximum total is %d.",
+                    self.total_item_count,
+                    self.max_total_items,
+                )
+                self.limit_reached = True
+                return
+
+            if event in CONTAINER_START_EVENTS:
+                builder = ObjectBuilder()
+                builder.event(event, value)
+            elif event not in CONTAINER_END_EVENTS:
+                self.total_item_count += 1
+                yield value
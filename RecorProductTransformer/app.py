@@ -1,7 +1,7 @@
-import json
-import traceback
-
-from recor_layer.services.woocommerce.woocommerce_service import (
+from recor_layer.metrics import metrics
+from recor_layer.services.aws.sqs.sqs_records import process_sqs_records
+from recor_layer.services.registry import registry
+from recor_product_transformer.libs.services.product_transformer_service import (
     ProductTransformerService,
 )
 
@@ -12,9 +12,9 @@ def lambda_handler(event, context):
     Parameters
     ----------
     event: dict, required
-        API Gateway Lambda Proxy Input Format
+        SQS Event Input Format
 
-        Event doc: https://docs.aws.amazon.com/apigateway/latest/developerguide/set-up-lambda-proxy-integrations.html#api-gateway-simple-proxy-for-lambda-input-format
+        Event doc: https://docs.aws.amazon.com/lambda/latest/dg/with-sqs.html
 
     context: object, required
         Lambda Context runtime methods and attributes
@@ -23,30 +23,17 @@ def lambda_handler(event, context):
 
     Returns
     ------
-    API Gateway Lambda Proxy Output Format: dict
+    SQS Partial Batch Response Format: dict
 
-        Return doc: https://docs.aws.amazon.com/apigateway/latest/developerguide/set-up-lambda-proxy-integrations.html
+        Return doc: https://docs.aws.amazon.com/lambda/latest/dg/services-sqs-errorhandling.html#services-sqs-batchfailurereporting
     """
 
+    product_transformer_service = registry.get(ProductTransformerService)
     try:
+        batch_item_failures = process_sqs_records(
+            event["Records"], product_transformer_service.run
+        )
+    finally:
+        metrics.flush()
 
-        items = []
-        for record in event["Records"]:
-            items.extend(json.loads(record["body"]))
-
-        ProductTransformerService().run(items)
-
-    except Exception as e:
-
-        print(f"ERROR: {e}")
-        traceback.print_exc()
-
-    return {
-        "statusCode": 200,
-        "body": json.dumps(
-            {
-                "message": "hello world from recor product transformer!",
-                # "location": ip.text.replace("\n", "")
-            }
-        ),
-    }
+    return {"batchItemFailures": batch_item_failures}
@@ -1,9 +1,28 @@
-from typing import Dict, List, Set
+import os
+import time
+from typing import Dict, List, Optional, Set, Tuple
 
+from recor_layer.log import log
+from recor_layer.metrics import metrics
+from recor_layer.services.aws.dynamodb.category_snapshot import (
+    CategorySnapshot,
+    CategorySnapshotStore,
+)
 from recor_layer.services.aws.dynamodb.dynamodb_service import DynamoDBService
+from recor_layer.services.cache.ttl_cache import category_id_cache
 from recor_layer.services.iml.iml_service import ImlService
-from recor_layer.services.woocommerce.woocommerce_service import WooCommerceService
-from recor_layer.transformers.iml.iml_item_transformer import ImlItemTransformer
+from recor_layer.services.registry import registry
+from recor_layer.services.woocommerce.woocommerce_service import (
+    WooCommerceBatchError,
+    WooCommerceService,
+)
+from recor_layer.transformers.iml.iml_item_transformer import (
+    ImlItemTransformer,
+    build_category_ancestor_index,
+)
+
+# When the ancestor index was built and the index, kept across warm invocations
+_category_ancestor_index: Optional[Tuple[float, Dict[str, Tuple[str, ...]]]] = None
 
 
 class ProductTransformerService:
@@ -11,64 +30,161 @@ class ProductTransformerService:
 
     def __init__(self, region_name: str = "us-east-1"):
         self.iml_item_transformer = ImlItemTransformer()
-        self.dynamodb_service = DynamoDBService(region_name)
-        self.woocommerce_service = WooCommerceService()
-        self.iml_service = ImlService()
+        self.dynamodb_service = registry.get(DynamoDBService, region_name)
+        # The snapshot version is checked as often as cached mappings expire
+        self.category_snapshot_store = CategorySnapshotStore(
+            self.dynamodb_service, version_ttl_seconds=category_id_cache.ttl_seconds
+        )
+        self.woocommerce_service = registry.get(WooCommerceService)
+        # Adds the ancestors of each IML category to the product's categories
+        self.expand_category_ancestors = (
+            os.getenv("IML_EXPAND_CATEGORY_ANCESTORS", "false").lower() == "true"
+        )
+        if self.expand_category_ancestors:
+            self.iml_service = registry.get(ImlService)
+
+    def _fetch_category_ancestor_index(self) -> Dict[str, Tuple[str, ...]]:
+        """
+        Fetches the ancestor IML category IDs of every IML category.
+
+        The index is built from the IML category list and rebuilt once it is
+        older than the category ID cache TTL.
+        """
+        global _category_ancestor_index
+        now = time.monotonic()
+        if (
+            _category_ancestor_index is not None
+            and now - _category_ancestor_index[0] < category_id_cache.ttl_seconds
+        ):
+            return _category_ancestor_index[1]
+
+        with metrics.span("category_ancestor_fetch") as span:
+            iml_categories = self.iml_service.get_category_list()
+            span.add(items=len(iml_categories))
+        ancestor_index = build_category_ancestor_index(
+            {
+                str(iml_category["category_id"]): str(
+                    iml_category.get("parent_id", "-1")
+                )
+                for iml_category in iml_categories
+            }
+        )
+        _category_ancestor_index = (now, ancestor_index)
+        return ancestor_index
 
     def _fetch_existing_iml_category_map(
         self, iml_category_ids: Set[str]
     ) -> Dict[str, int]:
-        """Fetches the mapping of IML category IDs to WooCommerce category IDs from DynamoDB."""
-        keys = [{"category_id": category_id} for category_id in iml_category_ids]
+        """
+        Fetches the mapping of IML category IDs to WooCommerce category IDs.
+
+        Mappings are served from the container's category ID cache, then from the
+        local category snapshot. Only the IDs missing from both are read from
+        DynamoDB. The snapshot version is read at most once per cache TTL, so
+        most batches make no DynamoDB reads for categories.
+        """
+        snapshot = self.category_snapshot_store.load()
+        category_id_cache.sync_version(snapshot.version)
+        return category_id_cache.get_or_load(
+            iml_category_ids,
+            lambda category_ids: self._load_iml_category_map(category_ids, snapshot),
+        )
+
+    def _load_iml_category_map(
+        self, iml_category_ids: Set[str], snapshot: CategorySnapshot
+    ) -> Dict[str, int]:
+        """Reads the mapping of IML category IDs to WooCommerce category IDs."""
+        category_id_map = snapshot.get_many(iml_category_ids)
+        unmapped_category_ids = iml_category_ids - category_id_map.keys()
+        if not unmapped_category_ids:
+            return category_id_map
+
+        # Covers mappings written without bumping the snapshot version
+        keys = [{"category_id": category_id} for category_id in unmapped_category_ids]
         category_items = self.dynamodb_service.get_batch_items(
-            "iml-category-id-table", keys
+            "iml-category-id-table",
+            keys,
+            attributes=("category_id", "woocommerce_category_id"),
         )
-        return {
-            item["category_id"]: item.get("woocommerce_category_id")
-            for item in category_items
-        }
+        category_id_map.update(
+            {
+                item["category_id"]: item.get("woocommerce_category_id")
+                for item in category_items
+            }
+        )
+        return category_id_map
 
     def _fetch_existing_iml_product_map(self, iml_item_ids: Set[str]) -> Dict[str, int]:
         """Fetches the mapping of IML item IDs to WooCommerce product IDs from DynamoDB."""
         keys = [{"item_id": item_id} for item_id in iml_item_ids]
-        item_items = self.dynamodb_service.get_batch_items("iml-item-id-table", keys)
+        item_items = self.dynamodb_service.get_batch_items(
+            "iml-item-id-table", keys, attributes=("item_id", "woocommerce_product_id")
+        )
         return {
             item["item_id"]: item.get("woocommerce_product_id") for item in item_items
         }
 
     def _transform_new_products(
-        self, new_iml_items: List[Dict], old_category_id_map: Dict[str, int]
+        self,
+        new_iml_items: List[Dict],
+        old_category_id_map: Dict[str, int],
+        category_ancestor_index: Dict[str, Tuple[str, ...]],
     ) -> List[Dict]:
         """Transforms new IML items into WooCommerce product format."""
-        new_woocommerce_products = []
-        for new_iml_item in new_iml_items:
-            new_woocommerce_product = self.iml_item_transformer.transform(
-                {
-                    **new_iml_item,
-                    ImlItemTransformer.CATEGORY_ID_MAP: old_category_id_map,
-                }
-            )
-            new_woocommerce_products.append(new_woocommerce_product)
-        return new_woocommerce_products
+        return self.iml_item_transformer.transform_many(
+            new_iml_items,
+            {
+                ImlItemTransformer.CATEGORY_ID_MAP: old_category_id_map,
+                ImlItemTransformer.CATEGORY_ANCESTOR_INDEX: category_ancestor_index,
+            },
+        )
 
     def _transform_old_products(
         self,
         old_iml_items: List[Dict],
         old_category_id_map: Dict[str, int],
         old_item_id_map: Dict[str, int],
+        category_ancestor_index: Dict[str, Tuple[str, ...]],
     ) -> List[Dict]:
         """Transforms existing IML items into WooCommerce product format for updates."""
-        old_woocommerce_products = []
-        for old_iml_item in old_iml_items:
-            old_woocommerce_product = self.iml_item_transformer.transform(
-                {
-                    **old_iml_item,
-                    ImlItemTransformer.CATEGORY_ID_MAP: old_category_id_map,
-                    ImlItemTransformer.PRODUCT_ID_MAP: old_item_id_map,
-                }
+        return self.iml_item_transformer.transform_many(
+            old_iml_items,
+            {
+                ImlItemTransformer.CATEGORY_ID_MAP: old_category_id_map,
+                ImlItemTransformer.PRODUCT_ID_MAP: old_item_id_map,
+                ImlItemTransformer.CATEGORY_ANCESTOR_INDEX: category_ancestor_index,
+            },
+        )
+
+    def _latest_products(self, products: List[Dict]) -> List[Dict]:
+        """Keeps only the copy with the newest update_seq of each IML item."""
+        latest_products = {}
+        for product in products:
+            item_id = str(product["short_code"])
+            latest_product = latest_products.get(item_id)
+            if latest_product is None or int(product.get("update_seq") or 0) >= int(
+                latest_product.get("update_seq") or 0
+            ):
+                latest_products[item_id] = product
+        return list(latest_products.values())
+
+    def _delete_product_mappings(
+        self,
+        woocommerce_delete_response: List[Dict],
+        deleted_item_id_map: Dict[int, str],
+    ):
+        """Removes the mappings of products deleted from WooCommerce from DynamoDB."""
+        deleted_item_keys = [
+            {"item_id": deleted_item_id_map[int(product["id"])]}
+            for product in woocommerce_delete_response
+            if "error" not in product
+            and "id" in product
+            and int(product["id"]) in deleted_item_id_map
+        ]
+        if deleted_item_keys:
+            self.dynamodb_service.delete_batch_items(
+                "iml-item-id-table", deleted_item_keys
             )
-            old_woocommerce_products.append(old_woocommerce_product)
-        return old_woocommerce_products
 
     def _save_new_product_mappings(self, woocommerce_create_response: List[Dict]):
         """Saves the mapping of new WooCommerce product slugs to their IDs in DynamoDB."""
@@ -78,59 +194,140 @@ class ProductTransformerService:
             if "slug" in product and "id" in product
         ]
         if new_item_maps:
-            self.dynamodb_service.put_batch_items("iml-item-id-table", new_item_maps)
+            self.dynamodb_service.put_batch_items(
+                "iml-item-id-table", new_item_maps, key_names=("item_id",)
+            )
 
     def run(self, products: List[Dict]):
-        """Orchestrates the synchronization of IML products to WooCommerce."""
+        """
+        Orchestrates the synchronization of IML products to WooCommerce.
+
+        Deleted IML items skip the transform and are deleted from WooCommerce by
+        their mapped product ID in the same batch call.
+        """
+        products = self._latest_products(products)
+        deleted_products = [product for product in products if product.get("deleted")]
+        products = [product for product in products if not product.get("deleted")]
+
         iml_category_ids = {
             str(category_id)
             for product in products
             for category_id in product.get("category_id", [])
         }
+        category_ancestor_index = {}
+        if self.expand_category_ancestors:
+            category_ancestor_index = self._fetch_category_ancestor_index()
+            iml_category_ids |= {
+                ancestor_category_id
+                for category_id in iml_category_ids
+                for ancestor_category_id in category_ancestor_index.get(category_id, ())
+            }
         iml_item_ids = {str(product["short_code"]) for product in products}
+        deleted_iml_item_ids = {
+            str(product["short_code"]) for product in deleted_products
+        }
 
         # Identify Existing IML Categories
-        old_category_id_map = self._fetch_existing_iml_category_map(iml_category_ids)
+        with metrics.span("category_lookup", items=len(iml_category_ids)):
+            old_category_id_map = self._fetch_existing_iml_category_map(
+                iml_category_ids
+            )
         old_iml_category_ids = set(old_category_id_map.keys())
         new_iml_category_ids = iml_category_ids - old_iml_category_ids
 
         if new_iml_category_ids:
-            warn_msg = f"WARN: New IML Categories: {new_iml_category_ids}. Run RecorCategoryTransformer to resolve"
-            print(warn_msg)
+            log.warning(
+                "New IML Categories: %s. Run RecorCategoryTransformer to resolve",
+                new_iml_category_ids,
+            )
 
-        # Identify Existing IML Products
-        old_item_id_map = self._fetch_existing_iml_product_map(iml_item_ids)
+        # Identify Existing IML Products, including the deleted ones
+        lookup_item_ids = iml_item_ids | deleted_iml_item_ids
+        with metrics.span("product_lookup", items=len(lookup_item_ids)):
+            existing_item_id_map = self._fetch_existing_iml_product_map(lookup_item_ids)
+        old_item_id_map = {
+            item_id: product_id
+            for item_id, product_id in existing_item_id_map.items()
+            if item_id in iml_item_ids
+        }
         old_iml_item_ids = set(old_item_id_map.keys())
         new_iml_item_ids = iml_item_ids - old_iml_item_ids
 
-        # Build New WooCommerce Products
-        new_woocommerce_products = []
-        if new_iml_item_ids:
-            new_iml_items = [
-                iml_item
-                for iml_item in products
-                if str(iml_item.get("short_code")) in new_iml_item_ids
-            ]
-            new_woocommerce_products = self._transform_new_products(
-                new_iml_items, old_category_id_map
+        # Map Deleted IML Products to WooCommerce Products
+        deleted_item_id_map = {
+            int(product_id): item_id
+            for item_id, product_id in existing_item_id_map.items()
+            if item_id in deleted_iml_item_ids and product_id is not None
+        }
+
+        with metrics.span("transform", items=len(products)):
+            # Build New WooCommerce Products
+            new_woocommerce_products = []
+            if new_iml_item_ids:
+                new_iml_items = [
+                    iml_item
+                    for iml_item in products
+                    if str(iml_item.get("short_code")) in new_iml_item_ids
+                ]
+                new_woocommerce_products = self._transform_new_products(
+                    new_iml_items, old_category_id_map, category_ancestor_index
+                )
+
+            # Build Old WooCommerce Products for Update
+            old_woocommerce_products = []
+            if old_iml_item_ids:
+                old_iml_items = [
+                    iml_item
+                    for iml_item in products
+                    if str(iml_item.get("short_code")) in old_iml_item_ids
+                ]
+                old_woocommerce_products = self._transform_old_products(
+                    old_iml_items,
+                    old_category_id_map,
+                    old_item_id_map,
+                    category_ancestor_index,
+                )
+
+        # Batch Create New/Update Old/Delete Deleted WooCommerce Products
+        batch_size = (
+            len(new_woocommerce_products)
+            + len(old_woocommerce_products)
+            + len(deleted_item_id_map)
+        )
+        try:
+            with metrics.span("woocommerce_batch", items=batch_size):
+                woocommerce_response = self.woocommerce_service.batch_update_products(
+                    new_products=new_woocommerce_products,
+                    old_products=old_woocommerce_products,
+                    delete_product_ids=list(deleted_item_id_map.keys()),
+                )
+        except WooCommerceBatchError as e:
+            # Record what the successful chunks did, so a retry updates them
+            self._save_new_product_mappings(e.response.get("create", []))
+            self._delete_product_mappings(
+                e.response.get("delete", []), deleted_item_id_map
             )
+            raise
 
-        # Build Old WooCommerce Products for Update
-        old_woocommerce_products = []
-        if old_iml_item_ids:
-            old_iml_items = [
-                iml_item
-                for iml_item in products
-                if str(iml_item.get("short_code")) in old_iml_item_ids
-            ]
-            old_woocommerce_products = self._transform_old_products(
-                old_iml_items, old_category_id_map, old_item_id_map
+        woocommerce_create_response = woocommerce_response.get("create", [])
+        woocommerce_delete_response = woocommerce_response.get("delete", [])
+        with metrics.span(
+            "mapping_write",
+            items=len(woocommerce_create_response) + len(woocommerce_delete_response),
+        ):
+            # Add new WooCommerce Product to Item Map
+            self._save_new_product_mappings(woocommerce_create_response)
+
+            # Remove deleted WooCommerce Products from Item Map
+            self._delete_product_mappings(
+                woocommerce_delete_response, deleted_item_id_map
             )
+        metrics.count("products_created", len(new_woocommerce_products))
+        metrics.count("products_updated", len(old_woocommerce_products))
+        metrics.count("products_deleted", len(deleted_item_id_map))
 
-        # Batch Create New/Update Old WooCommerce Products
-        woocommerce_response = self.woocommerce_service.batch_update_products(
-            new_products=new_woocommerce_products, old_products=old_woocommerce_products
+        log.success(
+            "DynamoDB batch calls since cold start: %s",
+            self.dynamodb_service.batch_summary(),
         )
-
-        # Add new WooCommerce Product to Item Map
-        self._save_new_product_mappings(woocommerce_response.get("create", []))
+        log.success("Category ID cache: %s", category_id_cache.summary())
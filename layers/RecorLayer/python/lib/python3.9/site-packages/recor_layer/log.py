@@ -0,0 +1,143 @@
+import os
+import sys
+from typing import Any, Optional, TextIO
+
+"""
+Leveled logging with the ATTEMPT/SUCCESS/WARNING/ERROR prefixes used across the
+Recor functions.
+
+Messages are %s templates, formatted only when their level is enabled. Payload
+arguments, such as lists, dicts and request bodies, are summarized and capped
+before they are written, so logging a batch of 100 products stays cheap. The
+level and the cap are read from LOG_LEVEL and LOG_MAX_PAYLOAD_CHARS.
+"""
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+LEVELS = {"DEBUG": DEBUG, "INFO": INFO, "WARNING": WARNING, "ERROR": ERROR}
+
+DEFAULT_LEVEL = "INFO"
+DEFAULT_MAX_PAYLOAD_CHARS = 1000
+# Items shown of a summarized list, and keys of a summarized dict
+MAX_SUMMARY_ITEMS = 3
+MAX_SUMMARY_KEYS = 10
+MAX_SUMMARY_DEPTH = 3
+
+
+def _summary(value: Any, depth: int) -> str:
+    if isinstance(value, (bytes, bytearray)):
+        return f"<{len(value)} bytes>"
+    if isinstance(value, dict):
+        if depth >= MAX_SUMMARY_DEPTH:
+            return f"{{{len(value)} keys}}"
+        entries = [
+            f"{key!r}: {_summary(item, depth + 1)}"
+            for key, item in list(value.items())[:MAX_SUMMARY_KEYS]
+        ]
+        if len(value) > MAX_SUMMARY_KEYS:
+            entries.append(f"... {len(value) - MAX_SUMMARY_KEYS} more keys")
+        return "{" + ", ".join(entries) + "}"
+    if isinstance(value, (list, tuple, set, frozenset)):
+        if depth >= MAX_SUMMARY_DEPTH:
+            return f"[{len(value)} items]"
+        shown = [_summary(item, depth + 1) for item in list(value)[:MAX_SUMMARY_ITEMS]]
+        if len(value) > MAX_SUMMARY_ITEMS:
+            return f"[{len(value)} items: {', '.join(shown)}, ...]"
+        return "[" + ", ".join(shown) + "]"
+    return repr(value)
+
+
+def summarize(value: Any, max_chars: int) -> Any:
+    """
+    Summarizes a payload argument of a log message.
+
+    Args:
+        value: The argument.
+        max_chars: The maximum length of the summary.
+
+    Returns:
+        A capped summary of strings, bytes and containers, other values as is so
+        they can still be formatted with %d or %.2f.
+    """
+    if isinstance(value, str):
+        text = value
+    elif isinstance(value, (bytes, bytearray)):
+        # Only the part that is written is decoded
+        text = value[:max_chars].decode("utf-8", errors="replace")
+        if len(value) > max_chars:
+            return f"{text}... ({len(value) - max_chars} more bytes)"
+        return text
+    elif isinstance(value, (dict, list, tuple, set, frozenset)):
+        text = _summary(value, 0)
+    else:
+        return value
+    if len(text) > max_chars:
+        return f"{text[:max_chars]}... ({len(text) - max_chars} more chars)"
+    return text
+
+
+class Logger:
+    """
+    Writes leveled, lazily formatted log lines to stdout, which Lambda ships to CloudWatch.
+    """
+
+    def __init__(
+        self,
+        level: int = INFO,
+        max_payload_chars: int = DEFAULT_MAX_PAYLOAD_CHARS,
+        stream: Optional[TextIO] = None,
+    ):
+        """
+        Initializes the Logger.
+
+        Args:
+            level: The lowest level that is written.
+            max_payload_chars: The maximum length of each summarized argument.
+            stream: The stream to write to. Defaults to the current stdout.
+        """
+        self.level = level
+        self.max_payload_chars = max_payload_chars
+        self.stream = stream
+
+    def is_enabled_for(self, level: int) -> bool:
+        return level >= self.level
+
+    def _log(self, level: int, prefix: str, msg: str, args: tuple) -> None:
+        if level < self.level:
+            return
+        if args:
+            msg = msg % tuple(summarize(arg, self.max_payload_chars) for arg in args)
+        print(f"{prefix}: {msg}", file=self.stream or sys.stdout)
+
+    def debug(self, msg: str, *args: Any) -> None:
+        self._log(DEBUG, "DEBUG", msg, args)
+
+    def attempt(self, msg: str, *args: Any) -> None:
+        self._log(INFO, "ATTEMPT", msg, args)
+
+    def success(self, msg: str, *args: Any) -> None:
+        self._log(INFO, "SUCCESS", msg, args)
+
+    def warning(self, msg: str, *args: Any) -> None:
+        self._log(WARNING, "WARNING", msg, args)
+
+    def error(self, msg: str, *args: Any) -> None:
+        self._log(ERROR, "ERROR", msg, args)
+
+
+def logger_from_env() -> Logger:
+    """
+    Builds a logger configured from the environment.
+    """
+    return Logger(
+        level=LEVELS[os.getenv("LOG_LEVEL", DEFAULT_LEVEL).upper()],
+        max_payload_chars=int(
+            os.getenv("LOG_MAX_PAYLOAD_CHARS", DEFAULT_MAX_PAYLOAD_CHARS)
+        ),
+    )
+
+
+# Shared by every module of a Lambda container
+log = logger_from_env()
@@ -0,0 +1,292 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+"""
+Per-stage timing and throughput metrics.
+
+Stages are timed with spans, which also count the items and bytes they
+processed. The totals of an invocation are flushed as one CloudWatch Embedded
+Metric Format (EMF) document, which CloudWatch turns into metrics when Lambda
+writes it to the log. Rates are per second of span time, so stages that run on
+several threads report the throughput of one thread.
+"""
+
+T = TypeVar("T")
+
+DEFAULT_NAMESPACE = "Recor"
+# CloudWatch accepts up to 100 metrics per EMF directive
+MAX_DIRECTIVE_METRICS = 100
+
+
+@dataclass
+class StageStats:
+    """Totals of the spans of one stage."""
+
+    calls: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+    items: int = 0
+    bytes: int = 0
+
+
+class Span:
+    """
+    The items and bytes processed by a stage, counted while it runs.
+    """
+
+    __slots__ = ("items", "bytes")
+
+    def __init__(self, items: int = 0, bytes: int = 0):
+        self.items = items
+        self.bytes = bytes
+
+    def add(self, items: int = 0, bytes: int = 0) -> None:
+        self.items += items
+        self.bytes += bytes
+
+
+class StdoutSink:
+    """Writes EMF documents to stdout, which Lambda ships to CloudWatch."""
+
+    def emit(self, document: Dict) -> None:
+        print(json.dumps(document, separators=(",", ":")))
+
+
+class MemorySink:
+    """Keeps EMF documents in memory, for local runs and tests."""
+
+    def __init__(self):
+        self.documents: List[Dict] = []
+
+    def emit(self, document: Dict) -> None:
+        self.documents.append(document)
+
+
+class Metrics:
+    """
+    Thread safe collector of stage spans and counters.
+    """
+
+    def __init__(
+        self,
+        namespace: str = DEFAULT_NAMESPACE,
+        dimensions: Optional[Dict[str, str]] = None,
+        sink=None,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        """
+        Initializes the Metrics.
+
+        Args:
+            namespace: The CloudWatch namespace of the metrics.
+            dimensions: The CloudWatch dimensions of every metric.
+            sink: Receives the flushed EMF documents. Defaults to stdout.
+            clock: The clock spans are timed with.
+        """
+        self.namespace = namespace
+        self.dimensions = dimensions or {}
+        self.sink = sink or StdoutSink()
+        self.clock = clock
+        self.stages: Dict[str, StageStats] = {}
+        self.counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, stage: str, items: int = 0, bytes: int = 0) -> Iterator[Span]:
+        """
+        Times a stage.
+
+        Args:
+            stage: The name of the stage.
+            items: The items processed, if known up front.
+            bytes: The bytes processed, if known up front.
+
+        Returns:
+            A context manager yielding the span, whose add method counts the items
+            and bytes processed while the stage runs.
+        """
+        span = Span(items, bytes)
+        start = self.clock()
+        failed = False
+        try:
+            yield span
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.record(stage, self.clock() - start, span.items, span.bytes, failed)
+
+    def timed_iter(
+        self,
+        stage: str,
+        iterable: Iterable[T],
+        bytes_processed: Optional[Callable[[], int]] = None,
+    ) -> Iterator[T]:
+        """
+        Times a stage that produces items lazily, such as a streaming parser.
+
+        Only the time spent producing the items is counted, not the time the
+        consumer spends between them.
+
+        Args:
+            stage: The name of the stage.
+            iterable: The items produced by the stage.
+            bytes_processed: Returns the bytes processed once the items are consumed.
+
+        Returns:
+            An iterator yielding the items.
+        """
+        iterator = iter(iterable)
+        items = 0
+        seconds = 0.0
+        failed = False
+        try:
+            while True:
+                start = self.clock()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    seconds += self.clock() - start
+                    return
+                seconds += self.clock() - start
+                items += 1
+                yield item
+        except GeneratorExit:
+            # The consumer stopped early, which is not a failure of the stage
+            raise
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            bytes = bytes_processed() if bytes_processed is not None else 0
+            self.record(stage, seconds, items, bytes, failed)
+
+    def record(
+        self,
+        stage: str,
+        seconds: float,
+        items: int = 0,
+        bytes: int = 0,
+        failed: bool = False,
+    ) -> None:
+        """
+        Records a stage timed elsewhere, such as decompression inside a stream.
+
+        Args:
+            stage: The name of the stage.
+            seconds: The time the stage took.
+            items: The items processed.
+            bytes: The bytes processed.
+            failed: Whether the stage raised an error.
+        """
+        with self._lock:
+            stats = self.stages.get(stage)
+            if stats is None:
+                stats = self.stages[stage] = StageStats()
+            stats.calls += 1
+            stats.errors += failed
+            stats.seconds += seconds
+            stats.items += items
+            stats.bytes += bytes
+
+    def count(self, name: str, value: float = 1) -> None:
+        """
+        Adds to a counter.
+
+        Args:
+            name: The name of the counter.
+            value: The amount to add.
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def _values(self) -> List[tuple]:
+        """
+        Returns:
+            (name, unit, value) tuples of the recorded stages and counters.
+        """
+        values = []
+        for stage, stats in sorted(self.stages.items()):
+            values.append((f"{stage}.Calls", "Count", stats.calls))
+            values.append((f"{stage}.Duration", "Milliseconds", stats.seconds * 1000))
+            if stats.errors:
+                values.append((f"{stage}.Errors", "Count", stats.errors))
+            if stats.items:
+                values.append((f"{stage}.Items", "Count", stats.items))
+            if stats.bytes:
+                values.append((f"{stage}.Bytes", "Bytes", stats.bytes))
+            if stats.seconds > 0 and stats.items:
+                items_per_second = stats.items / stats.seconds
+                values.append((f"{stage}.ItemsPerSecond", "Count/Second", items_per_second))
+            if stats.seconds > 0 and stats.bytes:
+                bytes_per_second = stats.bytes / stats.seconds
+                values.append((f"{stage}.BytesPerSecond", "Bytes/Second", bytes_per_second))
+        for name, value in sorted(self.counters.items()):
+            values.append((name, "Count", value))
+        return values
+
+    def flush(self) -> Optional[Dict]:
+        """
+        Emits the metrics recorded since the last flush as one EMF document.
+
+        Returns:
+            The EMF document, or None if nothing was recorded.
+        """
+        with self._lock:
+            values = self._values()
+            self.stages = {}
+            self.counters = {}
+        if not values:
+            return None
+
+        definitions = [{"Name": name, "Unit": unit} for name, unit, _ in values]
+        document: Dict = {
+            "_aws": {
+                "Timestamp": int(time.time() * 1000),
+                "CloudWatchMetrics": [
+                    {
+                        "Namespace": self.namespace,
+                        "Dimensions": [sorted(self.dimensions)],
+                        "Metrics": definitions[i : i + MAX_DIRECTIVE_METRICS],
+                    }
+                    for i in range(0, len(definitions), MAX_DIRECTIVE_METRICS)
+                ],
+            },
+            **self.dimensions,
+        }
+        for name, _, value in values:
+            document[name] = value
+        self.sink.emit(document)
+        return document
+
+    def summary(self) -> str:
+        """
+        Returns:
+            The duration and items of each stage recorded since the last flush.
+        """
+        with self._lock:
+            return ", ".join(
+                f"{stage}={stats.seconds * 1000:.1f}ms/{stats.items} items"
+                for stage, stats in sorted(self.stages.items())
+            )
+
+
+def metrics_from_env() -> Metrics:
+    """
+    Builds the metrics collector from the environment.
+    """
+    sink = MemorySink() if os.getenv("METRICS_SINK") == "memory" else StdoutSink()
+    return Metrics(
+        namespace=os.getenv("METRICS_NAMESPACE", DEFAULT_NAMESPACE),
+        dimensions={"Function": os.getenv("AWS_LAMBDA_FUNCTION_NAME", "local")},
+        sink=sink,
+    )
+
+
+# Shared by every module of a Lambda container, flushed by the handlers
+metrics = metrics_from_env()
@@ -0,0 +1,42 @@
+from dataclasses import FrozenInstanceError, fields
+from typing import Type, TypeVar
+
+T = TypeVar("T")
+
+
+def slotted(cls: Type[T]) -> Type[T]:
+    """
+    Rebuilds a dataclass with __slots__, as dataclass(slots=True) does on Python 3.10+.
+
+    Instances then have no __dict__, which roughly halves their size. Apply it
+    above the @dataclass decorator.
+
+    Args:
+        cls: The dataclass.
+
+    Returns:
+        The slotted dataclass.
+    """
+    field_names = tuple(field.name for field in fields(cls))
+    cls_dict = dict(cls.__dict__)
+    for name in field_names:
+        # The defaults live on the generated __init__, not on the class
+        cls_dict.pop(name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+    cls_dict["__slots__"] = field_names
+    if cls.__dataclass_params__.frozen:
+        # The generated ones only recognize instances of the original class
+        cls_dict["__setattr__"] = _frozen_setattr
+        cls_dict["__delattr__"] = _frozen_delattr
+    slotted_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    slotted_cls.__qualname__ = cls.__qualname__
+    return slotted_cls
+
+
+def _frozen_setattr(self, name, value):
+    raise FrozenInstanceError(f"cannot assign to field {name!r}")
+
+
+def _frozen_delattr(self, name):
+    raise FrozenInstanceError(f"cannot delete field {name!r}")
@@ -1,9 +1,12 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, Optional, TextIO
 
+from recor_layer.models.slotted import slotted
 from recor_layer.models.woocommerce.woocommerce_image import WooCommerceImage
+from recor_layer.models.woocommerce.woocommerce_json import json_value
 
 
+@slotted
 @dataclass(frozen=True)
 class WooCommerceCategory:
     """
@@ -39,3 +42,38 @@ class WooCommerceCategory:
             woocommerce_category["image"] = self.image.to_json()
 
         return woocommerce_category
+
+    def write_json(self, out: TextIO) -> None:
+        """
+        Writes the json transformation of to_json to a text buffer
+        """
+        out.write('{"name":')
+        out.write(json_value(self.name))
+        out.write(',"slug":')
+        out.write(json_value(self.slug))
+        if self.parent:
+            out.write(',"parent":')
+            out.write(json_value(int(self.parent)))
+        if self.id:
+            out.write(',"id":')
+            out.write(json_value(int(self.id)))
+        if self.image:
+            out.write(',"image":')
+            self.image.write_json(out)
+        out.write("}")
+
+
+# Shared category references by ID, as products only refer to categories by ID
+_category_references: Dict[int, WooCommerceCategory] = {}
+
+
+def category_reference(category_id: int) -> WooCommerceCategory:
+    """
+    Returns the shared WooCommerceCategory that references a category by ID
+    """
+    reference = _category_references.get(category_id)
+    if reference is None:
+        reference = _category_references.setdefault(
+            category_id, WooCommerceCategory(id=category_id)
+        )
+    return reference
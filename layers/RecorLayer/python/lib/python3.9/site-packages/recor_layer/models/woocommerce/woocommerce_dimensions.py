@@ -1,7 +1,11 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, TextIO
 
+from recor_layer.models.slotted import slotted
+from recor_layer.models.woocommerce.woocommerce_json import json_value
 
+
+@slotted
 @dataclass(frozen=True)
 class WooCommerceDimensions:
     """
@@ -23,3 +27,15 @@ class WooCommerceDimensions:
             "width": self.width,
             "height": self.height,
         }
+
+    def write_json(self, out: TextIO) -> None:
+        """
+        Writes the json transformation of to_json to a text buffer
+        """
+        out.write('{"length":')
+        out.write(json_value(self.length))
+        out.write(',"width":')
+        out.write(json_value(self.width))
+        out.write(',"height":')
+        out.write(json_value(self.height))
+        out.write("}")
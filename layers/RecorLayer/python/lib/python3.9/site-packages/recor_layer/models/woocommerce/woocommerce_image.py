@@ -1,7 +1,11 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, TextIO
 
+from recor_layer.models.slotted import slotted
+from recor_layer.models.woocommerce.woocommerce_json import json_value
 
+
+@slotted
 @dataclass(frozen=True)
 class WooCommerceImage:
     """
@@ -28,3 +32,16 @@ class WooCommerceImage:
             woocommerce_image["id"] = int(self.id)
 
         return woocommerce_image
+
+    def write_json(self, out: TextIO) -> None:
+        """
+        Writes the json transformation of to_json to a text buffer
+        """
+        out.write('{"src":')
+        out.write(json_value(self.src))
+        out.write(',"name":')
+        out.write(json_value(self.name))
+        if self.id:
+            out.write(',"id":')
+            out.write(json_value(int(self.id)))
+        out.write("}")
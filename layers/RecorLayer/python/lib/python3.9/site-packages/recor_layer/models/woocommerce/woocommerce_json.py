@@ -0,0 +1,94 @@
+import io
+import json
+import math
+from decimal import Decimal
+from json.encoder import encode_basestring
+from typing import Any, Iterable, TextIO
+
+"""
+Writes WooCommerce request bodies in one pass. Models write their JSON straight
+into a shared text buffer through write_json, instead of building the dicts of
+to_json that json.dumps then walks again.
+"""
+
+
+def json_value(value: Any) -> str:
+    """
+    Encodes a scalar as JSON, like json.dumps(value, ensure_ascii=False).
+
+    Args:
+        value: A string, number, boolean or None.
+
+    Returns:
+        The JSON text of the value.
+
+    Raises:
+        ValueError: If the value is a NaN or infinite number, which JSON cannot
+                    represent.
+    """
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, str):
+        return encode_basestring(value)
+    if isinstance(value, int):
+        return int.__repr__(value)
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            raise ValueError(
+                f"Out of range float values are not JSON compliant: {value}"
+            )
+        return float.__repr__(value)
+    if isinstance(value, Decimal):
+        if not value.is_finite():
+            raise ValueError(
+                f"Out of range Decimal values are not JSON compliant: {value}"
+            )
+        return str(value)
+    return json.dumps(value, ensure_ascii=False, allow_nan=False)
+
+
+def write_json_array(out: TextIO, models: Iterable) -> None:
+    """
+    Writes a JSON array of models.
+
+    Args:
+        out: The text buffer to write to.
+        models: Models with a write_json method.
+    """
+    out.write("[")
+    first = True
+    for model in models:
+        if not first:
+            out.write(",")
+        first = False
+        model.write_json(out)
+    out.write("]")
+
+
+def encode_batch(
+    create: Iterable = (), update: Iterable = (), delete: Iterable[int] = ()
+) -> bytes:
+    """
+    Encodes the body of a WooCommerce batch request.
+
+    Args:
+        create: The models to create.
+        update: The models to update.
+        delete: The IDs to delete.
+
+    Returns:
+        The UTF-8 encoded JSON body.
+    """
+    out = io.StringIO()
+    out.write('{"create":')
+    write_json_array(out, create)
+    out.write(',"update":')
+    write_json_array(out, update)
+    out.write(',"delete":[')
+    out.write(",".join(json_value(int(object_id)) for object_id in delete))
+    out.write("]}")
+    return out.getvalue().encode("utf-8")
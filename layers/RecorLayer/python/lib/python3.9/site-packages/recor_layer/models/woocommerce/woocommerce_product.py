@@ -1,13 +1,19 @@
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, TextIO
 
+from recor_layer.models.slotted import slotted
 from recor_layer.models.woocommerce.woocommerce_dimensions import WooCommerceDimensions
 from recor_layer.models.woocommerce.woocommerce_image import WooCommerceImage
-from recor_product_transformer.libs.models.woocommerce.woocommerce_category import (
+from recor_layer.models.woocommerce.woocommerce_category import (
     WooCommerceCategory,
 )
+from recor_layer.models.woocommerce.woocommerce_json import (
+    json_value,
+    write_json_array,
+)
 
 
+@slotted
 @dataclass(frozen=True)
 class WooCommerceProduct:
     """
@@ -54,3 +60,35 @@ class WooCommerceProduct:
             woocommerce_product["id"] = int(self.id)
 
         return woocommerce_product
+
+    def write_json(self, out: TextIO) -> None:
+        """
+        Writes the json transformation of to_json to a text buffer
+        """
+        out.write('{"type":')
+        out.write(json_value(self.type))
+        out.write(',"slug":')
+        out.write(json_value(self.slug))
+        out.write(',"sku":')
+        out.write(json_value(self.sku))
+        out.write(',"name":')
+        out.write(json_value(self.name))
+        out.write(',"regular_price":')
+        out.write(json_value(self.regular_price))
+        out.write(',"stock_quantity":')
+        out.write(json_value(self.stock_quantity))
+        out.write(',"description":')
+        out.write(json_value(self.description))
+        out.write(',"categories":')
+        write_json_array(out, self.categories)
+        out.write(',"images":')
+        write_json_array(out, self.images)
+        out.write(',"weight":')
+        out.write(json_value(self.weight))
+        if self.dimensions:
+            out.write(',"dimensions":')
+            self.dimensions.write_json(out)
+        if self.id:
+            out.write(',"id":')
+            out.write(json_value(int(self.id)))
+        out.write("}")
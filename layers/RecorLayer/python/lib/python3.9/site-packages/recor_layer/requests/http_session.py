@@ -0,0 +1,99 @@
+import os
+import random
+from typing import Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from recor_layer.services.registry import registry
+
+"""
+One connection pooled session per upstream host, kept for the life of the
+container so connections and TLS sessions are reused across requests.
+"""
+
+DEFAULT_CONNECT_TIMEOUT_SECONDS = 3.05
+DEFAULT_READ_TIMEOUT_SECONDS = 30.0
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_MAX_RETRIES = 3
+RETRY_BACKOFF_FACTOR = 0.3
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class JitteredRetry(Retry):
+    """
+    Retries idempotent requests with full jitter exponential backoff.
+
+    Requests with other methods, such as POST, are only retried on connection
+    errors, which happen before the request reaches the server.
+    """
+
+    def get_backoff_time(self) -> float:
+        return random.uniform(0, super().get_backoff_time())
+
+
+class PooledSession(requests.Session):
+    """
+    A session that applies default connect and read timeouts to every request.
+    """
+
+    def __init__(self, timeout: Tuple[float, float]):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+def build_session(host: str) -> PooledSession:
+    """
+    Builds a pooled session for an upstream host, configured from the environment.
+
+    Args:
+        host: The scheme and host of the upstream, e.g. https://shop.example.com.
+
+    Returns:
+        The session.
+    """
+    session = PooledSession(
+        timeout=(
+            float(
+                os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", DEFAULT_CONNECT_TIMEOUT_SECONDS)
+            ),
+            float(os.getenv("HTTP_READ_TIMEOUT_SECONDS", DEFAULT_READ_TIMEOUT_SECONDS)),
+        )
+    )
+    max_retries = int(os.getenv("HTTP_MAX_RETRIES", DEFAULT_MAX_RETRIES))
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=int(os.getenv("HTTP_POOL_MAXSIZE", DEFAULT_POOL_MAXSIZE)),
+        max_retries=JitteredRetry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            backoff_factor=RETRY_BACKOFF_FACTOR,
+            status_forcelist=RETRY_STATUS_CODES,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        ),
+    )
+    session.mount(f"{host}/", adapter)
+    return session
+
+
+def session_for(url: str) -> PooledSession:
+    """
+    Returns the shared session of the host of a URL.
+
+    Args:
+        url: Any URL of the upstream host.
+
+    Returns:
+        The session.
+    """
+    parsed_url = urlparse(url)
+    return registry.get(build_session, f"{parsed_url.scheme}://{parsed_url.netloc}")
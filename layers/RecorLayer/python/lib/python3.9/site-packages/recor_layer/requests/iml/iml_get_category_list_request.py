@@ -1,20 +1,29 @@
 from typing import cast
 
-import requests
+from recor_layer.log import log
+from recor_layer.requests.http_session import session_for
 from recor_layer.requests.iml.iml_base_request import ImlBaseRequest
 
 
 class ImlGetCategoryListRequest(ImlBaseRequest):
     def run(self) -> dict:
 
-        print("ATTEMPT: Getting Item Category List from IML")
+        log.attempt("Getting Item Category List from IML")
 
-        response = requests.get(
-            self.base_url + "/item_category_list/", params=self.default_params
+        response = session_for(self.base_url).get(
+            self.base_url + "/item_category_list/",
+            params=self.default_params,
+            headers=self.default_headers,
         )
 
         if response.ok:
-            print("SUCCESS: Received Item Category List from IML")
+            log.success(
+                "Received Item Category List from IML, Content-Encoding: %s, "
+                "Content-Length: %s, decoded %d bytes",
+                response.headers.get("Content-Encoding", "identity"),
+                response.headers.get("Content-Length"),
+                len(response.content),
+            )
             return cast(dict, response.json()["category_list"])
         else:
             raise Exception(response.text)
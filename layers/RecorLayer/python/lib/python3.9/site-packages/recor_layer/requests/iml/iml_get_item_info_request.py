@@ -1,4 +1,5 @@
-import requests
+from recor_layer.log import log
+from recor_layer.requests.http_session import session_for
 from recor_layer.requests.iml.iml_base_request import ImlBaseRequest
 
 
@@ -6,13 +7,21 @@ class ImlGetItemInfoRequest(ImlBaseRequest):
 
     def run(self, counter: int):
 
-        print("ATTEMPT: Getting Item Info Response from IML")
+        log.attempt("Getting Item Info Response from IML")
         item_info = self.base_url + "/item_info_since/" + str(counter)
 
-        response = requests.get(item_info, params=self.default_params, stream=True)
+        response = session_for(self.base_url).get(
+            item_info,
+            params=self.default_params,
+            headers=self.default_headers,
+            stream=True,
+        )
 
         if response.ok:
-            print("SUCCESS: Received Item Info Response from IML")
+            log.success(
+                "Received Item Info Response from IML, Content-Encoding: %s",
+                response.headers.get("Content-Encoding", "identity"),
+            )
             return response
         else:
             raise Exception(response.text)
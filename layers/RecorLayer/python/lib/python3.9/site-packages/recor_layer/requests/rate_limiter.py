@@ -0,0 +1,186 @@
+import os
+import threading
+import time
+from collections import Counter
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+
+import requests
+
+from recor_layer.log import log
+
+"""
+Adaptive client side rate limiting. Requests take tokens from a bucket that
+refills at the current rate, and the rate follows the upstream's capacity:
+it is halved when the upstream throttles, and grows back step by step while
+responses are healthy.
+"""
+
+DEFAULT_INITIAL_RATE = 10.0
+DEFAULT_MIN_RATE = 0.5
+DEFAULT_MAX_RATE = 50.0
+DEFAULT_BURST = 4
+RATE_INCREASE_STEP = 0.2
+RATE_DECREASE_FACTOR = 0.5
+THROTTLED_STATUS_CODES = (429, 503)
+
+
+def parse_retry_after(value: Optional[str], now: float) -> Optional[float]:
+    """
+    Parses a Retry-After header.
+
+    Args:
+        value: The header value, in seconds or as an HTTP date.
+        now: The current wall clock time, to resolve HTTP dates against.
+
+    Returns:
+        The seconds to wait, or None if the header is missing or malformed.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - now, 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveRateLimiter:
+    """
+    Thread safe token bucket whose rate is adjusted with AIMD, additive increase
+    and multiplicative decrease, from the responses of the upstream.
+    """
+
+    def __init__(
+        self,
+        initial_rate: float = DEFAULT_INITIAL_RATE,
+        min_rate: float = DEFAULT_MIN_RATE,
+        max_rate: float = DEFAULT_MAX_RATE,
+        burst: int = DEFAULT_BURST,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initializes the AdaptiveRateLimiter.
+
+        Args:
+            initial_rate: The starting rate, in requests per second.
+            min_rate: The lowest rate throttling can decrease to.
+            max_rate: The highest rate healthy responses can increase to.
+            burst: The count of requests that can be sent at once after idling.
+            clock: The clock tokens are refilled with.
+            sleep: Waits for a number of seconds.
+        """
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.clock = clock
+        self.sleep = sleep
+        self.rate = min(max(initial_rate, min_rate), max_rate)
+        self.counters: Counter = Counter()
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated_at = clock()
+        self._blocked_until = 0.0
+        self._decreased_at: Optional[float] = None
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    def acquire(self) -> float:
+        """
+        Takes a token, waiting until one is available.
+
+        Tokens are reserved in arrival order, so concurrent callers wait in line
+        instead of all waking up at once.
+
+        Returns:
+            The seconds waited.
+        """
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            self._tokens -= 1
+            wait = max(self._blocked_until - now, 0.0) + max(
+                -self._tokens / self.rate, 0.0
+            )
+            self.counters["requests"] += 1
+            if wait:
+                self.counters["delayed"] += 1
+        if wait:
+            self.sleep(wait)
+        return wait
+
+    def on_response(self, throttled: bool, retry_after: Optional[float] = None) -> None:
+        """
+        Adjusts the rate to the outcome of a request.
+
+        Args:
+            throttled: Whether the upstream throttled the request.
+            retry_after: The seconds the upstream asked to wait, if any.
+        """
+        with self._lock:
+            now = self.clock()
+            if not throttled:
+                self.rate = min(self.rate + RATE_INCREASE_STEP, self.max_rate)
+                return
+
+            self.counters["throttled"] += 1
+            # Requests already in flight are throttled together, that's one decrease
+            if self._decreased_at is None or now - self._decreased_at >= 1 / self.rate:
+                self._refill(now)
+                self.rate = max(self.rate * RATE_DECREASE_FACTOR, self.min_rate)
+                self._tokens = min(self._tokens, 0.0)
+                self._decreased_at = now
+                log.warning("Upstream throttled, rate decreased to %.2f/s", self.rate)
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+
+    def observe(self, response: requests.Response) -> None:
+        """
+        Adjusts the rate to a response, including the attempts urllib3 retried.
+
+        Args:
+            response: The response of a request sent after acquire.
+        """
+        retries = getattr(response.raw, "retries", None)
+        for attempt in getattr(retries, "history", ()):
+            if attempt.status in THROTTLED_STATUS_CODES:
+                self.on_response(throttled=True)
+        throttled = response.status_code in THROTTLED_STATUS_CODES
+        retry_after = (
+            parse_retry_after(response.headers.get("Retry-After"), time.time())
+            if throttled
+            else None
+        )
+        self.on_response(throttled, retry_after)
+
+    def summary(self) -> str:
+        """
+        Returns:
+            The current rate and the count of delayed and throttled requests.
+        """
+        return (
+            f"rate={self.rate:.2f}/s, requests={self.counters['requests']}, "
+            f"delayed={self.counters['delayed']}, "
+            f"throttled={self.counters['throttled']}"
+        )
+
+
+def woocommerce_rate_limiter() -> AdaptiveRateLimiter:
+    """
+    Builds the rate limiter shared by every WooCommerce request, from the environment.
+    """
+    return AdaptiveRateLimiter(
+        initial_rate=float(
+            os.getenv("WOOCOMMERCE_RATE_LIMIT_INITIAL", DEFAULT_INITIAL_RATE)
+        ),
+        min_rate=float(os.getenv("WOOCOMMERCE_RATE_LIMIT_MIN", DEFAULT_MIN_RATE)),
+        max_rate=float(os.getenv("WOOCOMMERCE_RATE_LIMIT_MAX", DEFAULT_MAX_RATE)),
+        burst=int(os.getenv("WOOCOMMERCE_RATE_LIMIT_BURST", DEFAULT_BURST)),
+    )
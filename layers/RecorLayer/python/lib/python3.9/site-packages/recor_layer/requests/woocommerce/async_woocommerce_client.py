@@ -0,0 +1,89 @@
+import asyncio
+import os
+from typing import Any, Dict, Optional
+
+import requests
+
+from recor_layer.requests.woocommerce.woocommerce_client import (
+    WooCommerceClient,
+    woocommerce_client,
+)
+from recor_layer.services.registry import registry
+
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+class AsyncWooCommerceClient:
+    """
+    Awaitable WooCommerce REST API client with bounded concurrency.
+
+    Requests are sent through a WooCommerceClient, so they share its pooled
+    session, retries and OAuth/basic authentication. Each request runs in a worker
+    thread, and at most max_concurrency of them are in flight at a time.
+    """
+
+    def __init__(self, client: WooCommerceClient, max_concurrency: int):
+        """
+        Initializes the AsyncWooCommerceClient.
+
+        Args:
+            client: The WooCommerce client to send the requests with.
+            max_concurrency: The maximum count of requests in flight at a time.
+        """
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # A semaphore belongs to one event loop, and every sync call runs its own
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _request(self, send, *args) -> requests.Response:
+        async with self._get_semaphore():
+            return await asyncio.to_thread(send, *args)
+
+    async def get(
+        self, endpoint: str, params: Optional[Dict[str, Any]] = None
+    ) -> requests.Response:
+        return await self._request(self.client.get, endpoint, params)
+
+    async def post(self, endpoint: str, data: Any) -> requests.Response:
+        return await self._request(self.client.post, endpoint, data)
+
+    async def post_json_body(self, endpoint: str, body: bytes) -> requests.Response:
+        """
+        Posts an already encoded JSON body.
+
+        Args:
+            endpoint: The endpoint, relative to the wc/v3 API.
+            body: The UTF-8 encoded JSON body.
+
+        Returns:
+            The response.
+        """
+        return await self._request(self.client.post_json_body, endpoint, body)
+
+    async def put(self, endpoint: str, data: Any) -> requests.Response:
+        return await self._request(self.client.put, endpoint, data)
+
+    async def delete(
+        self, endpoint: str, params: Optional[Dict[str, Any]] = None
+    ) -> requests.Response:
+        return await self._request(self.client.delete, endpoint, params)
+
+
+def async_woocommerce_client() -> AsyncWooCommerceClient:
+    """
+    Builds the async WooCommerce client from the environment, on the shared client.
+    """
+    return AsyncWooCommerceClient(
+        client=registry.get(woocommerce_client),
+        max_concurrency=int(
+            os.getenv("WOOCOMMERCE_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)
+        ),
+    )
@@ -1,14 +1,47 @@
-import os
+import asyncio
+from typing import Any, Dict, List
 
-from woocommerce import API
+import requests
+
+from recor_layer.requests.woocommerce.async_woocommerce_client import (
+    async_woocommerce_client,
+)
+from recor_layer.requests.woocommerce.woocommerce_client import woocommerce_client
+from recor_layer.services.registry import registry
 
 
 class WooCommerceBaseRequest:
     def __init__(self):
-        self.client = API(
-            url=os.getenv("WOOCOMMERCE_BASE_URL"),
-            consumer_key=os.getenv("WOOCOMMERCE_CONSUMER_KEY"),
-            consumer_secret=os.getenv("WOOCOMMERCE_CONSUMER_SECRET"),
-            version="wc/v3",
-            timeout=30,
+        # One client, and its pooled session, is shared by every request of the container
+        self.client = registry.get(woocommerce_client)
+        self.async_client = registry.get(async_woocommerce_client)
+
+    async def _list_pages_async(
+        self, endpoint: str, params: Dict[str, Any]
+    ) -> List[requests.Response]:
+        """
+        Gets every page of a list endpoint.
+
+        The first page tells how many pages there are, the others are then
+        requested concurrently.
+
+        Args:
+            endpoint: The endpoint, relative to the wc/v3 API.
+            params: The query parameters of the list.
+
+        Returns:
+            The responses of the pages, in page order. Failed responses are
+            returned as is, for the caller to handle.
+        """
+        first_page = await self.async_client.get(endpoint, params=params)
+        if not first_page.ok:
+            return [first_page]
+
+        total_pages = int(first_page.headers.get("X-WP-TotalPages", 1))
+        other_pages = await asyncio.gather(
+            *(
+                self.async_client.get(endpoint, params={**params, "page": page})
+                for page in range(2, total_pages + 1)
+            )
         )
+        return [first_page, *other_pages]
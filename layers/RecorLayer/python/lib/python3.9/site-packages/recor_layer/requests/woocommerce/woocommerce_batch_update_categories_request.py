@@ -1,6 +1,10 @@
 from typing import List, cast, Optional
 
+import requests
+
+from recor_layer.log import log
 from recor_layer.models.woocommerce.woocommerce_category import WooCommerceCategory
+from recor_layer.models.woocommerce.woocommerce_json import encode_batch
 from recor_layer.requests.woocommerce.woocommerce_base_request import (
     WooCommerceBaseRequest,
 )
@@ -17,6 +21,34 @@ class WooCommerceBatchUpdateCategoriesRequest(WooCommerceBaseRequest):
         old_categories: Optional[List[WooCommerceCategory]] = None,
         delete_categories_ids: Optional[List[int]] = None,
     ) -> dict:
+        categories_body = self._encode(
+            new_categories, old_categories, delete_categories_ids
+        )
+        response = self.client.post_json_body(
+            "products/categories/batch", categories_body
+        )
+        return self._handle_response(response)
+
+    async def run_async(
+        self,
+        new_categories: Optional[List[WooCommerceCategory]] = None,
+        old_categories: Optional[List[WooCommerceCategory]] = None,
+        delete_categories_ids: Optional[List[int]] = None,
+    ) -> dict:
+        categories_body = self._encode(
+            new_categories, old_categories, delete_categories_ids
+        )
+        response = await self.async_client.post_json_body(
+            "products/categories/batch", categories_body
+        )
+        return self._handle_response(response)
+
+    @staticmethod
+    def _encode(
+        new_categories: Optional[List[WooCommerceCategory]],
+        old_categories: Optional[List[WooCommerceCategory]],
+        delete_categories_ids: Optional[List[int]],
+    ) -> bytes:
         if new_categories is None:
             new_categories = []
         if old_categories is None:
@@ -24,19 +56,26 @@ class WooCommerceBatchUpdateCategoriesRequest(WooCommerceBaseRequest):
         if delete_categories_ids is None:
             delete_categories_ids = []
 
-        categories_json = {
-            "create": [category.to_json() for category in new_categories],
-            "update": [category.to_json() for category in old_categories],
-            "delete": delete_categories_ids,
-        }
-
-        print("ATTEMPT: Batch Updating WooCommerce Categories:", categories_json)
+        categories_body = encode_batch(
+            create=new_categories, update=old_categories, delete=delete_categories_ids
+        )
 
-        response = self.client.post("products/categories/batch", categories_json)
+        log.attempt(
+            "Batch Updating WooCommerce Categories: create=%d, update=%d, delete=%d, %d bytes",
+            len(new_categories),
+            len(old_categories),
+            len(delete_categories_ids),
+            len(categories_body),
+        )
+        log.debug("WooCommerce Categories batch body: %s", categories_body)
+        return categories_body
 
+    @staticmethod
+    def _handle_response(response: requests.Response) -> dict:
         if response.ok:
             # TODO: Handle Create/Update Failures
-            print("SUCCESS: Updated WooCommerce Categories:", response.json())
-            return cast(dict, response.json())
+            batch_response = response.json()
+            log.success("Updated WooCommerce Categories: %s", batch_response)
+            return cast(dict, batch_response)
         else:
             raise Exception(response.text)
@@ -1,5 +1,9 @@
 from typing import List, cast, Optional
 
+import requests
+
+from recor_layer.log import log
+from recor_layer.models.woocommerce.woocommerce_json import encode_batch
 from recor_layer.models.woocommerce.woocommerce_product import WooCommerceProduct
 from recor_layer.requests.woocommerce.woocommerce_base_request import (
     WooCommerceBaseRequest,
@@ -17,6 +21,26 @@ class WooCommerceBatchUpdateProductsRequest(WooCommerceBaseRequest):
         old_products: Optional[List[WooCommerceProduct]] = None,
         delete_product_ids: Optional[List[int]] = None,
     ) -> dict:
+        products_body = self._encode(new_products, old_products, delete_product_ids)
+        response = self.client.post_json_body("products/batch", products_body)
+        return self._handle_response(response)
+
+    async def run_async(
+        self,
+        new_products: Optional[List[WooCommerceProduct]] = None,
+        old_products: Optional[List[WooCommerceProduct]] = None,
+        delete_product_ids: Optional[List[int]] = None,
+    ) -> dict:
+        products_body = self._encode(new_products, old_products, delete_product_ids)
+        response = await self.async_client.post_json_body("products/batch", products_body)
+        return self._handle_response(response)
+
+    @staticmethod
+    def _encode(
+        new_products: Optional[List[WooCommerceProduct]],
+        old_products: Optional[List[WooCommerceProduct]],
+        delete_product_ids: Optional[List[int]],
+    ) -> bytes:
         if new_products is None:
             new_products = []
         if old_products is None:
@@ -24,19 +48,26 @@ class WooCommerceBatchUpdateProductsRequest(WooCommerceBaseRequest):
         if delete_product_ids is None:
             delete_product_ids = []
 
-        products_json = {
-            "create": [product.to_json() for product in new_products],
-            "update": [product.to_json() for product in old_products],
-            "delete": delete_product_ids,
-        }
-
-        print("ATTEMPT: Batch Updating WooCommerce Products:", products_json)
+        products_body = encode_batch(
+            create=new_products, update=old_products, delete=delete_product_ids
+        )
 
-        response = self.client.post("products/batch", products_json)
+        log.attempt(
+            "Batch Updating WooCommerce Products: create=%d, update=%d, delete=%d, %d bytes",
+            len(new_products),
+            len(old_products),
+            len(delete_product_ids),
+            len(products_body),
+        )
+        log.debug("WooCommerce Products batch body: %s", products_body)
+        return products_body
 
+    @staticmethod
+    def _handle_response(response: requests.Response) -> dict:
         if response.ok:
             # TODO: Handle Create/Update Failures
-            print("SUCCESS: Updated WooCommerce Products:", response.json())
-            return cast(dict, response.json())
+            batch_response = response.json()
+            log.success("Updated WooCommerce Products: %s", batch_response)
+            return cast(dict, batch_response)
         else:
             raise Exception(response.text)
@@ -0,0 +1,136 @@
+import json
+import os
+from typing import Any, Dict, Optional
+
+import requests
+from requests.auth import HTTPBasicAuth
+from woocommerce.oauth import OAuth
+
+from recor_layer.log import log
+from recor_layer.requests.http_session import session_for
+from recor_layer.requests.rate_limiter import (
+    AdaptiveRateLimiter,
+    woocommerce_rate_limiter,
+)
+from recor_layer.services.registry import registry
+
+API_VERSION = "wc/v3"
+USER_AGENT = "Recor-WooCommerce-Client"
+# A 429 means the request was not processed, so even a POST is safe to send again.
+# urllib3 already sends the idempotent ones again.
+MAX_THROTTLED_ATTEMPTS = 3
+IDEMPOTENT_METHODS = ("GET", "PUT", "DELETE")
+
+
+class WooCommerceClient:
+    """
+    WooCommerce REST API client on the shared, pooled session of the store's host.
+
+    It authenticates like woocommerce.API: basic auth over https, and OAuth 1.0a
+    signed URLs over plain http. Every request goes through the rate limiter.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        consumer_key: str,
+        consumer_secret: str,
+        rate_limiter: AdaptiveRateLimiter,
+    ):
+        """
+        Initializes the WooCommerceClient.
+
+        Args:
+            url: The base URL of the store.
+            consumer_key: The REST API consumer key.
+            consumer_secret: The REST API consumer secret.
+            rate_limiter: The rate limiter shared by the requests to the store.
+        """
+        self.url = url.rstrip("/")
+        self.consumer_key = consumer_key
+        self.consumer_secret = consumer_secret
+        self.is_ssl = self.url.startswith("https")
+        self.session = session_for(self.url)
+        self.rate_limiter = rate_limiter
+        self.auth = HTTPBasicAuth(consumer_key, consumer_secret) if self.is_ssl else None
+
+    def _request(
+        self,
+        method: str,
+        endpoint: str,
+        body: Optional[bytes] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> requests.Response:
+        url = f"{self.url}/wp-json/{API_VERSION}/{endpoint}"
+        headers = {"user-agent": USER_AGENT, "accept": "application/json"}
+        if body is not None:
+            headers["content-type"] = "application/json;charset=utf-8"
+        if not self.is_ssl:
+            # The OAuth signature covers the query string, so it is built into the URL
+            url = OAuth(
+                url=requests.Request("GET", url, params=params).prepare().url,
+                consumer_key=self.consumer_key,
+                consumer_secret=self.consumer_secret,
+                version=API_VERSION,
+                method=method,
+            ).get_oauth_url()
+            params = None
+
+        for attempt in range(1, MAX_THROTTLED_ATTEMPTS + 1):
+            self.rate_limiter.acquire()
+            response = self.session.request(
+                method, url, params=params, data=body, headers=headers, auth=self.auth
+            )
+            self.rate_limiter.observe(response)
+            if (
+                response.status_code != 429
+                or method in IDEMPOTENT_METHODS
+                or attempt == MAX_THROTTLED_ATTEMPTS
+            ):
+                return response
+            log.warning("WooCommerce throttled %s %s, attempt %d", method, endpoint, attempt)
+
+    def get(
+        self, endpoint: str, params: Optional[Dict[str, Any]] = None
+    ) -> requests.Response:
+        return self._request("GET", endpoint, params=params)
+
+    def post(self, endpoint: str, data: Any) -> requests.Response:
+        return self.post_json_body(
+            endpoint, json.dumps(data, ensure_ascii=False).encode("utf-8")
+        )
+
+    def post_json_body(self, endpoint: str, body: bytes) -> requests.Response:
+        """
+        Posts an already encoded JSON body.
+
+        Args:
+            endpoint: The endpoint, relative to the wc/v3 API.
+            body: The UTF-8 encoded JSON body.
+
+        Returns:
+            The response.
+        """
+        return self._request("POST", endpoint, body=body)
+
+    def put(self, endpoint: str, data: Any) -> requests.Response:
+        return self._request(
+            "PUT", endpoint, body=json.dumps(data, ensure_ascii=False).encode("utf-8")
+        )
+
+    def delete(
+        self, endpoint: str, params: Optional[Dict[str, Any]] = None
+    ) -> requests.Response:
+        return self._request("DELETE", endpoint, params=params)
+
+
+def woocommerce_client() -> WooCommerceClient:
+    """
+    Builds the WooCommerce client from the environment.
+    """
+    return WooCommerceClient(
+        url=os.getenv("WOOCOMMERCE_BASE_URL"),
+        consumer_key=os.getenv("WOOCOMMERCE_CONSUMER_KEY"),
+        consumer_secret=os.getenv("WOOCOMMERCE_CONSUMER_SECRET"),
+        rate_limiter=registry.get(woocommerce_rate_limiter),
+    )
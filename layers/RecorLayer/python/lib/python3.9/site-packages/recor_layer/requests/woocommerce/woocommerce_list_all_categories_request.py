@@ -1,22 +1,51 @@
 from typing import List, Optional, cast
 
+from recor_layer.log import log
 from recor_layer.requests.woocommerce.woocommerce_base_request import (
     WooCommerceBaseRequest,
 )
 
 
 class WooCommerceListAllCategoriesRequest(WooCommerceBaseRequest):
-    def run(self, ids: Optional[List[str]]) -> dict:
+    def run(self, ids: Optional[List[str]] = None) -> dict:
 
-        params = {"per_page": 100}
-        if ids is not None:
-            params = params | {"include": ids}
+        params = self._params(ids)
 
-        print(f"ATTEMPT: Getting WooCommerce Categories with params: {params}")
+        log.attempt("Getting WooCommerce Categories with params: %s", params)
         response = self.client.get("products/categories", params=params)
 
         if response.ok:
-            print(f"SUCCESS: Received WooCommerce Categories", response.json())
-            return cast(dict, response.json())
+            categories = response.json()
+            log.success("Received WooCommerce Categories: %s", categories)
+            return cast(dict, categories)
         else:
             raise Exception(response.text)
+
+    async def run_async(self, ids: Optional[List[str]] = None) -> List[dict]:
+        """
+        Gets every page of WooCommerce categories, requesting the pages concurrently.
+
+        Args:
+            ids: Optional WooCommerce IDs to restrict the list to.
+
+        Returns:
+            The categories of every page, in page order.
+        """
+        params = self._params(ids)
+
+        log.attempt("Getting all pages of WooCommerce Categories with params: %s", params)
+        categories = []
+        for response in await self._list_pages_async("products/categories", params):
+            if not response.ok:
+                raise Exception(response.text)
+            categories.extend(response.json())
+
+        log.success("Received %d WooCommerce Categories", len(categories))
+        return categories
+
+    @staticmethod
+    def _params(ids: Optional[List[str]]) -> dict:
+        params = {"per_page": 100}
+        if ids is not None:
+            params = params | {"include": ids}
+        return params
@@ -1,22 +1,51 @@
 from typing import List, Optional, cast
 
+from recor_layer.log import log
 from recor_layer.requests.woocommerce.woocommerce_base_request import (
     WooCommerceBaseRequest,
 )
 
 
 class WooCommerceListAllProductsRequest(WooCommerceBaseRequest):
-    def run(self, ids: Optional[List[str]]) -> dict:
+    def run(self, ids: Optional[List[str]] = None) -> dict:
 
-        params = {"per_page": 100}
-        if ids is not None:
-            params = params | {"include": ids}
+        params = self._params(ids)
 
-        print(f"ATTEMPT: Getting WooCommerce Products with params: {params}")
+        log.attempt("Getting WooCommerce Products with params: %s", params)
         response = self.client.get("products", params=params)
 
         if response.ok:
-            print(f"SUCCESS: Received WooCommerce Products", response.json())
-            return cast(dict, response.json())
+            products = response.json()
+            log.success("Received WooCommerce Products: %s", products)
+            return cast(dict, products)
         else:
             raise Exception(response.text)
+
+    async def run_async(self, ids: Optional[List[str]] = None) -> List[dict]:
+        """
+        Gets every page of WooCommerce products, requesting the pages concurrently.
+
+        Args:
+            ids: Optional WooCommerce IDs to restrict the list to.
+
+        Returns:
+            The products of every page, in page order.
+        """
+        params = self._params(ids)
+
+        log.attempt("Getting all pages of WooCommerce Products with params: %s", params)
+        products = []
+        for response in await self._list_pages_async("products", params):
+            if not response.ok:
+                raise Exception(response.text)
+            products.extend(response.json())
+
+        log.success("Received %d WooCommerce Products", len(products))
+        return products
+
+    @staticmethod
+    def _params(ids: Optional[List[str]]) -> dict:
+        params = {"per_page": 100}
+        if ids is not None:
+            params = params | {"include": ids}
+        return params
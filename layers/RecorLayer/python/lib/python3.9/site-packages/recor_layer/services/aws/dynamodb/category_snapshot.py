@@ -0,0 +1,244 @@
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+from recor_layer.log import log
+from recor_layer.services.aws.dynamodb.dynamodb_service import DynamoDBService
+
+"""
+A snapshot of iml-category-id-table on local disk, so category IDs resolve in
+memory. Snapshots are tagged with a version counter kept in iml-counter, which
+writers of the table bump, and are only rebuilt when the version changes.
+
+File layout, little endian:
+    header   magic b"RCS1", version (uint64), count (uint32)
+    offsets  count + 1 uint32 offsets of the keys in the key blob
+    values   count int64 WooCommerce category IDs
+    keys     the IML category IDs in utf-8, sorted
+"""
+
+SNAPSHOT_MAGIC = b"RCS1"
+HEADER = struct.Struct("<4sQI")
+DEFAULT_SNAPSHOT_DIRECTORY = "/tmp/recor"
+COUNTER_TABLE_NAME = "iml-counter"
+SNAPSHOT_VERSION_COUNTER = "category_snapshot_version"
+CATEGORY_TABLE_NAME = "iml-category-id-table"
+
+
+def write_snapshot(path: str, version: int, category_id_map: Dict[str, int]) -> None:
+    """
+    Writes a category snapshot file atomically.
+
+    Args:
+        path: The path of the snapshot file.
+        version: The version the snapshot was exported at.
+        category_id_map: The WooCommerce category IDs by IML category ID.
+    """
+    entries = sorted(
+        (str(category_id).encode("utf-8"), int(woocommerce_category_id))
+        for category_id, woocommerce_category_id in category_id_map.items()
+        if woocommerce_category_id is not None
+    )
+    offsets = [0]
+    for key, _ in entries:
+        offsets.append(offsets[-1] + len(key))
+
+    count = len(entries)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as fp:
+        fp.write(HEADER.pack(SNAPSHOT_MAGIC, version, count))
+        fp.write(struct.pack(f"<{count + 1}I", *offsets))
+        fp.write(struct.pack(f"<{count}q", *(value for _, value in entries)))
+        fp.write(b"".join(key for key, _ in entries))
+    os.replace(tmp_path, path)
+
+
+class CategorySnapshot:
+    """
+    A read-only, memory mapped category snapshot, searched with binary search.
+    """
+
+    def __init__(self, path: str):
+        """
+        Opens a category snapshot file.
+
+        Args:
+            path: The path of the snapshot file.
+
+        Raises:
+            ValueError: If the file is not a category snapshot.
+        """
+        self.path = path
+        with open(path, "rb") as fp:
+            self._mmap = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.version, self.count = HEADER.unpack_from(self._mmap)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not a category snapshot")
+        self._offsets = HEADER.size
+        self._values = self._offsets + 4 * (self.count + 1)
+        self._keys = self._values + 8 * self.count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _key(self, index: int) -> bytes:
+        start, end = struct.unpack_from("<2I", self._mmap, self._offsets + 4 * index)
+        return self._mmap[self._keys + start : self._keys + end]
+
+    def get(self, category_id: str) -> Optional[int]:
+        """
+        Looks up the WooCommerce category ID of an IML category ID.
+
+        Returns:
+            The WooCommerce category ID, or None if the snapshot has no mapping.
+        """
+        key = str(category_id).encode("utf-8")
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count and self._key(low) == key:
+            return struct.unpack_from("<q", self._mmap, self._values + 8 * low)[0]
+        return None
+
+    def get_many(self, category_ids: Iterable[str]) -> Dict[str, int]:
+        """
+        Looks up the WooCommerce category IDs of IML category IDs.
+
+        Returns:
+            The WooCommerce category IDs of the mapped IML category IDs.
+        """
+        category_id_map = {}
+        for category_id in category_ids:
+            woocommerce_category_id = self.get(category_id)
+            if woocommerce_category_id is not None:
+                category_id_map[category_id] = woocommerce_category_id
+        return category_id_map
+
+    def close(self) -> None:
+        self._mmap.close()
+
+
+# Open snapshots by directory, and when their version was last checked, kept
+# across warm invocations
+_snapshots: Dict[str, CategorySnapshot] = {}
+_version_checked_at: Dict[str, float] = {}
+_snapshots_lock = threading.Lock()
+
+
+class CategorySnapshotStore:
+    """
+    Keeps the local category snapshot in line with its version in iml-counter.
+    """
+
+    def __init__(
+        self,
+        dynamodb_service: DynamoDBService,
+        directory: Optional[str] = None,
+        version_ttl_seconds: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initializes the CategorySnapshotStore.
+
+        Args:
+            dynamodb_service: The service to read the table and the version with.
+            directory: The directory of the snapshot files. Defaults to the
+                       CATEGORY_SNAPSHOT_DIRECTORY environment variable or /tmp/recor.
+            version_ttl_seconds: How long a loaded snapshot is used before its
+                                 version is read again. Defaults to every load.
+            clock: The clock version checks are timed with.
+        """
+        self.dynamodb_service = dynamodb_service
+        self.directory = directory or os.getenv(
+            "CATEGORY_SNAPSHOT_DIRECTORY", DEFAULT_SNAPSHOT_DIRECTORY
+        )
+        self.version_ttl_seconds = version_ttl_seconds
+        self.clock = clock
+
+    def current_version(self) -> int:
+        """
+        Returns:
+            The version of iml-category-id-table, 0 if it was never bumped.
+        """
+        item = self.dynamodb_service.get_item(
+            COUNTER_TABLE_NAME, {"counter_name": SNAPSHOT_VERSION_COUNTER}
+        )
+        return int(item.get("counter", 0)) if item else 0
+
+    def bump_version(self) -> int:
+        """
+        Marks the snapshots of iml-category-id-table as stale, after writing to it.
+
+        Returns:
+            The new version.
+        """
+        return self.dynamodb_service.increment_counter(
+            COUNTER_TABLE_NAME, SNAPSHOT_VERSION_COUNTER
+        )
+
+    def _path(self, version: int) -> str:
+        return os.path.join(self.directory, f"category-snapshot-{version}.bin")
+
+    def _export(self, version: int) -> str:
+        """Exports iml-category-id-table to the snapshot file of a version."""
+        log.attempt("Exporting %s snapshot version %d", CATEGORY_TABLE_NAME, version)
+        items = self.dynamodb_service.scan_items(
+            CATEGORY_TABLE_NAME, attributes=("category_id", "woocommerce_category_id")
+        )
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(version)
+        write_snapshot(
+            path,
+            version,
+            {item["category_id"]: item.get("woocommerce_category_id") for item in items},
+        )
+        for file_name in os.listdir(self.directory):
+            stale_path = os.path.join(self.directory, file_name)
+            if file_name.startswith("category-snapshot-") and stale_path != path:
+                os.remove(stale_path)
+        log.success("Exported %d categories to %s", len(items), path)
+        return path
+
+    def load(self) -> CategorySnapshot:
+        """
+        Returns the snapshot of the current version, exporting it if needed.
+
+        The version is read from iml-counter at most once per
+        version_ttl_seconds; in between, the loaded snapshot is returned as is.
+
+        Returns:
+            The category snapshot.
+        """
+        now = self.clock()
+        with _snapshots_lock:
+            snapshot = _snapshots.get(self.directory)
+            checked_at = _version_checked_at.get(self.directory)
+            if (
+                snapshot is not None
+                and checked_at is not None
+                and now - checked_at < self.version_ttl_seconds
+            ):
+                return snapshot
+
+        version = self.current_version()
+        with _snapshots_lock:
+            _version_checked_at[self.directory] = now
+            snapshot = _snapshots.get(self.directory)
+            if snapshot is not None and snapshot.version == version:
+                return snapshot
+
+            path = self._path(version)
+            if not os.path.exists(path):
+                path = self._export(version)
+            if snapshot is not None:
+                snapshot.close()
+            snapshot = CategorySnapshot(path)
+            _snapshots[self.directory] = snapshot
+            return snapshot
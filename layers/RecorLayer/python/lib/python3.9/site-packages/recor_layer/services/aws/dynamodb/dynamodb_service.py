@@ -1,72 +1,249 @@
-from typing import Dict, List, Optional
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
 import boto3
 from botocore.exceptions import ClientError
 
+from recor_layer.log import log
+
+# DynamoDB limits per BatchGetItem and BatchWriteItem request
+MAX_BATCH_GET_KEYS = 100
+MAX_BATCH_WRITE_ITEMS = 25
+MAX_BATCH_ATTEMPTS = 8
+RETRY_BASE_DELAY_SECONDS = 0.05
+DEFAULT_MAX_CONCURRENCY = 4
+
 
 class DynamoDBService:
     """Encapsulates interactions with DynamoDB."""
 
-    def __init__(self, region_name: str = "us-east-1"):
+    def __init__(
+        self,
+        region_name: str = "us-east-1",
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ):
         """
         Initializes the DynamoDBService.
 
         Args:
             region_name: The AWS region name. Defaults to 'us-east-1'.
+            max_concurrency: The maximum number of batch requests sent in parallel.
         """
+        self.region_name = region_name
+        self.max_concurrency = max_concurrency
         self.dynamodb = boto3.resource("dynamodb", region_name=region_name)
+        # The resource's client is safe to share across threads and, unlike a plain
+        # client, translates between python values and DynamoDB attribute values
+        self.client = self.dynamodb.meta.client
         self.item_id_table = self.dynamodb.Table("iml-item-id-table")
         self.category_id_table = self.dynamodb.Table("iml-category-id-table")
+        # Aggregate counters of the batch calls, e.g. get_keys, get_requests, get_retries
+        self.batch_counters: Counter = Counter()
+        self._batch_counters_lock = threading.Lock()
+
+    def _count(self, **counts: int) -> None:
+        with self._batch_counters_lock:
+            self.batch_counters.update(counts)
+
+    def _run_chunks(
+        self, run_chunk: Callable[[List], List], values: List, chunk_size: int
+    ) -> List:
+        """
+        Runs a batch call per chunk of values, in parallel up to max_concurrency.
+
+        Returns:
+            The concatenated results of the chunks, in chunk order.
+        """
+        chunks = [values[i : i + chunk_size] for i in range(0, len(values), chunk_size)]
+        if len(chunks) <= 1 or self.max_concurrency <= 1:
+            return [result for chunk in chunks for result in run_chunk(chunk)]
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_concurrency, len(chunks))
+        ) as executor:
+            return [
+                result
+                for chunk_results in executor.map(run_chunk, chunks)
+                for result in chunk_results
+            ]
+
+    @staticmethod
+    def _backoff(attempt: int) -> None:
+        # Exponential backoff with full jitter
+        time.sleep(random.uniform(0, RETRY_BASE_DELAY_SECONDS * 2**attempt))
+
+    def _get_chunk(self, table_name: str, request: Dict, keys: List[Dict]) -> List[Dict]:
+        """Reads one chunk of keys, retrying the unprocessed keys."""
+        request_items = {table_name: {**request, "Keys": keys}}
+        items = []
+        for attempt in range(MAX_BATCH_ATTEMPTS):
+            if attempt:
+                self._count(get_retries=1)
+                self._backoff(attempt)
+            response = self.client.batch_get_item(RequestItems=request_items)
+            self._count(get_requests=1)
+            items.extend(response.get("Responses", {}).get(table_name, []))
+            request_items = response.get("UnprocessedKeys") or {}
+            if not request_items:
+                return items
+        raise RuntimeError(
+            f"{len(request_items[table_name]['Keys'])} keys of DynamoDB table "
+            f"'{table_name}' were still unprocessed after {MAX_BATCH_ATTEMPTS} attempts"
+        )
 
-    def get_batch_items(self, table_name: str, keys: List[Dict]) -> List[Dict]:
+    def get_batch_items(
+        self,
+        table_name: str,
+        keys: List[Dict],
+        attributes: Optional[Sequence[str]] = None,
+    ) -> List[Dict]:
         """
         Retrieves multiple items from a DynamoDB table in a batch.
 
+        The keys are deduplicated and read in chunks of 100 keys, in parallel.
+        Unprocessed keys are retried with exponential backoff.
+
         Args:
             table_name: The name of the DynamoDB table.
             keys: A list of dictionaries, where each dictionary represents the key
                   of an item to retrieve.  For example: `[{"id": "1"}, {"id": "2"}]`
+            attributes: The attributes to retrieve. Defaults to all attributes.
 
         Returns:
             A list of dictionaries, where each dictionary represents a retrieved item.
         Raises:
             ClientError: If an error occurs during the DynamoDB operation.
+            RuntimeError: If keys are still unprocessed after all retries.
         """
+        # BatchGetItem rejects requests that ask for the same key twice
+        unique_keys = list({tuple(sorted(key.items())): key for key in keys}.values())
+        request: Dict = {}
+        if attributes:
+            # Placeholders keep reserved words such as "counter" valid
+            names = {f"#a{i}": attribute for i, attribute in enumerate(attributes)}
+            request["ProjectionExpression"] = ", ".join(names)
+            request["ExpressionAttributeNames"] = names
+
         try:
-            response = self.dynamodb.batch_get_item(
-                RequestItems={table_name: {"Keys": keys}}
+            items = self._run_chunks(
+                lambda chunk: self._get_chunk(table_name, request, chunk),
+                unique_keys,
+                MAX_BATCH_GET_KEYS,
             )
-            return response.get("Responses", {}).get(table_name, [])
         except ClientError as e:
-            print(
-                f"Error retrieving batch items from DynamoDB table '{table_name}': {e}"
+            log.error(
+                "Error retrieving batch items from DynamoDB table '%s': %s", table_name, e
             )
             raise  # Re-raise the ClientError
 
-    def put_batch_items(self, table_name: str, items: List[Dict]) -> None:
+        self._count(get_keys=len(unique_keys), get_items=len(items))
+        return items
+
+    def _write_chunk(self, table_name: str, requests: List[Dict]) -> List[Dict]:
+        """Writes one chunk of requests, retrying the unprocessed items."""
+        request_items = {table_name: requests}
+        for attempt in range(MAX_BATCH_ATTEMPTS):
+            if attempt:
+                self._count(write_retries=1)
+                self._backoff(attempt)
+            response = self.client.batch_write_item(RequestItems=request_items)
+            self._count(write_requests=1)
+            request_items = response.get("UnprocessedItems") or {}
+            if not request_items:
+                return requests
+        raise RuntimeError(
+            f"{len(request_items[table_name])} items of DynamoDB table "
+            f"'{table_name}' were still unprocessed after {MAX_BATCH_ATTEMPTS} attempts"
+        )
+
+    def _write_batch(self, table_name: str, requests: List[Dict]) -> int:
+        """
+        Sends write requests in chunks of 25 items, in parallel.
+
+        Returns:
+            The number of items written.
+        """
+        written = len(
+            self._run_chunks(
+                lambda chunk: self._write_chunk(table_name, chunk),
+                requests,
+                MAX_BATCH_WRITE_ITEMS,
+            )
+        )
+        self._count(write_items=written)
+        return written
+
+    @staticmethod
+    def _unique(values: List[Dict], key: Callable[[Dict], Tuple]) -> List[Dict]:
+        # BatchWriteItem rejects requests that touch the same key twice; last one wins
+        return list({key(value): value for value in values}.values())
+
+    def put_batch_items(
+        self, table_name: str, items: List[Dict], key_names: Sequence[str] = ()
+    ) -> None:
         """
         Writes multiple items to a DynamoDB table in a batch.
 
+        The items are written in chunks of 25 items, in parallel. Unprocessed
+        items are retried with exponential backoff.
+
         Args:
             table_name: The name of the DynamoDB table.
             items: A list of dictionaries, where each dictionary represents an item
                    to write to the table.
+            key_names: The key attributes of the table. When given, only the last of
+                       the items with the same key is written.
         Raises:
             ClientError: If an error occurs during the DynamoDB operation.
+            RuntimeError: If items are still unprocessed after all retries.
         """
-        table = self.dynamodb.Table(table_name)
-        with table.batch_writer() as writer:
-            for item in items:
-                try:
-                    writer.put_item(Item=item)
-                    print(
-                        f"SUCCESS: Wrote item to DynamoDB table '{table_name}': {item}"
-                    )
-                except ClientError as e:
-                    print(
-                        f"Error writing item to DynamoDB table '{table_name}': {e}. Item: {item}"
-                    )
-                    raise  # Re-raise the ClientError
+        if key_names:
+            items = self._unique(
+                items, lambda item: tuple(item[name] for name in key_names)
+            )
+        requests = [{"PutRequest": {"Item": item}} for item in items]
+        try:
+            written = self._write_batch(table_name, requests)
+        except ClientError as e:
+            log.error("Error writing items to DynamoDB table '%s': %s", table_name, e)
+            raise  # Re-raise the ClientError
+        log.success("Wrote %d items to DynamoDB table '%s'", written, table_name)
+
+    def delete_batch_items(self, table_name: str, keys: List[Dict]) -> None:
+        """
+        Deletes multiple items from a DynamoDB table in a batch.
+
+        The keys are deleted in chunks of 25 keys, in parallel. Unprocessed keys
+        are retried with exponential backoff.
+
+        Args:
+            table_name: The name of the DynamoDB table.
+            keys: A list of dictionaries, where each dictionary represents the key
+                  of an item to delete.  For example: `[{"id": "1"}, {"id": "2"}]`
+        Raises:
+            ClientError: If an error occurs during the DynamoDB operation.
+            RuntimeError: If keys are still unprocessed after all retries.
+        """
+        keys = self._unique(keys, lambda key: tuple(sorted(key.items())))
+        requests = [{"DeleteRequest": {"Key": key}} for key in keys]
+        try:
+            deleted = self._write_batch(table_name, requests)
+        except ClientError as e:
+            log.error("Error deleting items from DynamoDB table '%s': %s", table_name, e)
+            raise  # Re-raise the ClientError
+        log.success("Deleted %d items from DynamoDB table '%s'", deleted, table_name)
+
+    def batch_summary(self) -> str:
+        """
+        Returns:
+            A summary of the batch calls made by this service.
+        """
+        return ", ".join(
+            f"{name}={count}" for name, count in sorted(self.batch_counters.items())
+        )
 
     def get_item(self, table_name: str, key: Dict) -> Optional[Dict]:
         """
@@ -87,7 +264,7 @@ class DynamoDBService:
             response = table.get_item(Key=key)
             return response.get("Item")  # Returns None if Item doesn't exist
         except ClientError as e:
-            print(f"Error retrieving item from DynamoDB table '{table_name}': {e}")
+            log.error("Error retrieving item from DynamoDB table '%s': %s", table_name, e)
             raise  # Re-raise the ClientError
 
     def put_item(self, table_name: str, item: Dict) -> None:
@@ -103,10 +280,75 @@ class DynamoDBService:
         table = self.dynamodb.Table(table_name)
         try:
             table.put_item(Item=item)
-            print(f"SUCCESS: Wrote item to DynamoDB table '{table_name}': {item}")
+            log.success("Wrote item to DynamoDB table '%s': %s", table_name, item)
+        except ClientError as e:
+            log.error("Error writing item to DynamoDB table '%s': %s", table_name, e)
+            raise  # Re-raise the ClientError
+
+    def scan_items(
+        self, table_name: str, attributes: Optional[Sequence[str]] = None
+    ) -> List[Dict]:
+        """
+        Reads all items of a DynamoDB table.
+
+        Args:
+            table_name: The name of the DynamoDB table.
+            attributes: The attributes to retrieve. Defaults to all attributes.
+
+        Returns:
+            A list of dictionaries, where each dictionary represents an item.
+        Raises:
+            ClientError: If an error occurs during the DynamoDB operation.
+        """
+        table = self.dynamodb.Table(table_name)
+        scan_params: Dict = {}
+        if attributes:
+            names = {f"#a{i}": attribute for i, attribute in enumerate(attributes)}
+            scan_params["ProjectionExpression"] = ", ".join(names)
+            scan_params["ExpressionAttributeNames"] = names
+
+        items = []
+        try:
+            while True:
+                response = table.scan(**scan_params)
+                items.extend(response.get("Items", []))
+                if "LastEvaluatedKey" not in response:
+                    return items
+                scan_params["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        except ClientError as e:
+            log.error("Error scanning DynamoDB table '%s': %s", table_name, e)
+            raise  # Re-raise the ClientError
+
+    def increment_counter(self, table_name: str, counter_name: str) -> int:
+        """
+        Atomically increments a counter item, creating it at 1 if missing.
+
+        Args:
+            table_name: The name of the DynamoDB counter table.
+            counter_name: The counter_name key of the counter item.
+
+        Returns:
+            The new value of the counter.
+        Raises:
+            ClientError: If an error occurs during the DynamoDB operation.
+        """
+        table = self.dynamodb.Table(table_name)
+        try:
+            response = table.update_item(
+                Key={"counter_name": counter_name},
+                UpdateExpression="ADD #counter :one",
+                ExpressionAttributeNames={"#counter": "counter"},
+                ExpressionAttributeValues={":one": 1},
+                ReturnValues="UPDATED_NEW",
+            )
         except ClientError as e:
-            print(f"Error writing item to DynamoDB table '{table_name}': {e}")
+            log.error(
+                "Error incrementing counter '%s' in '%s': %s", counter_name, table_name, e
+            )
             raise  # Re-raise the ClientError
+        counter = int(response["Attributes"]["counter"])
+        log.success("Incremented %s=%d in %s", counter_name, counter, table_name)
+        return counter
 
     def get_all_dynamodb_items(self, table_name: str):
         """
@@ -142,11 +384,11 @@ class DynamoDBService:
                 if "LastEvaluatedKey" not in response:
                     break
         except ClientError as e:
-            print(f"Error fetching items from DynamoDB: {e}")
+            log.error("Error fetching items from DynamoDB: %s", e)
             # Optionally, you can log the full error or re-raise it
             # raise e
         except Exception as e:
-            print(f"An unexpected error occurred: {e}")
+            log.error("An unexpected error occurred: %s", e)
 
         return items
 
@@ -167,8 +409,10 @@ class DynamoDBService:
         """
         table = self.dynamodb.Table(table_name)
 
-        print(
-            f"Attempting to delete all items from table: '{table_name}' in region '{self.region_name}'..."
+        log.attempt(
+            "Deleting all items from table: '%s' in region '%s'...",
+            table_name,
+            self.region_name,
         )
 
         try:
@@ -185,8 +429,9 @@ class DynamoDBService:
                     sort_key_name = key_attribute["AttributeName"]
 
             if not partition_key_name:
-                print(
-                    f"Error: Could not determine partition key for table '{table_name}'. Aborting."
+                log.error(
+                    "Could not determine partition key for table '%s'. Aborting.",
+                    table_name,
                 )
                 return False
 
@@ -199,7 +444,7 @@ class DynamoDBService:
             items_to_delete_keys = []
             response = None
 
-            print("Scanning table to collect primary keys for deletion...")
+            log.attempt("Scanning table to collect primary keys for deletion...")
             while True:
                 scan_params = {"ProjectionExpression": projection_expression}
                 if response and "LastEvaluatedKey" in response:
@@ -217,11 +462,13 @@ class DynamoDBService:
                     break
 
             if not items_to_delete_keys:
-                print(f"No items found in table '{table_name}' to delete.")
+                log.success("No items found in table '%s' to delete.", table_name)
                 return True
 
-            print(f"Found {len(items_to_delete_keys)} items to delete.")
-            print("Starting batch deletion process...")
+            log.attempt(
+                "Found %d items to delete, starting batch deletion process...",
+                len(items_to_delete_keys),
+            )
 
             # Use batch_writer for efficient deletion
             # batch_writer handles sending items in batches of up to 25
@@ -230,21 +477,27 @@ class DynamoDBService:
                 for key in items_to_delete_keys:
                     batch.delete_item(Key=key)
 
-            print(
-                f"Successfully initiated deletion for {len(items_to_delete_keys)} items."
-            )
-            print(
-                "Note: DynamoDB batch operations are eventually consistent. Deletion may take a moment to propagate."
+            log.success(
+                "Initiated deletion for %d items. DynamoDB batch operations are "
+                "eventually consistent. Deletion may take a moment to propagate.",
+                len(items_to_delete_keys),
             )
             return True
 
         except ClientError as e:
             error_code = e.response.get("Error", {}).get("Code")
             error_message = e.response.get("Error", {}).get("Message")
-            print(f"DynamoDB Client Error: {error_code} - {error_message}")
-            print(f"Could not delete items from table '{table_name}'.")
+            log.error(
+                "DynamoDB Client Error: %s - %s. Could not delete items from table '%s'.",
+                error_code,
+                error_message,
+                table_name,
+            )
             return False
         except Exception as e:
-            print(f"An unexpected error occurred: {e}")
-            print(f"Could not delete items from table '{table_name}'.")
+            log.error(
+                "An unexpected error occurred: %s. Could not delete items from table '%s'.",
+                e,
+                table_name,
+            )
             return False
@@ -0,0 +1,87 @@
+import boto3
+from botocore.exceptions import ClientError
+
+from recor_layer.log import log
+
+
+class S3Service:
+    """Handles interactions with Amazon S3."""
+
+    def __init__(self, bucket_name: str):
+        """
+        Initializes the S3Service.
+
+        Args:
+            bucket_name: The name of the S3 bucket.
+        Raises:
+            ValueError: If the bucket name is not provided.
+        """
+        if not bucket_name:
+            raise ValueError("S3 Bucket name must be provided.")
+        self.s3_client = boto3.client("s3")
+        self.bucket_name = bucket_name
+
+    def put_object(self, key: str, body: bytes) -> None:
+        """
+        Writes an object to the S3 bucket.
+
+        Args:
+            key: The key of the object.
+            body: The content of the object.
+        Raises:
+            ClientError: If an error occurs during the S3 operation.
+        """
+        try:
+            self.s3_client.put_object(Bucket=self.bucket_name, Key=key, Body=body)
+        except ClientError as e:
+            log.error(
+                "Error writing object %s to S3 bucket '%s': %s",
+                key,
+                self.bucket_name,
+                e,
+            )
+            raise  # Re-raise the ClientError
+
+    def get_object(self, key: str) -> bytes:
+        """
+        Reads an object from the S3 bucket.
+
+        Args:
+            key: The key of the object.
+
+        Returns:
+            The content of the object.
+        Raises:
+            ClientError: If an error occurs during the S3 operation.
+        """
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=key)
+            return response["Body"].read()
+        except ClientError as e:
+            log.error(
+                "Error reading object %s from S3 bucket '%s': %s",
+                key,
+                self.bucket_name,
+                e,
+            )
+            raise  # Re-raise the ClientError
+
+    def delete_object(self, key: str) -> None:
+        """
+        Deletes an object from the S3 bucket.
+
+        Args:
+            key: The key of the object.
+        Raises:
+            ClientError: If an error occurs during the S3 operation.
+        """
+        try:
+            self.s3_client.delete_object(Bucket=self.bucket_name, Key=key)
+        except ClientError as e:
+            log.error(
+                "Error deleting object %s from S3 bucket '%s': %s",
+                key,
+                self.bucket_name,
+                e,
+            )
+            raise  # Re-raise the ClientError
@@ -0,0 +1,238 @@
+import json
+import os
+import uuid
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+from recor_layer.services.aws.s3.s3_service import S3Service
+from recor_layer.services.aws.sqs.message_codec import CODEC_ATTRIBUTE
+
+"""
+Claim-check messages carry a pointer to a payload that is too large for SQS.
+The payload is written to object storage and the message body only holds its
+URL and the codec of the stored payload. Message bodies are untrusted, so
+pointers are only resolved against the store configured by CLAIM_CHECK_URL.
+"""
+
+CLAIM_CHECK_CODEC = "claim-check/1"
+PAYLOAD_SUFFIX = ".msg"
+
+
+class ClaimCheckStore:
+    """
+    Stores message payloads that are too large to be sent through SQS.
+    """
+
+    def put(self, body: str) -> str:
+        """
+        Stores a payload.
+
+        Args:
+            body: The encoded message body.
+
+        Returns:
+            The URL of the stored payload.
+        """
+        raise NotImplementedError
+
+    def owns(self, url: str) -> bool:
+        """
+        Checks that a URL points to a payload this store could have written.
+
+        Args:
+            url: The URL of a stored payload.
+
+        Returns:
+            Whether the URL is a payload of this store.
+        """
+        raise NotImplementedError
+
+    def get(self, url: str) -> str:
+        """
+        Reads a stored payload.
+
+        Args:
+            url: The URL of the stored payload.
+
+        Returns:
+            The encoded message body.
+        """
+        raise NotImplementedError
+
+    def delete(self, url: str) -> None:
+        """
+        Deletes a stored payload.
+
+        Args:
+            url: The URL of the stored payload.
+        """
+        raise NotImplementedError
+
+
+class S3ClaimCheckStore(ClaimCheckStore):
+    """Stores payloads as objects in an S3 bucket."""
+
+    def __init__(self, bucket_name: str, prefix: str = ""):
+        self.s3_service = S3Service(bucket_name)
+        self.prefix = prefix
+
+    def put(self, body: str) -> str:
+        key = f"{self.prefix}{uuid.uuid4().hex}{PAYLOAD_SUFFIX}"
+        self.s3_service.put_object(key, body.encode("utf-8"))
+        return f"s3://{self.s3_service.bucket_name}/{key}"
+
+    def owns(self, url: str) -> bool:
+        parsed_url = urlparse(url)
+        key = parsed_url.path.lstrip("/")
+        name = key[len(self.prefix) :]
+        return (
+            parsed_url.scheme == "s3"
+            and parsed_url.netloc == self.s3_service.bucket_name
+            and not parsed_url.query
+            and key.startswith(self.prefix)
+            and _is_payload_name(name)
+        )
+
+    def get(self, url: str) -> str:
+        return self.s3_service.get_object(urlparse(url).path.lstrip("/")).decode(
+            "utf-8"
+        )
+
+    def delete(self, url: str) -> None:
+        self.s3_service.delete_object(urlparse(url).path.lstrip("/"))
+
+
+class FileClaimCheckStore(ClaimCheckStore):
+    """Stores payloads as files in a local directory, for local runs and tests."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def put(self, body: str) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{uuid.uuid4().hex}{PAYLOAD_SUFFIX}")
+        with open(path, "w", encoding="utf-8") as fp:
+            fp.write(body)
+        return f"file://{path}"
+
+    def owns(self, url: str) -> bool:
+        parsed_url = urlparse(url)
+        if parsed_url.scheme != "file" or parsed_url.netloc not in ("", "localhost"):
+            return False
+        # Resolves .. and symlinks, so the payload must really be in the directory
+        path = os.path.realpath(parsed_url.path)
+        return os.path.dirname(path) == os.path.realpath(
+            self.directory
+        ) and _is_payload_name(os.path.basename(path))
+
+    def get(self, url: str) -> str:
+        with open(urlparse(url).path, "r", encoding="utf-8") as fp:
+            return fp.read()
+
+    def delete(self, url: str) -> None:
+        try:
+            os.remove(urlparse(url).path)
+        except FileNotFoundError:
+            pass
+
+
+@lru_cache(maxsize=None)
+def get_claim_check_store(url: Optional[str]) -> Optional[ClaimCheckStore]:
+    """
+    Builds the claim-check store for a storage URL.
+
+    Args:
+        url: An s3://bucket/prefix or file:///directory URL.
+
+    Returns:
+        The claim-check store, or None if no URL is configured.
+
+    Raises:
+        ValueError: If the URL scheme is not supported.
+    """
+    if not url:
+        return None
+    parsed_url = urlparse(url)
+    if parsed_url.scheme == "s3":
+        return S3ClaimCheckStore(parsed_url.netloc, parsed_url.path.lstrip("/"))
+    if parsed_url.scheme == "file":
+        return FileClaimCheckStore(parsed_url.path)
+    raise ValueError(f"Unsupported claim-check store URL: {url}")
+
+
+def _is_payload_name(name: str) -> bool:
+    return (
+        name.endswith(PAYLOAD_SUFFIX)
+        and len(name) > len(PAYLOAD_SUFFIX)
+        and "/" not in name
+        and not name.startswith(".")
+    )
+
+
+def _payload_url(store: Optional[ClaimCheckStore], pointer: Dict) -> str:
+    """
+    Returns the URL of the payload a pointer refers to, if the store owns it.
+
+    Raises:
+        ValueError: If no store is configured, or the URL is not one of its payloads.
+    """
+    if store is None:
+        raise ValueError("Claim-check message received without CLAIM_CHECK_URL set")
+    url = pointer.get("url") if isinstance(pointer, dict) else None
+    if not isinstance(url, str) or not store.owns(url):
+        raise ValueError(f"Claim-check URL {url!r} is not in the configured store")
+    return url
+
+
+def check_in(store: ClaimCheckStore, body: str, codec_name: str) -> Tuple[str, Dict]:
+    """
+    Stores a payload and builds the message that points to it.
+
+    Args:
+        store: The claim-check store to write the payload to.
+        body: The encoded message body.
+        codec_name: The codec the body was encoded with.
+
+    Returns:
+        The pointer message body and its SQS message attributes.
+    """
+    pointer = {"url": store.put(body), "codec": codec_name}
+    attributes = {
+        CODEC_ATTRIBUTE: {"DataType": "String", "StringValue": CLAIM_CHECK_CODEC}
+    }
+    return json.dumps(pointer), attributes
+
+
+def check_out(store: Optional[ClaimCheckStore], pointer_body: str) -> Tuple[str, str]:
+    """
+    Reads the payload a pointer message refers to.
+
+    Args:
+        store: The configured claim-check store.
+        pointer_body: The body of a claim-check message.
+
+    Returns:
+        The encoded message body and the codec it was encoded with.
+
+    Raises:
+        ValueError: If the pointer is not a payload of the store.
+    """
+    pointer = json.loads(pointer_body)
+    url = _payload_url(store, pointer)
+    return store.get(url), pointer["codec"]
+
+
+def release(store: Optional[ClaimCheckStore], pointer_body: str) -> None:
+    """
+    Deletes the payload a pointer message refers to.
+
+    Args:
+        store: The configured claim-check store.
+        pointer_body: The body of a claim-check message.
+
+    Raises:
+        ValueError: If the pointer is not a payload of the store.
+    """
+    url = _payload_url(store, json.loads(pointer_body))
+    store.delete(url)
@@ -0,0 +1,157 @@
+import base64
+import gzip
+import json
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional, the JSON codecs are always available
+    msgpack = None
+
+# Message attribute naming the codec of the message body. Messages without it
+# were published before codecs existed and are plain JSON.
+CODEC_ATTRIBUTE = "codec"
+
+
+class MessageCodec:
+    """
+    Encodes lists of items into SQS message bodies and decodes them back.
+    """
+
+    name = ""
+    # Raw JSON bytes expected per encoded byte, used to size messages before encoding
+    packing_ratio = 1.0
+
+    def encode(self, json_body: str, items: List[dict]) -> str:
+        """
+        Encodes a message body.
+
+        Args:
+            json_body: The items serialized as a JSON array.
+            items: The items in the message body.
+
+        Returns:
+            The encoded message body.
+        """
+        raise NotImplementedError
+
+    def decode(self, body: str) -> List[dict]:
+        """
+        Decodes a message body.
+
+        Args:
+            body: The encoded message body.
+
+        Returns:
+            The items in the message body.
+        """
+        raise NotImplementedError
+
+    def message_attributes(self) -> Dict:
+        """
+        Returns:
+            The SQS message attributes that identify this codec.
+        """
+        return {CODEC_ATTRIBUTE: {"DataType": "String", "StringValue": self.name}}
+
+
+class JsonCodec(MessageCodec):
+    """Plain JSON array bodies."""
+
+    name = "json/1"
+
+    def encode(self, json_body: str, items: List[dict]) -> str:
+        return json_body
+
+    def decode(self, body: str) -> List[dict]:
+        return json.loads(body)
+
+
+class GzipJsonCodec(MessageCodec):
+    """Gzip compressed JSON array bodies, base64 encoded to stay valid SQS text."""
+
+    name = "gzip-json/1"
+    packing_ratio = 4.0
+
+    def encode(self, json_body: str, items: List[dict]) -> str:
+        compressed = gzip.compress(json_body.encode("utf-8"), compresslevel=6)
+        return base64.b64encode(compressed).decode("ascii")
+
+    def decode(self, body: str) -> List[dict]:
+        return json.loads(gzip.decompress(base64.b64decode(body)))
+
+
+class MsgpackCodec(MessageCodec):
+    """Msgpack array bodies, base64 encoded to stay valid SQS text."""
+
+    name = "msgpack/1"
+
+    def encode(self, json_body: str, items: List[dict]) -> str:
+        return base64.b64encode(msgpack.packb(items)).decode("ascii")
+
+    def decode(self, body: str) -> List[dict]:
+        return msgpack.unpackb(base64.b64decode(body))
+
+
+CODECS = {codec.name: codec for codec in (JsonCodec(), GzipJsonCodec(), MsgpackCodec())}
+
+
+def get_codec(name: Optional[str] = None) -> MessageCodec:
+    """
+    Looks up a message codec by name.
+
+    Args:
+        name: The codec name. Defaults to plain JSON.
+
+    Returns:
+        The message codec.
+
+    Raises:
+        ValueError: If the codec is unknown or its dependency is not installed.
+    """
+    codec = CODECS.get(name or JsonCodec.name)
+    if codec is None:
+        raise ValueError(f"Unknown message codec: {name}")
+    if isinstance(codec, MsgpackCodec) and msgpack is None:
+        raise ValueError(f"Message codec {name} requires msgpack to be installed")
+    return codec
+
+
+def encode_messages(
+    codec: MessageCodec,
+    messages: Iterable[Tuple[str, List[dict]]],
+    max_message_bytes: int,
+) -> Iterator[Tuple[str, List[dict]]]:
+    """
+    Encodes packed JSON messages, splitting any whose encoding is too large.
+
+    Args:
+        codec: The codec to encode the messages with.
+        messages: (json_body, items) tuples, typically from pack_json_messages.
+        max_message_bytes: The maximum size of an encoded message body in bytes.
+
+    Returns:
+        An iterator yielding (encoded_body, items) tuples.
+
+    Raises:
+        ValueError: If a single item does not fit in a message body once encoded.
+    """
+    for json_body, items in messages:
+        body = codec.encode(json_body, items)
+        if len(body.encode("utf-8")) <= max_message_bytes:
+            yield body, items
+        elif len(items) == 1:
+            raise ValueError(
+                f"Item does not fit in a {max_message_bytes} byte {codec.name} message"
+            )
+        else:
+            middle = len(items) // 2
+            yield from encode_messages(
+                codec,
+                [
+                    (json.dumps(items[:middle]), items[:middle]),
+                    (json.dumps(items[middle:]), items[middle:]),
+                ],
+                max_message_bytes,
+            )
+
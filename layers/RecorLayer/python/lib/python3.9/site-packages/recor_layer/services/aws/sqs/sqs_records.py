@@ -0,0 +1,109 @@
+import os
+import traceback
+from typing import Callable, Dict, List, Optional
+
+from recor_layer.log import log
+from recor_layer.services.aws.sqs.claim_check import (
+    CLAIM_CHECK_CODEC,
+    check_out,
+    get_claim_check_store,
+    release,
+)
+from recor_layer.services.aws.sqs.message_codec import CODEC_ATTRIBUTE, get_codec
+
+
+def _codec_name(record: Dict) -> Optional[str]:
+    codec_attribute = record.get("messageAttributes", {}).get(CODEC_ATTRIBUTE, {})
+    return codec_attribute.get("stringValue")
+
+
+def _claim_check_store():
+    return get_claim_check_store(os.getenv("CLAIM_CHECK_URL"))
+
+
+def decode_sqs_record(record: Dict) -> List[dict]:
+    """
+    Decodes the items of an SQS record delivered to a Lambda function.
+
+    Claim-check records are resolved by reading the payload they point to,
+    which must be in the store configured by CLAIM_CHECK_URL.
+
+    Args:
+        record: A record from the Records of an SQS event.
+
+    Returns:
+        The items in the message body.
+
+    Raises:
+        ValueError: If a claim-check record points outside the configured store.
+    """
+    codec_name = _codec_name(record)
+    body = record["body"]
+    if codec_name == CLAIM_CHECK_CODEC:
+        body, codec_name = check_out(_claim_check_store(), body)
+    return get_codec(codec_name).decode(body)
+
+
+def release_sqs_record(record: Dict) -> None:
+    """
+    Deletes the payload of a claim-check record once it has been processed.
+
+    Args:
+        record: A record from the Records of an SQS event.
+    """
+    if _codec_name(record) == CLAIM_CHECK_CODEC:
+        release(_claim_check_store(), record["body"])
+
+
+def _message_group_id(record: Dict) -> Optional[str]:
+    return record.get("attributes", {}).get("MessageGroupId")
+
+
+def process_sqs_records(
+    records: List[Dict], process_items: Callable[[List[dict]], None]
+) -> List[Dict]:
+    """
+    Processes the records of an SQS event and reports the ones that failed.
+
+    Each record is processed on its own, so a failing record never causes the
+    healthy ones to be processed twice. For FIFO queues, the records after a
+    failure in the same message group are reported as failed without being
+    processed, to keep the group in order. Claim-check payloads are released
+    for the successful records only.
+
+    Args:
+        records: The Records of an SQS event.
+        process_items: Processes a list of items, raising an exception on failure.
+
+    Returns:
+        The batchItemFailures of the partial batch response.
+    """
+    failed_message_ids = []
+    failed_message_group_ids = set()
+    processed_records = []
+    for record in records:
+        message_group_id = _message_group_id(record)
+        if message_group_id in failed_message_group_ids:
+            failed_message_ids.append(record["messageId"])
+            continue
+        try:
+            process_items(decode_sqs_record(record))
+            processed_records.append(record)
+        except Exception as e:
+            log.error("Processing SQS message %s: %s", record["messageId"], e)
+            traceback.print_exc()
+            failed_message_ids.append(record["messageId"])
+            if message_group_id is not None:
+                failed_message_group_ids.add(message_group_id)
+
+    for record in processed_records:
+        try:
+            release_sqs_record(record)
+        except Exception as e:
+            log.warning("Releasing SQS message %s: %s", record["messageId"], e)
+
+    if failed_message_ids:
+        log.warning(
+            "%d of %d SQS messages failed", len(failed_message_ids), len(records)
+        )
+    return [{"itemIdentifier": message_id} for message_id in failed_message_ids]
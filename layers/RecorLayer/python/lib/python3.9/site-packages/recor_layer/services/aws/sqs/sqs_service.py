@@ -1,8 +1,161 @@
-from typing import Dict
+import time
+import zlib
+from json import dumps
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 import boto3
 from botocore.exceptions import ClientError
 
+from recor_layer.log import log
+
+# SQS limits for a single message and for a whole SendMessageBatch request
+MAX_MESSAGE_BYTES = 256 * 1024
+MAX_BATCH_ENTRIES = 10
+MAX_BATCH_BYTES = 256 * 1024
+MAX_SEND_ATTEMPTS = 5
+RETRY_BASE_DELAY_SECONDS = 0.2
+
+
+class JsonMessagePacker:
+    """
+    Packs items into JSON array message bodies by their serialized size.
+
+    Each item is serialized once and appended to the current body until the
+    next item would push the body over max_message_bytes.
+    """
+
+    def __init__(
+        self,
+        max_message_bytes: int = MAX_MESSAGE_BYTES,
+        max_message_items: Optional[int] = None,
+    ):
+        """
+        Initializes the JsonMessagePacker.
+
+        Args:
+            max_message_bytes: The maximum size of a message body in bytes.
+            max_message_items: Optional maximum number of items per message body.
+        """
+        self.max_message_bytes = max_message_bytes
+        self.max_message_items = max_message_items
+        self.items: List[dict] = []
+        self._parts: List[str] = []
+        self._body_bytes = 2  # The enclosing "[" and "]"
+
+    def add(self, item: dict) -> Optional[Tuple[str, List[dict]]]:
+        """
+        Adds an item, completing the current message body if the item does not fit.
+
+        Args:
+            item: The item to pack.
+
+        Returns:
+            The completed (message_body, items) tuple, or None if the item fit.
+
+        Raises:
+            ValueError: If a single item does not fit in a message body.
+        """
+        part = dumps(item)
+        part_bytes = len(part.encode("utf-8"))
+        if part_bytes + 2 > self.max_message_bytes:
+            raise ValueError(
+                f"Item of {part_bytes} bytes does not fit in a {self.max_message_bytes} byte message"
+            )
+
+        message = None
+        if self._parts and (
+            self._body_bytes + 1 + part_bytes > self.max_message_bytes
+            or len(self._parts) == self.max_message_items
+        ):
+            message = self.flush()
+
+        if self._parts:
+            self._body_bytes += 1  # The "," separator
+        self._parts.append(part)
+        self.items.append(item)
+        self._body_bytes += part_bytes
+        return message
+
+    def flush(self) -> Optional[Tuple[str, List[dict]]]:
+        """
+        Completes the current message body.
+
+        Returns:
+            The (message_body, items) tuple, or None if no items are packed.
+        """
+        if not self._parts:
+            return None
+        message = "[" + ",".join(self._parts) + "]", self.items
+        self.items = []
+        self._parts = []
+        self._body_bytes = 2
+        return message
+
+
+def pack_json_messages(
+    items: Iterable[dict],
+    max_message_bytes: int = MAX_MESSAGE_BYTES,
+    max_message_items: Optional[int] = None,
+) -> Iterator[Tuple[str, List[dict]]]:
+    """
+    Packs items into JSON array message bodies by their serialized size.
+
+    Args:
+        items: The items to pack.
+        max_message_bytes: The maximum size of a message body in bytes.
+        max_message_items: Optional maximum number of items per message body.
+
+    Returns:
+        An iterator yielding (message_body, items) tuples.
+
+    Raises:
+        ValueError: If a single item does not fit in a message body.
+    """
+    packer = JsonMessagePacker(max_message_bytes, max_message_items)
+    for item in items:
+        message = packer.add(item)
+        if message is not None:
+            yield message
+    message = packer.flush()
+    if message is not None:
+        yield message
+
+
+def message_group_partition(key: str, partitions: int) -> int:
+    """
+    Maps a key to one of a fixed number of partitions.
+
+    A stable hash is used so the same key lands in the same partition, and
+    therefore the same FIFO message group, across processes and runs.
+
+    Args:
+        key: The key to partition, such as an item short_code.
+        partitions: The number of partitions.
+
+    Returns:
+        The partition of the key, from 0 to partitions - 1.
+    """
+    return zlib.crc32(key.encode("utf-8")) % partitions
+
+
+def message_attributes_bytes(message_attributes: Optional[Dict]) -> int:
+    """
+    Measures how much of the SQS message size limit the message attributes use.
+
+    Args:
+        message_attributes: SQS message attributes.
+
+    Returns:
+        The size of the attribute names, types and values in bytes.
+    """
+    size = 0
+    for name, attribute in (message_attributes or {}).items():
+        size += len(name.encode("utf-8"))
+        size += len(attribute.get("DataType", "").encode("utf-8"))
+        size += len(attribute.get("StringValue", "").encode("utf-8"))
+        size += len(attribute.get("BinaryValue", b""))
+    return size
+
 
 class SQSService:
     """Handles interactions with Amazon SQS."""
@@ -20,6 +173,7 @@ class SQSService:
             raise ValueError("SQS Queue URL must be provided.")
         self.sqs_client = boto3.client("sqs")
         self.queue_url = queue_url
+        self.is_fifo = queue_url.endswith(".fifo")
 
     def send_message(self, message_body: str) -> Dict:
         """
@@ -44,3 +198,173 @@ class SQSService:
                 f"Error sending message to SQS queue {self.queue_url}: {e}",
                 e.operation_name,
             ) from e
+
+    def send_message_batch(
+        self,
+        message_bodies: List[str],
+        message_attributes: Optional[Dict] = None,
+        message_group_id: Optional[str] = None,
+    ) -> List[Dict]:
+        """
+        Sends messages to the SQS queue with as few SendMessageBatch calls as possible.
+
+        Args:
+            message_bodies: The bodies of the messages to send (as strings).
+            message_attributes: Optional SQS message attributes added to every message.
+            message_group_id: The FIFO message group of every message. Required
+                              for FIFO queues and ignored otherwise.
+
+        Returns:
+            The successful entries of every SendMessageBatch response.
+
+        Raises:
+            ClientError: If an error occurs when sending the messages.
+            RuntimeError: If entries still fail after MAX_SEND_ATTEMPTS attempts.
+            ValueError: If no message group is given for a FIFO queue.
+        """
+        return self.send_messages(
+            [(message_body, message_attributes) for message_body in message_bodies],
+            message_group_id,
+        )
+
+    def send_messages(
+        self,
+        messages: List[Tuple[str, Optional[Dict]]],
+        message_group_id: Optional[str] = None,
+    ) -> List[Dict]:
+        """
+        Sends messages, each with its own attributes, in order.
+
+        Messages are grouped into SendMessageBatch calls by entry count and total
+        payload size, and the calls are made one after the other. Entries that
+        fail are retried with exponential backoff. On FIFO queues the later
+        entries of a failed entry's group are sent again with it, so the group
+        keeps its order; the queue is expected to use content-based
+        deduplication, which drops the copies that were already accepted.
+
+        Args:
+            messages: (message_body, message_attributes) tuples, in send order.
+            message_group_id: The FIFO message group of every message. Required
+                              for FIFO queues and ignored otherwise.
+
+        Returns:
+            The successful entries of every SendMessageBatch response.
+
+        Raises:
+            ClientError: If an error occurs when sending the messages.
+            RuntimeError: If entries still fail after MAX_SEND_ATTEMPTS attempts.
+            ValueError: If no message group is given for a FIFO queue.
+        """
+        if self.is_fifo and not message_group_id:
+            raise ValueError(f"SQS FIFO queue {self.queue_url} requires a message group")
+        successful = []
+        for entries in self._group_batch_entries(messages, message_group_id):
+            successful.extend(self._send_batch_entries(entries))
+        return successful
+
+    def _group_batch_entries(
+        self,
+        messages: List[Tuple[str, Optional[Dict]]],
+        message_group_id: Optional[str] = None,
+    ) -> Iterator[List[Dict]]:
+        """
+        Groups messages into SendMessageBatch entries within the SQS limits.
+
+        Args:
+            messages: (message_body, message_attributes) tuples to group.
+            message_group_id: The FIFO message group of every message.
+
+        Returns:
+            An iterator yielding lists of SendMessageBatch entries.
+        """
+        entries = []
+        entries_bytes = 0
+        for index, (message_body, message_attributes) in enumerate(messages):
+            message_bytes = len(message_body.encode("utf-8"))
+            message_bytes += message_attributes_bytes(message_attributes)
+            if entries and (
+                len(entries) == MAX_BATCH_ENTRIES
+                or entries_bytes + message_bytes > MAX_BATCH_BYTES
+            ):
+                yield entries
+                entries = []
+                entries_bytes = 0
+            entry = {"Id": str(index), "MessageBody": message_body}
+            if message_attributes:
+                entry["MessageAttributes"] = message_attributes
+            if self.is_fifo:
+                entry["MessageGroupId"] = message_group_id
+            entries.append(entry)
+            entries_bytes += message_bytes
+        if entries:
+            yield entries
+
+    def _entries_to_retry(self, pending: List[Dict], failed_ids: Set[str]) -> List[Dict]:
+        """
+        Selects the entries to send again after some entries of a batch failed.
+
+        Returns:
+            The failed entries. On FIFO queues, also every entry after the first
+            failed one of its message group, in their original order.
+        """
+        if not self.is_fifo:
+            return [entry for entry in pending if entry["Id"] in failed_ids]
+        failed_groups = set()
+        retry = []
+        for entry in pending:
+            if entry["Id"] in failed_ids:
+                failed_groups.add(entry["MessageGroupId"])
+            if entry["MessageGroupId"] in failed_groups:
+                retry.append(entry)
+        return retry
+
+    def _send_batch_entries(self, entries: List[Dict]) -> List[Dict]:
+        """
+        Sends a single group of entries, retrying the entries that failed.
+
+        Args:
+            entries: The SendMessageBatch entries to send.
+
+        Returns:
+            The successful entries of the SendMessageBatch responses, once per entry.
+        """
+        successful = {}
+        pending = entries
+        for attempt in range(MAX_SEND_ATTEMPTS):
+            if attempt:
+                time.sleep(RETRY_BASE_DELAY_SECONDS * 2 ** (attempt - 1))
+            try:
+                response = self.sqs_client.send_message_batch(
+                    QueueUrl=self.queue_url, Entries=pending
+                )
+            except ClientError as e:
+                log.error(
+                    "Error sending message batch to SQS queue %s: %s", self.queue_url, e
+                )
+                raise  # Re-raise the ClientError
+
+            for entry in response.get("Successful", []):
+                successful[entry["Id"]] = entry
+            failed = response.get("Failed", [])
+            if not failed:
+                return list(successful.values())
+
+            sender_faults = [failure for failure in failed if failure.get("SenderFault")]
+            if sender_faults:
+                raise RuntimeError(
+                    f"SQS queue {self.queue_url} rejected messages: {sender_faults}"
+                )
+
+            pending = self._entries_to_retry(
+                pending, {failure["Id"] for failure in failed}
+            )
+            log.warning(
+                "Retrying %d entries, %d failed, to %s",
+                len(pending),
+                len(failed),
+                self.queue_url,
+            )
+
+        raise RuntimeError(
+            f"Unable to send {len(pending)} messages to SQS queue {self.queue_url} after {MAX_SEND_ATTEMPTS} attempts"
+        )
@@ -0,0 +1,181 @@
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+"""
+Caches live at module level so they survive across warm Lambda invocations
+of the same container.
+"""
+
+DEFAULT_MAX_SIZE = 10000
+DEFAULT_TTL_SECONDS = 300.0
+DEFAULT_NEGATIVE_TTL_SECONDS = 60.0
+
+# Marks keys that are known not to exist
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    A thread-safe, size-bounded cache whose entries expire after a TTL.
+
+    The least recently used entries are evicted once the cache is full. Keys
+    that were looked up and not found can be cached too, with their own TTL.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_MAX_SIZE,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        negative_ttl_seconds: float = DEFAULT_NEGATIVE_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initializes the TTLCache.
+
+        Args:
+            max_size: The maximum number of entries, found or missing.
+            ttl_seconds: How long found entries stay valid.
+            negative_ttl_seconds: How long missing entries stay valid.
+            clock: The clock entry ages are measured with.
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.clock = clock
+        self.counters: Counter = Counter()
+        self._entries: "OrderedDict[Hashable, Tuple[float, object]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: Optional[Hashable] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_many(self, keys: Iterable[Hashable]) -> Tuple[Dict, Set]:
+        """
+        Looks up keys in the cache.
+
+        Args:
+            keys: The keys to look up.
+
+        Returns:
+            The values of the found keys, and the keys that are not cached. Keys
+            cached as missing are in neither.
+        """
+        found = {}
+        uncached = set()
+        now = self.clock()
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None or entry[0] <= now:
+                    if entry is not None:
+                        del self._entries[key]
+                        self.counters["expirations"] += 1
+                    uncached.add(key)
+                    self.counters["misses"] += 1
+                    continue
+                self._entries.move_to_end(key)
+                if entry[1] is _MISSING:
+                    self.counters["negative_hits"] += 1
+                else:
+                    found[key] = entry[1]
+                    self.counters["hits"] += 1
+        return found, uncached
+
+    def put_many(self, values: Dict, missing_keys: Iterable[Hashable] = ()) -> None:
+        """
+        Adds entries to the cache, evicting the least recently used ones if full.
+
+        Args:
+            values: The values to cache, by key.
+            missing_keys: Keys to cache as known to be missing.
+        """
+        now = self.clock()
+        with self._lock:
+            for key, value in values.items():
+                self._set(key, now + self.ttl_seconds, value)
+            for key in missing_keys:
+                self._set(key, now + self.negative_ttl_seconds, _MISSING)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.counters["evictions"] += 1
+
+    def _set(self, key: Hashable, expires_at: float, value: object) -> None:
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+
+    def invalidate(self, keys: Optional[Iterable[Hashable]] = None) -> None:
+        """
+        Removes entries from the cache.
+
+        Args:
+            keys: The keys to remove. Defaults to all keys.
+        """
+        with self._lock:
+            if keys is None:
+                self._entries.clear()
+                self.counters["invalidations"] += 1
+                return
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def sync_version(self, version: Hashable) -> None:
+        """
+        Clears the cache when the version of the data it caches changes.
+
+        Args:
+            version: The current version of the cached data.
+        """
+        with self._lock:
+            if version == self._version:
+                return
+            if self._version is not None:
+                self._entries.clear()
+                self.counters["invalidations"] += 1
+            self._version = version
+
+    def get_or_load(
+        self,
+        keys: Iterable[Hashable],
+        load: Callable[[Set], Dict],
+    ) -> Dict:
+        """
+        Looks up keys, loading the uncached ones and caching the result.
+
+        Args:
+            keys: The keys to look up.
+            load: Loads the values of a set of keys. Keys it leaves out are cached
+                  as missing.
+
+        Returns:
+            The values of the keys that exist, by key.
+        """
+        found, uncached = self.get_many(keys)
+        if uncached:
+            loaded = load(uncached)
+            self.put_many(loaded, uncached - loaded.keys())
+            found.update(loaded)
+        return found
+
+    def summary(self) -> str:
+        """
+        Returns:
+            A summary of the cache size and counters.
+        """
+        counters = ", ".join(
+            f"{name}={count}" for name, count in sorted(self.counters.items())
+        )
+        return f"size={len(self)}, {counters}" if counters else f"size={len(self)}"
+
+
+# IML category ID to WooCommerce category ID, shared by every service of a container
+category_id_cache = TTLCache(
+    max_size=int(os.getenv("CATEGORY_CACHE_MAX_SIZE", DEFAULT_MAX_SIZE)),
+    ttl_seconds=float(os.getenv("CATEGORY_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+    negative_ttl_seconds=float(
+        os.getenv("CATEGORY_CACHE_NEGATIVE_TTL_SECONDS", DEFAULT_NEGATIVE_TTL_SECONDS)
+    ),
+)
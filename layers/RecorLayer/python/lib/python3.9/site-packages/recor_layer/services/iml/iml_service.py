@@ -15,18 +15,14 @@ class ImlService:
         self.get_category_list_request = ImlGetCategoryListRequest()
         self.get_item_info_request = ImlGetItemInfoRequest()
 
-    def get_category_list(self, request_data: Dict = {}) -> List[Dict]:
+    def get_category_list(self) -> List[Dict]:
         """
         Retrieves a list of categories from the IML API.
 
-        Args:
-            request_data: Optional dictionary containing any specific parameters
-                          required by the IML get category list API.
-
         Returns:
             A list of dictionaries, where each dictionary represents an IML category.
         """
-        return self.get_category_list_request.run(request_data)
+        return self.get_category_list_request.run()
 
     def get_item_info(self, counter: int) -> Response:
         """
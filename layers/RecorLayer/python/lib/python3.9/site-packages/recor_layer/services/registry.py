@@ -0,0 +1,74 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Tuple, TypeVar
+
+from recor_layer.log import log
+
+"""
+Clients and services are expensive to build and safe to reuse, so they are kept
+for the life of the Lambda container instead of being built on every invocation.
+"""
+
+T = TypeVar("T")
+
+
+class Registry:
+    """
+    Lazily creates and keeps one instance per factory and arguments.
+    """
+
+    def __init__(self):
+        self._instances: Dict[Tuple[Hashable, ...], Any] = {}
+        # Reentrant, as factories can get their own dependencies from the registry
+        self._lock = threading.RLock()
+        self.init_seconds: Dict[str, float] = {}
+
+    def get(self, factory: Callable[..., T], *args: Hashable) -> T:
+        """
+        Returns the instance built by a factory, building it on first use.
+
+        Args:
+            factory: A class or function that builds the instance.
+            *args: Arguments to the factory, part of the instance's identity.
+
+        Returns:
+            The shared instance.
+        """
+        key = (factory, *args)
+        instance = self._instances.get(key)
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            instance = self._instances.get(key)
+            if instance is None:
+                start = time.perf_counter()
+                instance = factory(*args)
+                seconds = time.perf_counter() - start
+                name = getattr(factory, "__qualname__", repr(factory))
+                self.init_seconds[name] = self.init_seconds.get(name, 0.0) + seconds
+                log.success("Initialized %s in %.1fms", name, seconds * 1000)
+                self._instances[key] = instance
+        return instance
+
+    def reset(self) -> None:
+        """
+        Drops every instance, so the next get builds it again.
+        """
+        with self._lock:
+            self._instances.clear()
+            self.init_seconds.clear()
+
+    def summary(self) -> str:
+        """
+        Returns:
+            The time spent building each kind of instance.
+        """
+        return ", ".join(
+            f"{name}={seconds * 1000:.1f}ms"
+            for name, seconds in sorted(self.init_seconds.items())
+        )
+
+
+# Shared by every handler and service of a Lambda container
+registry = Registry()
@@ -1,6 +1,12 @@
-import time
-from typing import Dict, List
+import asyncio
+from functools import cached_property
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
 
+from recor_layer.log import log
+from recor_layer.requests.rate_limiter import woocommerce_rate_limiter
+from recor_layer.requests.woocommerce.async_woocommerce_client import (
+    async_woocommerce_client,
+)
 from recor_layer.requests.woocommerce.woocommerce_batch_update_categories_request import (
     WooCommerceBatchUpdateCategoriesRequest,
 )
@@ -10,61 +16,267 @@ from recor_layer.requests.woocommerce.woocommerce_batch_update_products_request
 from recor_layer.requests.woocommerce.woocommerce_list_all_categories_request import (
     WooCommerceListAllCategoriesRequest,
 )
+from recor_layer.services.registry import registry
+
+# The WooCommerce batch endpoints accept up to 100 objects per request
+MAX_BATCH_OBJECTS = 100
+BATCH_ACTIONS = ("create", "update", "delete")
+
+
+class WooCommerceBatchError(Exception):
+    """
+    Raised when some chunks of a batch update failed.
+
+    The response holds the merged results of the chunks that succeeded, so the
+    objects they created can still be recorded.
+    """
+
+    def __init__(self, response: Dict, errors: List[Exception]):
+        super().__init__(
+            f"{len(errors)} WooCommerce batch chunks failed: {errors[0]}"
+        )
+        self.response = response
+        self.errors = errors
 
 
 class WooCommerceService:
     """Handles interactions with the WooCommerce API."""
 
     def __init__(self):
-        """Initializes the WooCommerceService with request objects."""
-        self.batch_update_categories_request = WooCommerceBatchUpdateCategoriesRequest()
-        self.batch_update_products_request = WooCommerceBatchUpdateProductsRequest()
-        self.list_all_categories_request = WooCommerceListAllCategoriesRequest()
-
-    def delete_products(self, delete_categories_ids: List[int]):
-        return self.batch_update_products_request.run(
-            delete_product_ids=delete_categories_ids
-        )
+        """Initializes the WooCommerceService. Request objects are built on first use."""
+
+    @cached_property
+    def max_concurrency(self) -> int:
+        return registry.get(async_woocommerce_client).max_concurrency
+
+    @cached_property
+    def batch_update_categories_request(self) -> WooCommerceBatchUpdateCategoriesRequest:
+        return WooCommerceBatchUpdateCategoriesRequest()
+
+    @cached_property
+    def batch_update_products_request(self) -> WooCommerceBatchUpdateProductsRequest:
+        return WooCommerceBatchUpdateProductsRequest()
+
+    @cached_property
+    def list_all_categories_request(self) -> WooCommerceListAllCategoriesRequest:
+        return WooCommerceListAllCategoriesRequest()
+
+    def delete_products(self, delete_product_ids: List[int]):
+        return asyncio.run(self.delete_products_async(delete_product_ids))
+
+    async def delete_products_async(self, delete_product_ids: List[int]) -> Dict:
+        """
+        Deletes WooCommerce products, in concurrent chunks of the batch limit.
+
+        Args:
+            delete_product_ids: The WooCommerce product IDs to delete.
+
+        Returns:
+            A dictionary containing the response from the WooCommerce API.
+        """
+        return await self.batch_update_products_async([], [], delete_product_ids)
 
     def delete_categories(self, delete_categories_ids: List[int]):
-        return self.batch_update_categories_request.run(
-            delete_categories_ids=delete_categories_ids
-        )
+        return asyncio.run(self.delete_categories_async(delete_categories_ids))
+
+    async def delete_categories_async(self, delete_categories_ids: List[int]) -> Dict:
+        """
+        Deletes WooCommerce categories, in concurrent chunks of the batch limit.
+
+        Args:
+            delete_categories_ids: The WooCommerce category IDs to delete.
+
+        Returns:
+            A dictionary containing the response from the WooCommerce API.
+        """
+        return await self.batch_update_categories_async([], [], delete_categories_ids)
 
     def batch_update_products(
-        self, new_products: List[Dict], old_products: List[Dict]
+        self,
+        new_products: List[Dict],
+        old_products: List[Dict],
+        delete_product_ids: Optional[List[int]] = None,
+    ) -> Dict:
+        """
+        Creates new, updates existing and deletes WooCommerce products in a batch.
+
+        Blocking wrapper around batch_update_products_async.
+        """
+        return asyncio.run(
+            self.batch_update_products_async(
+                new_products, old_products, delete_product_ids
+            )
+        )
+
+    async def batch_update_products_async(
+        self,
+        new_products: List[Dict],
+        old_products: List[Dict],
+        delete_product_ids: Optional[List[int]] = None,
     ) -> Dict:
         """
-        Creates new and updates existing WooCommerce products in a batch.
+        Creates new, updates existing and deletes WooCommerce products in a batch.
+
+        The objects are split into chunks of the WooCommerce batch limit, which are
+        sent concurrently, up to WOOCOMMERCE_MAX_CONCURRENCY requests at a time.
 
         Args:
             new_products: A list of dictionaries representing new product data.
             old_products: A list of dictionaries representing existing product data to update.
+            delete_product_ids: An optional list of WooCommerce product IDs to delete.
 
         Returns:
-            A dictionary containing the response from the WooCommerce API.
+            A dictionary containing the response from the WooCommerce API, with the
+            results of each action in input order.
+
+        Raises:
+            WooCommerceBatchError: If any chunk failed, holding the merged response
+                                   of the chunks that succeeded.
         """
-        return self.batch_update_products_request.run(
-            new_products=new_products, old_products=old_products
+        return await self._run_batch_async(
+            "Products",
+            self.batch_update_products_request.run_async,
+            {
+                "create": new_products,
+                "update": old_products,
+                "delete": delete_product_ids or [],
+            },
         )
 
     def batch_update_categories(
-        self, new_categories: List[Dict], old_categories: List[Dict]
+        self,
+        new_categories: List[Dict],
+        old_categories: List[Dict],
+        delete_categories_ids: Optional[List[int]] = None,
+    ) -> Dict:
+        """
+        Creates new, updates existing and deletes WooCommerce categories in a batch.
+
+        Blocking wrapper around batch_update_categories_async.
+        """
+        return asyncio.run(
+            self.batch_update_categories_async(
+                new_categories, old_categories, delete_categories_ids
+            )
+        )
+
+    async def batch_update_categories_async(
+        self,
+        new_categories: List[Dict],
+        old_categories: List[Dict],
+        delete_categories_ids: Optional[List[int]] = None,
     ) -> Dict:
         """
-        Creates new and updates existing WooCommerce categories in a batch.
+        Creates new, updates existing and deletes WooCommerce categories in a batch.
+
+        The objects are sent in concurrent chunks, like batch_update_products_async.
 
         Args:
             new_categories: A list of dictionaries representing new category data.
             old_categories: A list of dictionaries representing existing category data to update.
+            delete_categories_ids: An optional list of WooCommerce category IDs to delete.
 
         Returns:
-            A dictionary containing the response from the WooCommerce API.
+            A dictionary containing the response from the WooCommerce API, with the
+            results of each action in input order.
+
+        Raises:
+            WooCommerceBatchError: If any chunk failed, holding the merged response
+                                   of the chunks that succeeded.
         """
-        return self.batch_update_categories_request.run(
-            new_categories=new_categories, old_categories=old_categories
+        return await self._run_batch_async(
+            "Categories",
+            self.batch_update_categories_request.run_async,
+            {
+                "create": new_categories,
+                "update": old_categories,
+                "delete": delete_categories_ids or [],
+            },
         )
 
+    async def _run_batch_async(
+        self,
+        kind: str,
+        run_async: Callable[..., Awaitable[Dict]],
+        objects: Dict[str, List],
+    ) -> Dict:
+        """
+        Sends the chunks of a batch concurrently and merges their responses.
+
+        Args:
+            kind: The kind of objects, for logging.
+            run_async: The run_async method of the batch update request.
+            objects: The objects to create, update and delete, by action.
+
+        Returns:
+            The merged response, with the results of each action in input order.
+
+        Raises:
+            WooCommerceBatchError: If any chunk failed.
+        """
+        chunks = self._chunk_batch(objects)
+        if len(chunks) == 1:
+            chunk = chunks[0]
+            return await run_async(chunk["create"], chunk["update"], chunk["delete"])
+
+        log.attempt(
+            "Batch Updating WooCommerce %s in %d chunks, %d at a time",
+            kind,
+            len(chunks),
+            self.max_concurrency,
+        )
+        # The async client bounds how many of the chunks are in flight at a time
+        results = await asyncio.gather(
+            *(
+                run_async(chunk["create"], chunk["update"], chunk["delete"])
+                for chunk in chunks
+            ),
+            return_exceptions=True,
+        )
+
+        response: Dict = {action: [] for action in BATCH_ACTIONS}
+        errors = []
+        for result in results:
+            if isinstance(result, Exception):
+                log.error("WooCommerce batch chunk failed: %s", result)
+                errors.append(result)
+                continue
+            for action in BATCH_ACTIONS:
+                response[action].extend(result.get(action, []))
+
+        if errors:
+            raise WooCommerceBatchError(response, errors)
+        log.success(
+            "Batch Updated WooCommerce %s in %d chunks, rate limiter: %s",
+            kind,
+            len(chunks),
+            self.rate_limit_summary(),
+        )
+        return response
+
+    @staticmethod
+    def _chunk_batch(objects: Dict[str, List]) -> List[Dict[str, List]]:
+        """
+        Splits the objects of a batch into chunks of at most MAX_BATCH_OBJECTS.
+
+        Args:
+            objects: The objects to create, update and delete, by action.
+
+        Returns:
+            The chunks, each with the objects to create, update and delete. Every
+            action keeps its input order across the chunks.
+        """
+        actions: List[Tuple[str, object]] = [
+            (action, obj) for action in BATCH_ACTIONS for obj in objects[action]
+        ]
+        chunks = []
+        for i in range(0, max(len(actions), 1), MAX_BATCH_OBJECTS):
+            chunk: Dict[str, List] = {action: [] for action in BATCH_ACTIONS}
+            for action, obj in actions[i : i + MAX_BATCH_OBJECTS]:
+                chunk[action].append(obj)
+            chunks.append(chunk)
+        return chunks
+
     def list_all_categories(self) -> List[Dict]:
         """
         Retrieves all WooCommerce categories.
@@ -72,51 +284,62 @@ class WooCommerceService:
         Returns:
             A list of dictionaries, where each dictionary represents a WooCommerce category.
         """
-        return self.list_all_categories_request.run()
+        return asyncio.run(self.list_all_categories_async())
+
+    async def list_all_categories_async(self) -> List[Dict]:
+        """
+        Retrieves all WooCommerce categories, requesting the pages concurrently.
+
+        Returns:
+            A list of dictionaries, where each dictionary represents a WooCommerce category.
+        """
+        return await self.list_all_categories_request.run_async()
 
-    def delete_in_batches(
-        self, method, woocommerce_ids, batch_size=100, delay_seconds=0.5
-    ):
+    def delete_in_batches(self, method, woocommerce_ids, batch_size=100):
         """
         Deletes a list of WooCommerce items by breaking them into batches.
 
+        The batches are paced by the rate limiter shared by every WooCommerce
+        request, which follows the store's capacity.
+
         Args:
             woocommerce_ids (list): A list of IDs to delete.
             method (request): WooCommerceBatchUpdateCategoriesRequest or WooCommerceBatchUpdateProductsRequest.
             batch_size (int): The maximum number of product IDs to delete in a single request.
                               Defaults to 100, as per the WooCommerce API limit.
-            delay_seconds (float): The delay in seconds to wait between each batch request.
-                                   Helps to avoid hitting API rate limits. Defaults to 0.5 seconds.
         """
         if not woocommerce_ids:
-            print("ERROR: No IDs provided for deletion.")
+            log.error("No IDs provided for deletion.")
             return
 
         total_ids = len(woocommerce_ids)
-        print(f"ATTEMPT: Starting batch deletion for {total_ids} products...")
+        log.attempt("Starting batch deletion for %d products...", total_ids)
 
         # Iterate through the product IDs in chunks
         for i in range(0, total_ids, batch_size):
             batch = woocommerce_ids[i : i + batch_size]
             batch_num = (i // batch_size) + 1
-            print(f"ATTEMPT: Processing batch {batch_num} ({len(batch)} products)...")
+            log.attempt("Processing batch %d (%d products)...", batch_num, len(batch))
 
             try:
                 # Call the actual WooCommerce service delete method
                 response = method.delete_products(batch)
-                print(
-                    f"SUCCESS:  Batch {batch_num} deletion successful. Response: {response}"
+                log.success(
+                    "Batch %d deletion successful. Response: %s", batch_num, response
                 )
             except Exception as e:
-                print(f"ERROR: Error deleting batch {batch_num}: {e}")
+                log.error("Error deleting batch %d: %s", batch_num, e)
 
-            # Introduce a delay if there are more batches to process
-            if i + batch_size < total_ids:
-                print(
-                    f"ATTEMPT: Waiting for {delay_seconds} seconds before next batch..."
-                )
-                time.sleep(delay_seconds)
-            else:
-                print("SUCCESS: Last batch processed.")
+        log.success(
+            "Batch deletion process completed for %d products, rate limiter: %s",
+            total_ids,
+            self.rate_limit_summary(),
+        )
 
-        print(f"SUCCESS: Batch deletion process completed for {total_ids} products.")
+    @staticmethod
+    def rate_limit_summary() -> str:
+        """
+        Returns:
+            The current rate of the WooCommerce rate limiter and its counters.
+        """
+        return registry.get(woocommerce_rate_limiter).summary()
@@ -1,3 +1,5 @@
+from typing import Iterable, List, Mapping, Optional
+
 from recor_layer.models.woocommerce.woocommerce_category import WooCommerceCategory
 from recor_layer.models.woocommerce.woocommerce_image import WooCommerceImage
 from recor_layer.transformers.transformer import Transformer
@@ -8,13 +10,27 @@ class ImlCategoryTransformer(Transformer):
 
     def transform(self, raw_json: dict):
         """
-        :param raw_json: raw_json
+        :param raw_json: raw_json, with the CATEGORY_ID_MAP
+        """
+        return self._transform(raw_json, raw_json)
+
+    def transform_many(
+        self, raw_jsons: Iterable[dict], context: Optional[Mapping] = None
+    ) -> List[WooCommerceCategory]:
         """
+        :param raw_jsons: raw_jsons, which are not copied or modified
+        :param context: the CATEGORY_ID_MAP shared by the raw_jsons
+        """
+        if context is None:
+            context = {}
+        return [self._transform(raw_json, context) for raw_json in raw_jsons]
+
+    def _transform(self, raw_json: dict, context: Mapping):
         return WooCommerceCategory(
             name=raw_json.get("title"),
             slug=str(raw_json.get("category_id")),
             image=self._get_image(raw_json),
-            parent=raw_json.get(self.CATEGORY_ID_MAP, {}).get(
+            parent=context.get(self.CATEGORY_ID_MAP, {}).get(
                 str(raw_json.get("parent_id"))
             ),
         )
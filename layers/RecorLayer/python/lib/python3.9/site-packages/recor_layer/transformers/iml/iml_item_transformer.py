@@ -1,4 +1,6 @@
-from recor_layer.models.woocommerce.woocommerce_category import WooCommerceCategory
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from recor_layer.models.woocommerce.woocommerce_category import category_reference
 from recor_layer.models.woocommerce.woocommerce_dimensions import WooCommerceDimensions
 from recor_layer.models.woocommerce.woocommerce_image import WooCommerceImage
 from recor_layer.models.woocommerce.woocommerce_product import WooCommerceProduct
@@ -7,20 +9,71 @@ from recor_layer.transformers.iml.iml_dimensions_transformer import (
 )
 from recor_layer.transformers.transformer import Transformer
 
+ROOT_CATEGORY_IDS = {"-1", "0", "None"}
+
+
+def build_category_ancestor_index(
+    parent_category_id_map: Mapping[str, str]
+) -> Dict[str, Tuple[str, ...]]:
+    """
+    Precomputes the ancestors of every IML category, nearest first.
+
+    Args:
+        parent_category_id_map: The parent IML category ID of each IML category ID.
+                                Root categories have a parent of "-1".
+
+    Returns:
+        The ancestor IML category IDs of each IML category ID.
+    """
+    ancestor_index: Dict[str, Tuple[str, ...]] = {}
+    for category_id in parent_category_id_map:
+        ancestors = []
+        parent_category_id = str(parent_category_id_map[category_id])
+        # Stops at the root, at unknown parents and at cycles
+        while (
+            parent_category_id not in ROOT_CATEGORY_IDS
+            and parent_category_id != category_id
+            and parent_category_id not in ancestors
+        ):
+            ancestors.append(parent_category_id)
+            parent_category_id = str(
+                parent_category_id_map.get(parent_category_id, "-1")
+            )
+        ancestor_index[str(category_id)] = tuple(ancestors)
+    return ancestor_index
+
 
 class ImlItemTransformer(Transformer):
     CATEGORY_ID_MAP = "CATEGORY_ID_MAP"
     PRODUCT_ID_MAP = "PRODUCT_ID_MAP"
+    # Optional, from build_category_ancestor_index, to add the ancestor categories
+    CATEGORY_ANCESTOR_INDEX = "CATEGORY_ANCESTOR_INDEX"
 
     def __init__(self):
         self.iml_dimensions_transformer = ImlDimensionsTransformer()
 
     def transform(self, raw_json: dict):
         """
-        :param raw_json: raw_json
+        :param raw_json: raw_json, with the CATEGORY_ID_MAP, PRODUCT_ID_MAP and
+            CATEGORY_ANCESTOR_INDEX
+        """
+        return self._transform(raw_json, raw_json)
+
+    def transform_many(
+        self, raw_jsons: Iterable[dict], context: Optional[Mapping] = None
+    ) -> List[WooCommerceProduct]:
         """
+        :param raw_jsons: raw_jsons, which are not copied or modified
+        :param context: the CATEGORY_ID_MAP, PRODUCT_ID_MAP and CATEGORY_ANCESTOR_INDEX
+            shared by the raw_jsons
+        """
+        if context is None:
+            context = {}
+        return [self._transform(raw_json, context) for raw_json in raw_jsons]
+
+    def _transform(self, raw_json: dict, context: Mapping):
         return WooCommerceProduct(
-            id=self._get_product_id(raw_json),  # For Updates Only
+            id=self._get_product_id(raw_json, context),  # For Updates Only
             name=raw_json.get("item_desc"),
             sku=raw_json.get("item_id"),
             slug=raw_json.get("short_code"),
@@ -28,17 +81,26 @@ class ImlItemTransformer(Transformer):
             description=self._get_description(raw_json),
             stock_quantity=raw_json.get("qty_avail"),
             dimensions=self._get_dimensions(raw_json),
-            categories=self._get_categories(raw_json),
+            categories=self._get_categories(raw_json, context),
             regular_price=raw_json.get("list_price"),
         )
 
-    def _get_categories(self, raw_json):
-        category_id_map = raw_json.get(self.CATEGORY_ID_MAP)
+    def _get_categories(self, raw_json, context):
+        category_id_map = context.get(self.CATEGORY_ID_MAP) or {}
+        ancestor_index = context.get(self.CATEGORY_ANCESTOR_INDEX) or {}
         categories = []
-        for iml_category_id in category_id_map:
-            woocommerce_category_id = category_id_map.get(str(iml_category_id))
-            if woocommerce_category_id:
-                categories.append(WooCommerceCategory(id=woocommerce_category_id))
+        woocommerce_category_ids = set()
+        for iml_category_id in raw_json.get("category_id") or []:
+            iml_category_id = str(iml_category_id)
+            ancestor_category_ids = ancestor_index.get(iml_category_id, ())
+            for category_id in (iml_category_id, *ancestor_category_ids):
+                woocommerce_category_id = category_id_map.get(category_id)
+                if (
+                    woocommerce_category_id
+                    and woocommerce_category_id not in woocommerce_category_ids
+                ):
+                    woocommerce_category_ids.add(woocommerce_category_id)
+                    categories.append(category_reference(woocommerce_category_id))
         return categories
 
     def _get_description(self, raw_json):
@@ -66,7 +128,7 @@ class ImlItemTransformer(Transformer):
             WooCommerceImage(src=raw_json.get("img_med"), name="iml_img_med"),
         ]
 
-    def _get_product_id(self, raw_json):
-        if raw_json.get(self.PRODUCT_ID_MAP):
-            product_id = raw_json[self.PRODUCT_ID_MAP].get(raw_json["short_code"], None)
+    def _get_product_id(self, raw_json, context):
+        if context.get(self.PRODUCT_ID_MAP):
+            product_id = context[self.PRODUCT_ID_MAP].get(raw_json["short_code"], None)
             return product_id
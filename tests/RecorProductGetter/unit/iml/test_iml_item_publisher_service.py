@@ -0,0 +1,265 @@
+import json
+import tempfile
+import threading
+from queue import Queue
+from unittest import TestCase, mock
+
+from recor_layer.services.aws.sqs.claim_check import (
+    CLAIM_CHECK_CODEC,
+    check_out,
+    get_claim_check_store,
+)
+from recor_layer.services.aws.sqs.message_codec import CODEC_ATTRIBUTE, get_codec
+from recor_product_getter.libs.services.iml import iml_item_publisher_service
+from recor_product_getter.libs.services.iml.iml_item_publisher_service import (
+    ImlItemPublisherService,
+)
+
+RUN_TIMEOUT_SECONDS = 10
+
+
+class FakeRaw:
+    def __init__(self, body: bytes, chunk_size: int = 7):
+        self.body = body
+        self.chunk_size = chunk_size
+
+    def stream(self, chunk_size, decode_content=False):
+        for start in range(0, len(self.body), self.chunk_size):
+            yield self.body[start : start + self.chunk_size]
+
+
+class FakeResponse:
+    def __init__(self, body: bytes, headers=None):
+        self.raw = FakeRaw(body)
+        self.headers = headers or {}
+        self.closed = False
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class FakeImlService:
+    def __init__(self, response: FakeResponse):
+        self.response = response
+
+    def get_item_info(self, counter):
+        return self.response
+
+
+class FakeSQSService:
+    """Records the published messages, failing the call it is told to."""
+
+    def __init__(self, queue_url, fail_on_call=None):
+        self.queue_url = queue_url
+        self.is_fifo = queue_url.endswith(".fifo")
+        self.fail_on_call = fail_on_call
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def send_messages(self, messages, message_group_id=None):
+        with self.lock:
+            self.calls.append((list(messages), message_group_id))
+            if len(self.calls) == self.fail_on_call:
+                raise RuntimeError("SQS is unavailable")
+        return [{"Id": str(i)} for i in range(len(messages))]
+
+    def published_items(self):
+        return [
+            item
+            for messages, _ in self.calls
+            for message_body, _ in messages
+            for item in json.loads(message_body)
+        ]
+
+
+class BoundedQueue(Queue):
+    """Records the most batches ever waiting in the queue."""
+
+    max_waiting = 0
+
+    def put(self, item, block=True, timeout=None):
+        super().put(item, block, timeout)
+        BoundedQueue.max_waiting = max(BoundedQueue.max_waiting, self.qsize())
+
+
+def _document(item_count, last_update_seq=1000):
+    items = [{"short_code": str(i), "update_seq": i} for i in range(1, item_count + 1)]
+    return json.dumps({"items": items, "last_update_seq": last_update_seq}).encode()
+
+
+class TestImlItemPublisherService(TestCase):
+    def _service(self, body, fail_on_call=None, workers=2, queue_size=1, **env):
+        environ = {
+            "SQS_QUEUE_URL": "https://sqs.us-east-1.amazonaws.com/123456789012/items",
+            "IML_PUBLISHER_WORKERS": str(workers),
+            "IML_PUBLISHER_QUEUE_SIZE": str(queue_size),
+            **env,
+        }
+        with mock.patch.dict("os.environ", environ), mock.patch.object(
+            iml_item_publisher_service,
+            "SQSService",
+            lambda queue_url: FakeSQSService(queue_url, fail_on_call),
+        ):
+            service = ImlItemPublisherService()
+        self.response = FakeResponse(body)
+        service.iml_service = FakeImlService(self.response)
+        return service
+
+    def _run(self, service, *args, **kwargs):
+        """Runs the service on another thread, failing the test if it hangs."""
+        result = {}
+
+        def target():
+            try:
+                result["value"] = service.run(*args, **kwargs)
+            except Exception as e:
+                result["error"] = e
+
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        thread.join(RUN_TIMEOUT_SECONDS)
+        self.assertFalse(thread.is_alive(), "run did not finish")
+        self.assertFalse(
+            any(
+                thread.name.startswith("iml-publisher-") and thread.is_alive()
+                for thread in threading.enumerate()
+            ),
+            "publisher workers are still running",
+        )
+        self.assertTrue(self.response.closed)
+        if "error" in result:
+            raise result["error"]
+        return result["value"]
+
+    def test_publishes_every_item_through_a_bounded_queue(self):
+        service = self._service(_document(95))
+        BoundedQueue.max_waiting = 0
+        checkpoints = []
+
+        with mock.patch.object(iml_item_publisher_service, "Queue", BoundedQueue):
+            update_seq = self._run(
+                service, 0, 1, 1000, write_checkpoint=checkpoints.append
+            )
+
+        self.assertEqual(update_seq, 1000)
+        published_items = service.sqs_service.published_items()
+        self.assertEqual(
+            sorted(int(item["short_code"]) for item in published_items),
+            list(range(1, 96)),
+        )
+        self.assertEqual(len(service.sqs_service.calls), 10)
+        self.assertLessEqual(BoundedQueue.max_waiting, 1)
+        self.assertEqual(checkpoints, sorted(checkpoints))
+        self.assertEqual(checkpoints[-1], 95)
+
+    def test_coalesce_window_is_capped_at_one_batch(self):
+        service = self._service(_document(95), IML_COALESCE_WINDOW="1000")
+
+        with mock.patch.object(
+            iml_item_publisher_service,
+            "ItemCoalescer",
+            wraps=iml_item_publisher_service.ItemCoalescer,
+        ) as item_coalescer:
+            self._run(service, 0, 2, 1000)
+
+        item_coalescer.assert_called_once_with(20)
+
+    def test_standard_queues_ignore_queue_partitions(self):
+        service = self._service(_document(100), IML_QUEUE_PARTITIONS="16")
+
+        self._run(service, 0, 10, 1000)
+
+        self.assertEqual(1, service.queue_partitions)
+        ((messages, _),) = service.sqs_service.calls
+        self.assertEqual(
+            [10] * 10, [len(json.loads(message_body)) for message_body, _ in messages]
+        )
+
+    def test_fifo_queues_are_partitioned(self):
+        service = self._service(
+            _document(100),
+            SQS_QUEUE_URL="https://sqs.us-east-1.amazonaws.com/123456789012/items.fifo",
+            IML_QUEUE_PARTITIONS="16",
+        )
+
+        self._run(service, 0, 10, 1000)
+
+        self.assertEqual(16, service.queue_partitions)
+        message_group_ids = {
+            message_group_id for _, message_group_id in service.sqs_service.calls
+        }
+        self.assertEqual(16, len(message_group_ids))
+
+    def test_claim_checks_keep_the_message_group_order(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        claim_check_url = f"file://{directory.name}"
+        # Every third item is too large to send inline
+        items = [
+            {"short_code": str(i), "update_seq": i, "padding": "x" * (i % 3 == 0) * 200}
+            for i in range(1, 41)
+        ]
+        body = json.dumps({"items": items, "last_update_seq": 40}).encode()
+        service = self._service(
+            body,
+            SQS_QUEUE_URL="https://sqs.us-east-1.amazonaws.com/123456789012/items.fifo",
+            CLAIM_CHECK_URL=claim_check_url,
+        )
+        service.max_message_bytes = 150
+
+        self._run(service, 0, 1, 1000)
+
+        store = get_claim_check_store(claim_check_url)
+        update_seqs = []
+        claim_check_count = 0
+        for messages, message_group_id in service.sqs_service.calls:
+            self.assertEqual("partition-0", message_group_id)
+            for message_body, message_attributes in messages:
+                codec_name = message_attributes[CODEC_ATTRIBUTE]["StringValue"]
+                if codec_name == CLAIM_CHECK_CODEC:
+                    message_body, codec_name = check_out(store, message_body)
+                    claim_check_count += 1
+                update_seqs.extend(
+                    item["update_seq"]
+                    for item in get_codec(codec_name).decode(message_body)
+                )
+        self.assertEqual(list(range(1, 41)), update_seqs)
+        self.assertEqual(13, claim_check_count)
+
+    def test_limit_reached_returns_the_published_update_seq(self):
+        service = self._service(_document(95))
+
+        update_seq = self._run(service, 0, 1, 30)
+
+        self.assertEqual(update_seq, 30)
+        self.assertEqual(len(service.sqs_service.published_items()), 30)
+
+    def test_limit_reached_before_publishing_returns_the_counter(self):
+        service = self._service(_document(95))
+
+        update_seq = self._run(service, 7, 1, 0)
+
+        self.assertEqual(update_seq, 7)
+        self.assertEqual(service.sqs_service.calls, [])
+
+    def test_worker_failure_stops_the_run_and_is_raised(self):
+        service = self._service(_document(500), fail_on_call=2)
+        checkpoints = []
+
+        with self.assertRaisesRegex(RuntimeError, "SQS is unavailable"):
+            self._run(service, 0, 1, 1000, write_checkpoint=checkpoints.append)
+
+        # The parser stops feeding batches once a worker has failed
+        self.assertLess(len(service.sqs_service.calls), 50)
+        self.assertTrue(all(checkpoint < 500 for checkpoint in checkpoints))
+
+    def test_parser_failure_shuts_the_workers_down(self):
+        body = _document(50)[:300]  # Truncated mid-document
+
+        service = self._service(body)
+
+        with self.assertRaises(Exception):
+            self._run(service, 0, 1, 1000)
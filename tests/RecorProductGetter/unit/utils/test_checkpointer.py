@@ -0,0 +1,50 @@
+from unittest import TestCase
+
+from recor_product_getter.libs.services.utils.checkpointer import Checkpointer
+
+
+class TestCheckpointer(TestCase):
+    def test_writes_every_interval(self):
+        checkpoints = []
+        checkpointer = Checkpointer(checkpoints.append, checkpoint_interval=2)
+
+        for batch in range(1, 6):
+            checkpointer.update(batch, batch * 10)
+
+        self.assertEqual([20, 40], checkpoints)
+        self.assertEqual(4, checkpointer.checkpoint_count)
+
+    def test_counts_batches_completed_out_of_order(self):
+        checkpoints = []
+        checkpointer = Checkpointer(checkpoints.append, checkpoint_interval=2)
+
+        checkpointer.update(0, None)
+        checkpointer.update(3, 30)
+
+        self.assertEqual([30], checkpoints)
+
+    def test_never_moves_backwards(self):
+        checkpoints = []
+        checkpointer = Checkpointer(checkpoints.append)
+
+        checkpointer.update(1, 50)
+        checkpointer.update(2, 50)
+        checkpointer.update(3, 40)
+        checkpointer.update(4, 60)
+
+        self.assertEqual([50, 60], checkpoints)
+
+    def test_skips_unknown_update_seq(self):
+        checkpoints = []
+        checkpointer = Checkpointer(checkpoints.append)
+
+        checkpointer.update(1, None)
+
+        self.assertEqual([], checkpoints)
+
+    def test_disabled_without_writer(self):
+        checkpointer = Checkpointer()
+
+        checkpointer.update(1, 10)
+
+        self.assertIsNone(checkpointer.update_seq)
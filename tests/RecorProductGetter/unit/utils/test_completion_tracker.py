@@ -0,0 +1,43 @@
+import threading
+from unittest import TestCase
+
+from recor_product_getter.libs.services.utils.completion_tracker import (
+    CompletionTracker,
+)
+
+
+class TestCompletionTracker(TestCase):
+    def test_in_order_completion(self):
+        tracker = CompletionTracker()
+
+        self.assertEqual((1, 10), tracker.complete(1, 10))
+        self.assertEqual((2, 20), tracker.complete(2, 20))
+
+    def test_out_of_order_completion_waits_for_the_gap(self):
+        tracker = CompletionTracker()
+
+        self.assertEqual((0, None), tracker.complete(2, 20))
+        self.assertEqual((0, None), tracker.complete(3, 30))
+        self.assertEqual((3, 30), tracker.complete(1, 10))
+        self.assertEqual(30, tracker.max_update_seq)
+
+    def test_update_seq_never_moves_backwards(self):
+        tracker = CompletionTracker()
+
+        tracker.complete(1, 50)
+        self.assertEqual((2, 50), tracker.complete(2, 40))
+        self.assertEqual((3, 50), tracker.complete(3, None))
+
+    def test_concurrent_completion(self):
+        tracker = CompletionTracker()
+        threads = [
+            threading.Thread(target=tracker.complete, args=(batch, batch * 10))
+            for batch in range(100, 0, -1)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(100, tracker.contiguous_count)
+        self.assertEqual(1000, tracker.max_update_seq)
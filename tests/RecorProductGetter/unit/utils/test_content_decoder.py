@@ -0,0 +1,82 @@
+import gzip
+import zlib
+from unittest import TestCase
+
+from recor_product_getter.libs.services.utils.content_decoder import ContentDecoder
+
+BODY = b'{"items": [' + b",".join(
+    b'{"short_code": "%d", "item_desc": "Item %d"}' % (i, i) for i in range(200)
+) + b'], "last_update_seq": 42}'
+
+
+class FakeRaw:
+    def __init__(self, body, chunk_size):
+        self.body = body
+        self.chunk_size = chunk_size
+
+    def stream(self, chunk_size, decode_content=False):
+        for start in range(0, len(self.body), self.chunk_size):
+            yield self.body[start : start + self.chunk_size]
+
+
+class FakeResponse:
+    def __init__(self, body, content_encoding=None, chunk_size=64):
+        self.raw = FakeRaw(body, chunk_size)
+        self.headers = {}
+        if content_encoding is not None:
+            self.headers["Content-Encoding"] = content_encoding
+
+
+def _raw_deflate(body):
+    compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    return compressor.compress(body) + compressor.flush()
+
+
+class TestContentDecoder(TestCase):
+    def _decode(self, encoded, content_encoding, chunk_size=64):
+        decoder = ContentDecoder(FakeResponse(encoded, content_encoding, chunk_size))
+        decoded = b"".join(decoder.iter_content(chunk_size=chunk_size))
+        self.assertEqual(len(encoded), decoder.download_bytes)
+        self.assertEqual(len(decoded), decoder.decoded_bytes)
+        return decoded
+
+    def test_round_trips(self):
+        cases = {
+            "identity": (BODY, None),
+            "gzip": (gzip.compress(BODY), "gzip"),
+            "multi-member gzip": (
+                gzip.compress(BODY[:1000]) + gzip.compress(BODY[1000:]),
+                "gzip",
+            ),
+            "zlib deflate": (zlib.compress(BODY), "deflate"),
+            "raw deflate": (_raw_deflate(BODY), "deflate"),
+        }
+        for name, (encoded, content_encoding) in cases.items():
+            for chunk_size in (1, 3, 7, 64, len(encoded)):
+                with self.subTest(name, chunk_size=chunk_size):
+                    self.assertEqual(
+                        BODY, self._decode(encoded, content_encoding, chunk_size)
+                    )
+
+    def test_chunk_splits_the_gzip_header(self):
+        # The gzip header is 10 bytes, so the first chunk ends inside it
+        encoded = gzip.compress(BODY)
+
+        self.assertEqual(BODY, self._decode(encoded, "GZIP", chunk_size=4))
+
+    def test_multi_member_gzip_split_between_members(self):
+        first_member = gzip.compress(BODY[:500])
+        encoded = first_member + gzip.compress(BODY[500:])
+
+        self.assertEqual(BODY, self._decode(encoded, "gzip", len(first_member) + 2))
+
+    def test_corrupt_deflate_after_data_is_not_retried_as_raw(self):
+        encoded = zlib.compress(BODY)
+        corrupt = encoded[:40] + bytes(b ^ 0xFF for b in encoded[40:])
+
+        with self.assertRaises(zlib.error):
+            self._decode(corrupt, "deflate", chunk_size=20)
+
+    def test_unsupported_content_encoding(self):
+        with self.assertRaises(ValueError):
+            self._decode(BODY, "br")
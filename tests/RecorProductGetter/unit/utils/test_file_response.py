@@ -0,0 +1,49 @@
+from unittest import TestCase
+
+from recor_product_getter.libs.services.utils.file_response import (
+    FileResponse,
+    open_file_response,
+)
+
+
+class TestFileResponse(TestCase):
+    def test_readinto_spans_chunks_and_buffers(self):
+        file = FileResponse(iter([b"abc", b"", b"defgh", b"i"]))
+        buffer = bytearray(4)
+
+        reads = []
+        while True:
+            n = file.readinto(buffer)
+            if not n:
+                break
+            reads.append(bytes(buffer[:n]))
+
+        self.assertEqual([b"abcd", b"efgh", b"i"], reads)
+
+    def test_readinto_keeps_the_rest_of_a_large_chunk(self):
+        file = FileResponse(iter([b"0123456789"]))
+        buffer = bytearray(3)
+
+        self.assertEqual(3, file.readinto(buffer))
+        self.assertEqual(b"012", bytes(buffer))
+        self.assertEqual(3, file.readinto(buffer))
+        self.assertEqual(b"345", bytes(buffer))
+
+    def test_readinto_at_eof(self):
+        file = FileResponse(iter([b"ab"]))
+        buffer = bytearray(8)
+
+        self.assertEqual(2, file.readinto(buffer))
+        self.assertEqual(0, file.readinto(buffer))
+        self.assertEqual(0, file.readinto(buffer))
+
+    def test_empty_iterator(self):
+        self.assertEqual(0, FileResponse(iter([])).readinto(bytearray(8)))
+
+    def test_open_file_response_returns_full_reads(self):
+        chunks = [bytes([i]) * (i % 5) for i in range(50)]
+        file = open_file_response(iter(chunks), buffer_size=16)
+
+        self.assertEqual(b"".join(chunks)[:30], file.read(30))
+        self.assertEqual(b"".join(chunks)[30:], file.read())
+        self.assertEqual(b"", file.read(10))
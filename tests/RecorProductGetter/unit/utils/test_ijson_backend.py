@@ -0,0 +1,43 @@
+from unittest import TestCase, mock
+
+from recor_product_getter.libs.services.utils import ijson_backend
+from recor_product_getter.libs.services.utils.ijson_backend import (
+    select_ijson_backend,
+)
+
+
+class TestSelectIjsonBackend(TestCase):
+    def setUp(self):
+        select_ijson_backend.cache_clear()
+
+    def tearDown(self):
+        select_ijson_backend.cache_clear()
+
+    def _get_backend(self, available):
+        def get_backend(name):
+            if name not in available:
+                raise ImportError(f"No backend {name}")
+            return name
+
+        return mock.patch.object(ijson_backend.ijson, "get_backend", get_backend)
+
+    def test_selects_the_fastest_available_backend(self):
+        with self._get_backend({"yajl2", "python"}):
+            self.assertEqual("yajl2", select_ijson_backend())
+
+    def test_falls_back_to_the_python_backend(self):
+        with self._get_backend({"python"}):
+            self.assertEqual("python", select_ijson_backend())
+
+    def test_no_backend_available(self):
+        with self._get_backend(set()):
+            with self.assertRaises(ImportError):
+                select_ijson_backend()
+
+    def test_selected_backend_parses(self):
+        backend = select_ijson_backend()
+
+        self.assertEqual(
+            [("a", "number", 1)],
+            [event for event in backend.parse(b'{"a": 1}') if event[0] == "a"],
+        )
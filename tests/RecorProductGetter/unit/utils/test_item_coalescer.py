@@ -0,0 +1,69 @@
+import random
+from unittest import TestCase
+
+from recor_product_getter.libs.services.utils.item_coalescer import ItemCoalescer
+
+
+def _item(short_code, update_seq):
+    return {"short_code": short_code, "update_seq": update_seq}
+
+
+class TestItemCoalescer(TestCase):
+    def test_newest_update_seq_wins(self):
+        coalescer = ItemCoalescer(window_size=10)
+        items = [_item("a", 1), _item("b", 2), _item("a", 3), _item("a", 4)]
+
+        coalesced = list(coalescer.coalesce(items))
+
+        self.assertEqual([_item("b", 2), _item("a", 4)], coalesced)
+        self.assertEqual(2, coalescer.duplicate_count)
+
+    def test_older_copy_does_not_replace_a_newer_one(self):
+        coalescer = ItemCoalescer(window_size=10)
+        items = [_item("a", 5), _item("a", 3)]
+
+        self.assertEqual([_item("a", 5)], list(coalescer.coalesce(items)))
+        self.assertEqual(1, coalescer.duplicate_count)
+
+    def test_emit_order_stays_update_seq_monotonic(self):
+        randomizer = random.Random(7)
+        items = [
+            _item(str(randomizer.randrange(40)), update_seq) for update_seq in range(500)
+        ]
+
+        for window_size in (1, 5, 50, 1000):
+            with self.subTest(window_size=window_size):
+                coalescer = ItemCoalescer(window_size)
+                coalesced = list(coalescer.coalesce(items))
+                update_seqs = [item["update_seq"] for item in coalesced]
+
+                self.assertEqual(sorted(update_seqs), update_seqs)
+                self.assertEqual(len(items), len(coalesced) + coalescer.duplicate_count)
+                # The last copy of every short_code is always published
+                latest = {item["short_code"]: item for item in items}
+                self.assertTrue(all(item in coalesced for item in latest.values()))
+
+    def test_window_eviction(self):
+        coalescer = ItemCoalescer(window_size=2)
+        items = [_item("a", 1), _item("b", 2), _item("c", 3), _item("a", 4)]
+
+        coalesced = coalescer.coalesce(items)
+
+        # "a" leaves the window before its second copy arrives
+        self.assertEqual(_item("a", 1), next(coalesced))
+        self.assertEqual([_item("b", 2), _item("c", 3), _item("a", 4)], list(coalesced))
+        self.assertEqual(0, coalescer.duplicate_count)
+
+    def test_window_zero_disables_coalescing(self):
+        coalescer = ItemCoalescer(window_size=0)
+        items = [_item("a", 1), _item("a", 2)]
+
+        self.assertEqual(items, list(coalescer.coalesce(items)))
+        self.assertEqual(0, coalescer.duplicate_count)
+
+    def test_items_without_short_code_keep_their_order(self):
+        coalescer = ItemCoalescer(window_size=10)
+        items = [_item("a", 1), {"update_seq": 2}, {"update_seq": 3}]
+
+        self.assertEqual(items, list(coalescer.coalesce(items)))
+        self.assertEqual(0, coalescer.duplicate_count)
@@ -0,0 +1,77 @@
+import io
+import json
+from unittest import TestCase
+
+from recor_product_getter.libs.services.utils.item_info_parser import ItemInfoParser
+
+
+def _document(items, last_update_seq, last_update_seq_first=False):
+    if last_update_seq_first:
+        document = {"last_update_seq": last_update_seq, "items": items}
+    else:
+        document = {"items": items, "last_update_seq": last_update_seq}
+    return io.BytesIO(json.dumps(document).encode("utf-8"))
+
+
+class TestItemInfoParser(TestCase):
+
+    def setUp(self):
+        self.items = [
+            {"short_code": str(i), "update_seq": i, "category_id": [i, i + 1]}
+            for i in range(1, 6)
+        ]
+
+    def test_items_and_trailing_last_update_seq(self):
+        parser = ItemInfoParser(max_total_items=100)
+        items = list(parser.items(_document(self.items, 42)))
+
+        self.assertEqual(self.items, items)
+        self.assertEqual(5, parser.total_item_count)
+        self.assertEqual(42, parser.last_update_seq)
+
+    def test_leading_last_update_seq(self):
+        parser = ItemInfoParser(max_total_items=100)
+        items = list(parser.items(_document(self.items, "42", True)))
+
+        self.assertEqual(self.items, items)
+        self.assertEqual(42, parser.last_update_seq)
+
+    def test_max_total_items_stops_parsing(self):
+        parser = ItemInfoParser(max_total_items=2)
+        document = _document(self.items, 42).getvalue()
+        # The rest of the document is never read, so it can't fail to parse
+        truncated = document[: document.index(b'{"short_code": "4"') + 5]
+        items = list(parser.items(io.BytesIO(truncated)))
+
+        self.assertEqual(self.items[:2], items)
+        self.assertEqual(2, parser.total_item_count)
+        self.assertTrue(parser.limit_reached)
+        self.assertIsNone(parser.last_update_seq)
+
+    def test_max_total_items_keeps_leading_last_update_seq(self):
+        parser = ItemInfoParser(max_total_items=2)
+        items = list(parser.items(_document(self.items, 42, True)))
+
+        self.assertEqual(self.items[:2], items)
+        self.assertTrue(parser.limit_reached)
+        self.assertEqual(42, parser.last_update_seq)
+
+    def test_max_total_items_not_reached_by_an_exact_count(self):
+        parser = ItemInfoParser(max_total_items=5)
+        items = list(parser.items(_document(self.items, 42)))
+
+        self.assertEqual(self.items, items)
+        self.assertFalse(parser.limit_reached)
+        self.assertEqual(42, parser.last_update_seq)
+
+    def test_missing_last_update_seq(self):
+        parser = ItemInfoParser(max_total_items=100)
+        items = list(parser.items(io.BytesIO(b'{"items": []}')))
+
+        self.assertEqual([], items)
+        self.assertIsNone(parser.last_update_seq)
+
+    def test_invalid_last_update_seq(self):
+        parser = ItemInfoParser(max_total_items=100)
+        with self.assertRaises(ValueError):
+            list(parser.items(_document(self.items, "abc")))
@@ -0,0 +1,70 @@
+"""
+Measures the memory and time of building 10k WooCommerce products with the IML
+item transformer and serializing them into a products/batch request body.
+
+Not collected by pytest. Run from the repository root with:
+
+    PYTHONPATH=layers/RecorLayer/python/lib/python3.9/site-packages \
+        python tests/RecorProductTransformer/benchmarks/benchmark_models.py
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from recor_layer.models.woocommerce import woocommerce_json
+from recor_layer.transformers.iml.iml_item_transformer import ImlItemTransformer
+
+from benchmark_transform_many import build_items
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--categories", type=int, default=500)
+    args = parser.parse_args()
+
+    items = build_items(args.items)
+    context = {
+        ImlItemTransformer.CATEGORY_ID_MAP: {
+            str(i): i for i in range(args.categories)
+        },
+    }
+    transformer = ImlItemTransformer()
+
+    start = time.perf_counter()
+    transformer.transform_many(items, context)
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    products = transformer.transform_many(items, context)
+    model_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{'models':>10}: {len(products)} products in {seconds * 1000:.1f}ms, "
+        f"{model_bytes / len(products):.0f} bytes per product"
+    )
+
+    serializers = {
+        "to_json": lambda: json.dumps(
+            {"create": [product.to_json() for product in products], "update": []},
+            ensure_ascii=False,
+        ).encode("utf-8"),
+        "one-pass": lambda: woocommerce_json.encode_batch(create=products),
+    }
+    for name, serialize in serializers.items():
+        start = time.perf_counter()
+        body = serialize()
+        seconds = time.perf_counter() - start
+        tracemalloc.start()
+        serialize()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"{name:>10}: {len(body)} byte body in {seconds * 1000:.1f}ms, "
+            f"{peak_bytes / len(products):.0f} bytes peak per product"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Compares the allocations and time of transforming IML items one by one, with the
+lookup maps copied into every item, against ImlItemTransformer.transform_many.
+
+Not collected by pytest. Run from the repository root with:
+
+    PYTHONPATH=layers/RecorLayer/python/lib/python3.9/site-packages \
+        python tests/RecorProductTransformer/benchmarks/benchmark_transform_many.py
+"""
+
+import argparse
+import json
+import os
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from recor_layer.transformers.iml.iml_item_transformer import ImlItemTransformer
+
+SAMPLE_ITEM = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.pardir,
+    "unit",
+    "transformers",
+    "iml",
+    "test_files",
+    "test_118748_iml_item.json",
+)
+
+
+def build_items(count: int) -> List[Dict]:
+    with open(SAMPLE_ITEM, "r") as fp:
+        sample_item = json.load(fp)
+    return [{**sample_item, "short_code": str(i)} for i in range(count)]
+
+
+def transform_copies(
+    transformer: ImlItemTransformer, items: List[Dict], context: Dict
+) -> List:
+    return [transformer.transform({**item, **context}) for item in items]
+
+
+def transform_many(
+    transformer: ImlItemTransformer, items: List[Dict], context: Dict
+) -> List:
+    return transformer.transform_many(items, context)
+
+
+def measure(name: str, transform: Callable, items: List[Dict], context: Dict) -> None:
+    transformer = ImlItemTransformer()
+    transform(transformer, items[:10], context)  # Warm up
+
+    start = time.perf_counter()
+    transform(transformer, items, context)
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    snapshot_before = tracemalloc.take_snapshot()
+    products = transform(transformer, items, context)
+    snapshot_after = tracemalloc.take_snapshot()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Largest working set of transforming a single item, copies included
+    tracemalloc.start()
+    for item in items[:1000]:
+        tracemalloc.reset_peak()
+        baseline_bytes, _ = tracemalloc.get_traced_memory()
+        transform(transformer, [item], context)
+        _, item_peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = snapshot_after.compare_to(snapshot_before, "filename")
+    retained_bytes = sum(stat.size_diff for stat in stats)
+    retained_blocks = sum(stat.count_diff for stat in stats)
+    print(
+        f"{name:>16}: {len(products)} products in {seconds * 1000:.1f}ms, "
+        f"{retained_bytes / len(items):.0f} bytes in "
+        f"{retained_blocks / len(items):.1f} blocks retained per item, "
+        f"{peak_bytes / len(items):.0f} bytes peak per item, "
+        f"{item_peak_bytes - baseline_bytes} bytes working set per item"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--categories", type=int, default=500)
+    args = parser.parse_args()
+
+    items = build_items(args.items)
+    context = {
+        ImlItemTransformer.CATEGORY_ID_MAP: {
+            str(i): i for i in range(args.categories)
+        },
+        ImlItemTransformer.PRODUCT_ID_MAP: {str(i): i for i in range(args.items)},
+    }
+    measure("per-item copies", transform_copies, items, context)
+    measure("transform_many", transform_many, items, context)
+
+
+if __name__ == "__main__":
+    main()
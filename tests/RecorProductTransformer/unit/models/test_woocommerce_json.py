@@ -0,0 +1,78 @@
+import dataclasses
+import json
+import unittest
+from decimal import Decimal
+
+from recor_layer.models.woocommerce.woocommerce_category import (
+    WooCommerceCategory,
+    category_reference,
+)
+from recor_layer.models.woocommerce.woocommerce_dimensions import WooCommerceDimensions
+from recor_layer.models.woocommerce.woocommerce_image import WooCommerceImage
+from recor_layer.models.woocommerce.woocommerce_json import encode_batch, json_value
+from recor_layer.models.woocommerce.woocommerce_product import WooCommerceProduct
+
+
+class TestWooCommerceJson(unittest.TestCase):
+    def setUp(self):
+        self.product = WooCommerceProduct(
+            id=Decimal(7),
+            slug="118748",
+            sku="SCHF170JAZ626-ISO",
+            name='+Grade 2 "Dummy" Lever Jazz ü',
+            regular_price=37.0,
+            stock_quantity=3.0,
+            description="Single dummy trim\nfor one side of door.",
+            dimensions=WooCommerceDimensions(length="5.75", width="4.5"),
+            categories=[category_reference(3), category_reference(Decimal(25))],
+            images=[WooCommerceImage(src="https://shop.imlss.com/012704_L.png")],
+        )
+        self.category = WooCommerceCategory(
+            name="Lock Sets",
+            slug="3",
+            parent=1,
+            image=WooCommerceImage(src="https://shop.imlss.com/3.png", name="Lock Sets"),
+        )
+
+    def test_encode_batch_matches_to_json(self):
+        body = encode_batch(
+            create=[self.product, WooCommerceProduct(categories=[], images=[])],
+            update=[self.category],
+            delete=[Decimal(1), 2],
+        )
+
+        self.assertEqual(
+            json.loads(body.decode("utf-8")),
+            {
+                "create": [
+                    self.product.to_json(),
+                    WooCommerceProduct(categories=[], images=[]).to_json(),
+                ],
+                "update": [self.category.to_json()],
+                "delete": [1, 2],
+            },
+        )
+
+    def test_non_finite_numbers_are_rejected(self):
+        for value in (
+            float("nan"),
+            float("inf"),
+            float("-inf"),
+            Decimal("NaN"),
+            Decimal("Infinity"),
+        ):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    json_value(value)
+                with self.assertRaises(ValueError):
+                    encode_batch(create=[WooCommerceProduct(regular_price=value)])
+
+    def test_models_are_slotted_and_frozen(self):
+        for model in (self.product, self.category, self.product.dimensions):
+            self.assertFalse(hasattr(model, "__dict__"))
+            with self.assertRaises(dataclasses.FrozenInstanceError):
+                model.name = "changed"
+
+    def test_category_references_are_shared(self):
+        self.assertIs(category_reference(3), category_reference(3))
+        self.assertEqual(category_reference(3), WooCommerceCategory(id=3))
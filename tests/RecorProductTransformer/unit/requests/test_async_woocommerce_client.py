@@ -0,0 +1,51 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from recor_layer.requests.woocommerce.async_woocommerce_client import (
+    AsyncWooCommerceClient,
+)
+
+
+class FakeWooCommerceClient:
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def get(self, endpoint, params=None):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.02)
+        with self.lock:
+            self.in_flight -= 1
+        return endpoint, params
+
+
+class TestAsyncWooCommerceClient(unittest.TestCase):
+    def test_requests_run_concurrently_up_to_max_concurrency(self):
+        client = FakeWooCommerceClient()
+        async_client = AsyncWooCommerceClient(client, max_concurrency=3)
+
+        async def get_pages():
+            return await asyncio.gather(
+                *(async_client.get("products", {"page": page}) for page in range(10))
+            )
+
+        responses = asyncio.run(get_pages())
+
+        self.assertEqual(responses[4], ("products", {"page": 4}))
+        self.assertEqual(client.max_in_flight, 3)
+
+    def test_client_is_reusable_across_event_loops(self):
+        async_client = AsyncWooCommerceClient(FakeWooCommerceClient(), max_concurrency=1)
+
+        async def get_twice():
+            return await asyncio.gather(
+                async_client.get("products"), async_client.get("products")
+            )
+
+        self.assertEqual(len(asyncio.run(get_twice())), 2)
+        self.assertEqual(len(asyncio.run(get_twice())), 2)
@@ -0,0 +1,30 @@
+import unittest
+
+from recor_layer.requests.http_session import JitteredRetry, session_for
+
+
+class TestHttpSession(unittest.TestCase):
+    def test_session_for_shares_one_session_per_host(self):
+        session = session_for("https://shop.example.com/wp-json/wc/v3/products")
+
+        self.assertIs(session, session_for("https://shop.example.com/other"))
+        self.assertIsNot(session, session_for("https://api.example.com/"))
+        self.assertEqual(len(session.timeout), 2)
+
+    def test_retries_only_idempotent_methods_on_read_and_status(self):
+        retry = session_for("https://shop.example.com").get_adapter(
+            "https://shop.example.com/"
+        ).max_retries
+
+        self.assertIsInstance(retry, JitteredRetry)
+        self.assertTrue(retry.is_retry("GET", 503))
+        self.assertFalse(retry.is_retry("POST", 503))
+
+    def test_backoff_is_jittered_below_the_exponential_delay(self):
+        retry = JitteredRetry(total=5, backoff_factor=1).increment("GET", "/")
+        retry = retry.increment("GET", "/").increment("GET", "/")
+
+        delays = {retry.get_backoff_time() for _ in range(20)}
+
+        self.assertTrue(all(0 <= delay <= 4 for delay in delays))
+        self.assertGreater(len(delays), 1)
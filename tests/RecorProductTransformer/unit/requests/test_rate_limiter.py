@@ -0,0 +1,61 @@
+import unittest
+
+from recor_layer.requests.rate_limiter import (
+    RATE_DECREASE_FACTOR,
+    AdaptiveRateLimiter,
+    parse_retry_after,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.waits = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.waits.append(seconds)
+
+
+class TestAdaptiveRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.limiter = AdaptiveRateLimiter(
+            initial_rate=10,
+            min_rate=1,
+            max_rate=11,
+            burst=2,
+            clock=self.clock,
+            sleep=self.clock.sleep,
+        )
+
+    def test_requests_beyond_the_burst_wait_in_line(self):
+        waits = [self.limiter.acquire() for _ in range(4)]
+
+        self.assertEqual(waits[:2], [0.0, 0.0])
+        self.assertAlmostEqual(waits[2], 0.1)
+        self.assertAlmostEqual(waits[3], 0.2)
+
+    def test_throttling_halves_the_rate_once_per_burst_and_healthy_ramps_up(self):
+        self.limiter.on_response(throttled=True)
+        self.limiter.on_response(throttled=True)
+        self.assertEqual(self.limiter.rate, 10 * RATE_DECREASE_FACTOR)
+
+        for _ in range(100):
+            self.limiter.on_response(throttled=False)
+        self.assertEqual(self.limiter.rate, 11)
+
+    def test_retry_after_blocks_every_request(self):
+        self.limiter.on_response(throttled=True, retry_after=3)
+
+        self.assertAlmostEqual(self.limiter.acquire(), 3.2)
+        self.assertEqual(self.limiter.counters["throttled"], 1)
+
+    def test_parse_retry_after_seconds_and_http_date(self):
+        self.assertEqual(parse_retry_after("7", now=0), 7)
+        self.assertEqual(
+            parse_retry_after("Thu, 01 Jan 1970 00:00:30 GMT", now=10), 20
+        )
+        self.assertIsNone(parse_retry_after("soon", now=0))
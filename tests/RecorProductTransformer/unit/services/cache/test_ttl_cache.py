@@ -0,0 +1,60 @@
+import unittest
+
+from recor_layer.services.cache.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.loads = []
+        self.cache = TTLCache(
+            max_size=3, ttl_seconds=10, negative_ttl_seconds=2, clock=self.clock
+        )
+
+    def load(self, keys):
+        self.loads.append(set(keys))
+        return {key: int(key) * 10 for key in keys if key != "404"}
+
+    def test_get_or_load_caches_found_and_missing_keys(self):
+        self.assertEqual(self.cache.get_or_load({"1", "404"}, self.load), {"1": 10})
+        self.assertEqual(self.cache.get_or_load({"1", "404"}, self.load), {"1": 10})
+
+        self.assertEqual(self.loads, [{"1", "404"}])
+        self.assertEqual(self.cache.counters["hits"], 1)
+        self.assertEqual(self.cache.counters["negative_hits"], 1)
+
+    def test_entries_expire_after_their_ttl(self):
+        self.cache.get_or_load({"1", "404"}, self.load)
+
+        self.clock.now = 5
+        self.cache.get_or_load({"1", "404"}, self.load)
+        self.clock.now = 11
+        self.cache.get_or_load({"1"}, self.load)
+
+        self.assertEqual(self.loads, [{"1", "404"}, {"404"}, {"1"}])
+
+    def test_least_recently_used_entries_are_evicted(self):
+        self.cache.put_many({"1": 10, "2": 20, "3": 30})
+        self.cache.get_many(["1"])
+        self.cache.put_many({"4": 40})
+
+        found, uncached = self.cache.get_many(["1", "2", "3", "4"])
+
+        self.assertEqual(found, {"1": 10, "3": 30, "4": 40})
+        self.assertEqual(uncached, {"2"})
+
+    def test_invalidate(self):
+        self.cache.put_many({"1": 10, "2": 20})
+        self.cache.invalidate(["1"])
+        self.assertEqual(self.cache.get_many(["1", "2"]), ({"2": 20}, {"1"}))
+
+        self.cache.invalidate()
+        self.assertEqual(len(self.cache), 0)
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+
+from recor_layer.services.aws.dynamodb.category_snapshot import (
+    CategorySnapshot,
+    CategorySnapshotStore,
+    write_snapshot,
+)
+
+
+class FakeDynamoDBService:
+    def __init__(self):
+        self.version = 1
+        self.version_reads = 0
+        self.scans = 0
+
+    def get_item(self, table_name, key):
+        self.version_reads += 1
+        return {"counter": self.version}
+
+    def scan_items(self, table_name, attributes=None):
+        self.scans += 1
+        return [{"category_id": "3", "woocommerce_category_id": 30 + self.version}]
+
+
+class TestCategorySnapshot(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "category-snapshot-3.bin")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_write_and_read_snapshot(self):
+        category_id_map = {str(i): i * 10 for i in range(1000)}
+        category_id_map["ünïcode"] = 7
+        category_id_map["unmapped"] = None
+        write_snapshot(self.path, 3, category_id_map)
+
+        snapshot = CategorySnapshot(self.path)
+        try:
+            self.assertEqual(snapshot.version, 3)
+            self.assertEqual(len(snapshot), 1001)
+            self.assertEqual(snapshot.get("999"), 9990)
+            self.assertEqual(snapshot.get("ünïcode"), 7)
+            self.assertIsNone(snapshot.get("unmapped"))
+            self.assertIsNone(snapshot.get("1000"))
+            self.assertEqual(
+                snapshot.get_many({"0", "42", "missing"}), {"0": 0, "42": 420}
+            )
+        finally:
+            snapshot.close()
+
+    def test_empty_snapshot(self):
+        write_snapshot(self.path, 0, {})
+
+        snapshot = CategorySnapshot(self.path)
+        try:
+            self.assertEqual(len(snapshot), 0)
+            self.assertIsNone(snapshot.get("1"))
+        finally:
+            snapshot.close()
+
+
+class TestCategorySnapshotStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.dynamodb_service = FakeDynamoDBService()
+        self.now = 0.0
+
+    def _store(self, version_ttl_seconds):
+        return CategorySnapshotStore(
+            self.dynamodb_service,
+            self.directory.name,
+            version_ttl_seconds=version_ttl_seconds,
+            clock=lambda: self.now,
+        )
+
+    def test_version_is_checked_once_per_ttl(self):
+        store = self._store(version_ttl_seconds=60)
+
+        self.assertEqual(31, store.load().get("3"))
+        self.now = 59
+        self.dynamodb_service.version = 2
+        self.assertEqual(31, store.load().get("3"))
+        self.assertEqual(1, self.dynamodb_service.version_reads)
+
+        self.now = 60
+        self.assertEqual(32, store.load().get("3"))
+        self.assertEqual(2, self.dynamodb_service.version_reads)
+        self.assertEqual(2, self.dynamodb_service.scans)
+
+    def test_version_is_checked_on_every_load_by_default(self):
+        store = self._store(version_ttl_seconds=0)
+
+        store.load()
+        store.load()
+
+        self.assertEqual(2, self.dynamodb_service.version_reads)
+        self.assertEqual(1, self.dynamodb_service.scans)
@@ -0,0 +1,80 @@
+import threading
+import unittest
+from unittest import mock
+
+from recor_layer.services.aws.dynamodb.dynamodb_service import (
+    MAX_BATCH_GET_KEYS,
+    MAX_BATCH_WRITE_ITEMS,
+    DynamoDBService,
+)
+
+
+class FlakyBatchClient:
+    """Leaves the last key or item of every first request unprocessed."""
+
+    def __init__(self):
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def batch_get_item(self, RequestItems):
+        with self.lock:
+            self.requests.append(RequestItems)
+        request = RequestItems["table"]
+        keys = request["Keys"]
+        response = {"Responses": {"table": [dict(key) for key in keys]}}
+        if len(keys) > 1:
+            response["Responses"]["table"].pop()
+            response["UnprocessedKeys"] = {"table": {**request, "Keys": keys[-1:]}}
+        return response
+
+    def batch_write_item(self, RequestItems):
+        with self.lock:
+            self.requests.append(RequestItems)
+        requests = RequestItems["table"]
+        if len(requests) > 1:
+            return {"UnprocessedItems": {"table": requests[-1:]}}
+        return {}
+
+
+class TestDynamoDBService(unittest.TestCase):
+    def setUp(self):
+        self.service = DynamoDBService()
+        self.service.client = FlakyBatchClient()
+
+    @mock.patch("recor_layer.services.aws.dynamodb.dynamodb_service.time.sleep")
+    def test_get_batch_items_chunks_and_retries_unprocessed_keys(self, sleep):
+        keys = [{"item_id": str(i)} for i in range(250)] + [{"item_id": "0"}]
+
+        items = self.service.get_batch_items(
+            "table", keys, attributes=("item_id", "counter")
+        )
+
+        self.assertEqual(sorted(item["item_id"] for item in items), sorted(str(i) for i in range(250)))
+        self.assertTrue(
+            all(
+                len(request["table"]["Keys"]) <= MAX_BATCH_GET_KEYS
+                and request["table"]["ProjectionExpression"] == "#a0, #a1"
+                for request in self.service.client.requests
+            )
+        )
+        self.assertEqual(self.service.batch_counters["get_retries"], 3)
+
+    @mock.patch("recor_layer.services.aws.dynamodb.dynamodb_service.time.sleep")
+    def test_put_batch_items_chunks_and_retries_unprocessed_items(self, sleep):
+        items = [{"item_id": str(i), "woocommerce_product_id": i} for i in range(60)]
+
+        self.service.put_batch_items("table", items, key_names=("item_id",))
+
+        written = [
+            request["PutRequest"]["Item"]["item_id"]
+            for request_items in self.service.client.requests
+            for request in request_items["table"]
+        ]
+        self.assertTrue(
+            all(
+                len(request_items["table"]) <= MAX_BATCH_WRITE_ITEMS
+                for request_items in self.service.client.requests
+            )
+        )
+        self.assertEqual(len(written), 63)
+        self.assertEqual(self.service.batch_counters["write_items"], 60)
@@ -0,0 +1,127 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from recor_layer.services.aws.sqs.claim_check import (
+    CLAIM_CHECK_CODEC,
+    FileClaimCheckStore,
+    S3ClaimCheckStore,
+    check_in,
+    get_claim_check_store,
+)
+from recor_layer.services.aws.sqs.message_codec import CODEC_ATTRIBUTE, get_codec
+from recor_layer.services.aws.sqs.sqs_records import (
+    decode_sqs_record,
+    process_sqs_records,
+    release_sqs_record,
+)
+
+
+def _claim_check_record(message_id, pointer_body):
+    return {
+        "messageId": message_id,
+        "body": pointer_body,
+        "messageAttributes": {
+            CODEC_ATTRIBUTE: {"stringValue": CLAIM_CHECK_CODEC, "dataType": "String"}
+        },
+    }
+
+
+def _pointer(url, codec_name="json/1"):
+    return json.dumps({"url": url, "codec": codec_name})
+
+
+class TestFileClaimCheck(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.root.name, "claim-check")
+        self.store_url = f"file://{self.directory}"
+        environ = mock.patch.dict("os.environ", {"CLAIM_CHECK_URL": self.store_url})
+        environ.start()
+        self.addCleanup(environ.stop)
+        self.store = get_claim_check_store(self.store_url)
+
+        # A file the role can reach, but which is not a claim-check payload
+        self.victim_path = os.path.join(self.root.name, "victim.msg")
+        with open(self.victim_path, "w") as fp:
+            fp.write(json.dumps([{"short_code": "victim"}]))
+
+    def tearDown(self):
+        self.root.cleanup()
+
+    def test_round_trip(self):
+        items = [{"short_code": str(i), "update_seq": i} for i in range(3)]
+        codec = get_codec("json/1")
+        pointer_body, attributes = check_in(
+            self.store, codec.encode(json.dumps(items), items), codec.name
+        )
+        record = _claim_check_record("1", pointer_body)
+        url = json.loads(pointer_body)["url"]
+
+        self.assertIsInstance(self.store, FileClaimCheckStore)
+        self.assertEqual(attributes[CODEC_ATTRIBUTE]["StringValue"], CLAIM_CHECK_CODEC)
+        self.assertTrue(os.path.exists(url[len("file://") :]))
+        self.assertEqual(decode_sqs_record(record), items)
+
+        release_sqs_record(record)
+
+        self.assertFalse(os.path.exists(url[len("file://") :]))
+
+    def test_rejects_pointers_outside_the_store(self):
+        urls = [
+            f"file://{self.victim_path}",
+            f"file://{self.directory}/../victim.msg",
+            f"file://{self.directory}/nested/payload.msg",
+            f"file://{self.directory}/.msg",
+            f"file://{self.directory}",
+            f"s3://bucket/claim-check/{os.path.basename(self.victim_path)}",
+            "https://example.com/payload.msg",
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                record = _claim_check_record("1", _pointer(url))
+                with self.assertRaises(ValueError):
+                    decode_sqs_record(record)
+                with self.assertRaises(ValueError):
+                    release_sqs_record(record)
+        self.assertTrue(os.path.exists(self.victim_path))
+
+    def test_rejected_pointer_fails_only_its_record(self):
+        processed = []
+        records = [
+            _claim_check_record("1", _pointer(f"file://{self.victim_path}")),
+            {"messageId": "2", "body": json.dumps([{"short_code": "2"}])},
+        ]
+
+        failures = process_sqs_records(records, processed.extend)
+
+        self.assertEqual(failures, [{"itemIdentifier": "1"}])
+        self.assertEqual(processed, [{"short_code": "2"}])
+        self.assertTrue(os.path.exists(self.victim_path))
+
+    def test_claim_check_without_a_configured_store(self):
+        record = _claim_check_record("1", _pointer(f"file://{self.victim_path}"))
+
+        with mock.patch.dict("os.environ", {"CLAIM_CHECK_URL": ""}):
+            with self.assertRaises(ValueError):
+                decode_sqs_record(record)
+
+
+class TestS3ClaimCheckStore(unittest.TestCase):
+    def test_owns_only_payloads_under_its_bucket_and_prefix(self):
+        with mock.patch("recor_layer.services.aws.s3.s3_service.boto3.client"):
+            store = S3ClaimCheckStore("claims", "claim-check/")
+
+        self.assertTrue(store.owns("s3://claims/claim-check/0123abcd.msg"))
+        for url in (
+            "s3://other/claim-check/0123abcd.msg",
+            "s3://claims/0123abcd.msg",
+            "s3://claims/claim-check/nested/0123abcd.msg",
+            "s3://claims/claim-check/0123abcd.json",
+            "s3://claims/claim-check/.msg",
+            "file:///claims/claim-check/0123abcd.msg",
+        ):
+            with self.subTest(url=url):
+                self.assertFalse(store.owns(url))
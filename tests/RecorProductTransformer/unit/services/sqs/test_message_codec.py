@@ -0,0 +1,76 @@
+import json
+from unittest import TestCase
+
+from recor_layer.services.aws.sqs.message_codec import (
+    CODECS,
+    encode_messages,
+    get_codec,
+)
+from recor_layer.services.aws.sqs.sqs_records import decode_sqs_record
+from recor_layer.services.aws.sqs.sqs_service import pack_json_messages
+
+
+class TestMessageCodec(TestCase):
+
+    def setUp(self):
+        self.items = [
+            {
+                "short_code": str(i),
+                "update_seq": 18432754652 + i,
+                "extended_desc": "Single dummy trim for one side of door. " * 20,
+                "category_id": [3, 4, 5, 25, 10],
+            }
+            for i in range(50)
+        ]
+
+    def test_round_trip(self):
+        for codec in CODECS.values():
+            with self.subTest(codec=codec.name):
+                body = codec.encode(json.dumps(self.items), self.items)
+                self.assertEqual(self.items, codec.decode(body))
+
+    def test_decode_record_without_codec_attribute(self):
+        record = {"body": json.dumps(self.items), "messageAttributes": {}}
+        self.assertEqual(self.items, decode_sqs_record(record))
+
+    def test_decode_record_with_codec_attribute(self):
+        codec = get_codec("gzip-json/1")
+        record = {
+            "body": codec.encode(json.dumps(self.items), self.items),
+            "messageAttributes": {
+                "codec": {"stringValue": "gzip-json/1", "dataType": "String"}
+            },
+        }
+        self.assertEqual(self.items, decode_sqs_record(record))
+
+    def test_encode_messages_splits_oversized_messages(self):
+        codec = get_codec("json/1")
+        messages = list(
+            encode_messages(codec, [(json.dumps(self.items), self.items)], 20000)
+        )
+
+        self.assertGreater(len(messages), 1)
+        self.assertTrue(all(len(body) <= 20000 for body, _ in messages))
+        self.assertEqual(
+            self.items, [item for body, _ in messages for item in codec.decode(body)]
+        )
+
+    def test_compressed_messages_hold_more_items(self):
+        json_messages = list(pack_json_messages(self.items, max_message_bytes=20000))
+        gzip_codec = get_codec("gzip-json/1")
+        gzip_messages = list(
+            encode_messages(
+                gzip_codec,
+                pack_json_messages(
+                    self.items,
+                    max_message_bytes=int(20000 * gzip_codec.packing_ratio),
+                ),
+                20000,
+            )
+        )
+
+        self.assertLess(len(gzip_messages), len(json_messages))
+
+    def test_unknown_codec(self):
+        with self.assertRaises(ValueError):
+            get_codec("zstd/1")
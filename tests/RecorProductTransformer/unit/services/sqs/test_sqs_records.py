@@ -0,0 +1,130 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from recor_layer.services.aws.sqs.claim_check import (
+    CLAIM_CHECK_CODEC,
+    check_in,
+    get_claim_check_store,
+)
+from recor_layer.services.aws.sqs.message_codec import CODEC_ATTRIBUTE
+from recor_layer.services.aws.sqs.sqs_records import process_sqs_records
+
+
+def _record(message_id, items, message_group_id=None):
+    record = {"messageId": message_id, "body": json.dumps(items)}
+    if message_group_id is not None:
+        record["attributes"] = {"MessageGroupId": message_group_id}
+    return record
+
+
+class TestProcessSqsRecords(unittest.TestCase):
+    def test_no_failures_processes_each_record_once(self):
+        calls = []
+        records = [_record("1", [{"short_code": 1}]), _record("2", [{"short_code": 2}])]
+
+        failures = process_sqs_records(records, calls.append)
+
+        self.assertEqual(failures, [])
+        self.assertEqual(calls, [[{"short_code": 1}], [{"short_code": 2}]])
+
+    def test_only_failing_records_are_reported(self):
+        calls = []
+
+        def process_items(items):
+            calls.append(items)
+            if any(item.get("poison") for item in items):
+                raise ValueError("poison item")
+
+        records = [
+            _record("1", [{"short_code": 1}]),
+            _record("2", [{"short_code": 2, "poison": True}]),
+            {"messageId": "3", "body": "not json"},
+            _record("4", [{"short_code": 4}]),
+        ]
+
+        failures = process_sqs_records(records, process_items)
+
+        self.assertEqual(failures, [{"itemIdentifier": "2"}, {"itemIdentifier": "3"}])
+        # The healthy records are not processed again because of the poison one
+        self.assertEqual(calls.count([{"short_code": 1}]), 1)
+        self.assertEqual(calls.count([{"short_code": 4}]), 1)
+
+    def test_fifo_group_stops_after_failure(self):
+        processed = []
+
+        def process_items(items):
+            if any(item.get("poison") for item in items):
+                raise ValueError("poison item")
+            processed.extend(item["short_code"] for item in items)
+
+        records = [
+            _record("1", [{"short_code": 1, "poison": True}], "partition-0"),
+            _record("2", [{"short_code": 2}], "partition-0"),
+            _record("3", [{"short_code": 3}], "partition-1"),
+        ]
+
+        failures = process_sqs_records(records, process_items)
+
+        self.assertEqual(failures, [{"itemIdentifier": "1"}, {"itemIdentifier": "2"}])
+        self.assertEqual(processed, [3])
+
+    def test_fifo_group_stops_after_a_decoding_failure(self):
+        processed = []
+        records = [
+            _record("1", [{"short_code": 1}], "partition-0"),
+            {
+                "messageId": "2",
+                "body": "not json",
+                "attributes": {"MessageGroupId": "partition-1"},
+            },
+            _record("3", [{"short_code": 3}], "partition-1"),
+            _record("4", [{"short_code": 4}], "partition-0"),
+        ]
+
+        failures = process_sqs_records(records, processed.extend)
+
+        self.assertEqual(failures, [{"itemIdentifier": "2"}, {"itemIdentifier": "3"}])
+        self.assertEqual(processed, [{"short_code": 1}, {"short_code": 4}])
+
+
+class TestClaimCheckRelease(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        store_url = f"file://{self.directory.name}"
+        environ = mock.patch.dict("os.environ", {"CLAIM_CHECK_URL": store_url})
+        environ.start()
+        self.addCleanup(environ.stop)
+        self.store = get_claim_check_store(store_url)
+
+    def _claim_check_record(self, message_id, items):
+        pointer_body, _ = check_in(self.store, json.dumps(items), "json/1")
+        path = json.loads(pointer_body)["url"][len("file://") :]
+        record = {
+            "messageId": message_id,
+            "body": pointer_body,
+            "messageAttributes": {CODEC_ATTRIBUTE: {"stringValue": CLAIM_CHECK_CODEC}},
+        }
+        return record, path
+
+    def test_only_successful_payloads_are_released(self):
+        def process_items(items):
+            if any(item.get("poison") for item in items):
+                raise ValueError("poison item")
+
+        healthy_record, healthy_path = self._claim_check_record(
+            "1", [{"short_code": 1}]
+        )
+        poison_record, poison_path = self._claim_check_record(
+            "2", [{"short_code": 2, "poison": True}]
+        )
+
+        failures = process_sqs_records([healthy_record, poison_record], process_items)
+
+        self.assertEqual(failures, [{"itemIdentifier": "2"}])
+        self.assertFalse(os.path.exists(healthy_path))
+        # Kept for the redelivery of the failed record
+        self.assertTrue(os.path.exists(poison_path))
@@ -0,0 +1,200 @@
+import json
+import unittest
+from unittest import mock
+
+from recor_layer.services.aws.sqs.sqs_service import (
+    MAX_BATCH_BYTES,
+    MAX_BATCH_ENTRIES,
+    SQSService,
+    message_group_partition,
+    pack_json_messages,
+)
+
+
+class StubSQSClient:
+    """Records SendMessageBatch calls and fails the entries it is told to, once."""
+
+    def __init__(self, fail_once=(), sender_fault=False):
+        self.calls = []
+        self.fail_once = set(fail_once)
+        self.sender_fault = sender_fault
+
+    def send_message_batch(self, QueueUrl, Entries):
+        self.calls.append([dict(entry) for entry in Entries])
+        successful = []
+        failed = []
+        for entry in Entries:
+            if entry["MessageBody"] in self.fail_once:
+                self.fail_once.discard(entry["MessageBody"])
+                failed.append({"Id": entry["Id"], "SenderFault": self.sender_fault})
+            else:
+                successful.append({"Id": entry["Id"]})
+        return {"Successful": successful, "Failed": failed}
+
+
+def _sqs_service(queue_url, client):
+    with mock.patch("recor_layer.services.aws.sqs.sqs_service.boto3.client"):
+        service = SQSService(queue_url)
+    service.sqs_client = client
+    return service
+
+
+class TestPackJsonMessages(unittest.TestCase):
+    def test_packs_items_by_serialized_size(self):
+        items = [{"short_code": str(i), "padding": "x" * 40} for i in range(20)]
+
+        messages = list(pack_json_messages(items, max_message_bytes=200))
+
+        self.assertEqual([item for _, packed in messages for item in packed], items)
+        for body, packed in messages:
+            self.assertLessEqual(len(body.encode("utf-8")), 200)
+            self.assertEqual(json.loads(body), packed)
+
+    def test_max_message_items(self):
+        messages = list(pack_json_messages([{"i": i} for i in range(7)], 1000, 3))
+
+        self.assertEqual([len(packed) for _, packed in messages], [3, 3, 1])
+
+    def test_item_larger_than_a_message(self):
+        with self.assertRaises(ValueError):
+            list(pack_json_messages([{"padding": "x" * 100}], max_message_bytes=50))
+
+
+class TestMessageGroupPartition(unittest.TestCase):
+    def test_partitions_are_stable_and_in_range(self):
+        partitions = [message_group_partition(str(i), 8) for i in range(1000)]
+
+        self.assertTrue(all(0 <= partition < 8 for partition in partitions))
+        self.assertEqual(set(range(8)), set(partitions))
+        # crc32 is the same in every process, unlike the salted hash()
+        self.assertEqual(7, message_group_partition("118748", 8))
+
+    def test_single_partition(self):
+        self.assertEqual(0, message_group_partition("118748", 1))
+
+
+class TestSQSService(unittest.TestCase):
+    queue_url = "https://sqs.us-east-1.amazonaws.com/123456789012/items"
+
+    def test_groups_batches_by_entry_count(self):
+        client = StubSQSClient()
+        service = _sqs_service(self.queue_url, client)
+
+        successful = service.send_message_batch([f"body-{i}" for i in range(25)])
+
+        self.assertEqual(len(successful), 25)
+        self.assertEqual([len(entries) for entries in client.calls], [10, 10, 5])
+        self.assertEqual(
+            [entry["MessageBody"] for entries in client.calls for entry in entries],
+            [f"body-{i}" for i in range(25)],
+        )
+        self.assertTrue(
+            all(len(entries) <= MAX_BATCH_ENTRIES for entries in client.calls)
+        )
+
+    def test_groups_batches_by_payload_size(self):
+        client = StubSQSClient()
+        service = _sqs_service(self.queue_url, client)
+        attributes = {"codec": {"DataType": "String", "StringValue": "json/1"}}
+        message_bodies = [str(i) * (100 * 1024) for i in range(5)]
+
+        service.send_message_batch(message_bodies, attributes)
+
+        self.assertEqual([len(entries) for entries in client.calls], [2, 2, 1])
+        for entries in client.calls:
+            self.assertLessEqual(
+                sum(len(entry["MessageBody"]) for entry in entries), MAX_BATCH_BYTES
+            )
+            self.assertTrue(
+                all(entry["MessageAttributes"] == attributes for entry in entries)
+            )
+
+    @mock.patch("recor_layer.services.aws.sqs.sqs_service.time.sleep")
+    def test_retries_only_failed_entries(self, sleep):
+        client = StubSQSClient(fail_once={"body-3", "body-7"})
+        service = _sqs_service(self.queue_url, client)
+
+        successful = service.send_message_batch([f"body-{i}" for i in range(10)])
+
+        self.assertEqual(len(successful), 10)
+        self.assertEqual(len(client.calls), 2)
+        self.assertEqual(
+            [entry["MessageBody"] for entry in client.calls[1]], ["body-3", "body-7"]
+        )
+        sleep.assert_called_once()
+
+    @mock.patch("recor_layer.services.aws.sqs.sqs_service.time.sleep")
+    def test_sender_faults_are_not_retried(self, sleep):
+        client = StubSQSClient(fail_once={"body-1"}, sender_fault=True)
+        service = _sqs_service(self.queue_url, client)
+
+        with self.assertRaises(RuntimeError):
+            service.send_message_batch(["body-0", "body-1"])
+        self.assertEqual(len(client.calls), 1)
+
+
+class TestFifoSQSService(unittest.TestCase):
+    queue_url = "https://sqs.us-east-1.amazonaws.com/123456789012/items.fifo"
+
+    def test_message_group_id_is_set_on_every_entry(self):
+        client = StubSQSClient()
+        service = _sqs_service(self.queue_url, client)
+
+        service.send_message_batch(["body-0", "body-1"], None, "partition-3")
+
+        self.assertEqual(
+            ["partition-3", "partition-3"],
+            [entry["MessageGroupId"] for entry in client.calls[0]],
+        )
+
+    def test_standard_queue_has_no_message_group_id(self):
+        client = StubSQSClient()
+        service = _sqs_service(TestSQSService.queue_url, client)
+
+        service.send_message_batch(["body-0"], message_group_id="partition-3")
+
+        self.assertNotIn("MessageGroupId", client.calls[0][0])
+
+    def test_message_group_is_required(self):
+        service = _sqs_service(self.queue_url, StubSQSClient())
+
+        with self.assertRaises(ValueError):
+            service.send_message_batch(["body-0"])
+
+    def test_send_messages_keeps_per_message_attributes_in_order(self):
+        client = StubSQSClient()
+        service = _sqs_service(self.queue_url, client)
+        pointer = {"codec": {"DataType": "String", "StringValue": "claim-check/1"}}
+        inline = {"codec": {"DataType": "String", "StringValue": "json/1"}}
+
+        service.send_messages(
+            [("inline-0", inline), ("pointer-1", pointer), ("inline-2", inline)],
+            "partition-0",
+        )
+
+        self.assertEqual(
+            [("inline-0", inline), ("pointer-1", pointer), ("inline-2", inline)],
+            [
+                (entry["MessageBody"], entry["MessageAttributes"])
+                for entry in client.calls[0]
+            ],
+        )
+
+    @mock.patch("recor_layer.services.aws.sqs.sqs_service.time.sleep")
+    def test_partial_failure_resends_the_rest_of_the_group(self, sleep):
+        client = StubSQSClient(fail_once={"body-3", "body-6"})
+        service = _sqs_service(self.queue_url, client)
+
+        successful = service.send_message_batch(
+            [f"body-{i}" for i in range(10)], message_group_id="partition-0"
+        )
+
+        self.assertEqual(
+            [f"body-{i}" for i in range(3, 10)],
+            [entry["MessageBody"] for entry in client.calls[1]],
+        )
+        self.assertEqual(2, len(client.calls))
+        self.assertEqual(
+            sorted(str(i) for i in range(10)),
+            sorted(entry["Id"] for entry in successful),
+        )
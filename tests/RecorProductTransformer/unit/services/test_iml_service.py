@@ -0,0 +1,20 @@
+import unittest
+from unittest import mock
+
+from recor_layer.requests.iml.iml_get_category_list_request import (
+    ImlGetCategoryListRequest,
+)
+from recor_layer.services.iml.iml_service import ImlService
+
+
+class TestImlService(unittest.TestCase):
+    def test_get_category_list_runs_the_request(self):
+        categories = [{"category_id": 1, "parent_id": -1}]
+        with mock.patch.object(
+            ImlGetCategoryListRequest, "run", autospec=True, return_value=categories
+        ) as run:
+            service = ImlService()
+
+            self.assertEqual(categories, service.get_category_list())
+
+        run.assert_called_once_with(service.get_category_list_request)
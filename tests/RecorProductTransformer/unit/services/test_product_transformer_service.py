@@ -0,0 +1,199 @@
+import unittest
+from unittest import mock
+
+from recor_layer.services.aws.dynamodb.dynamodb_service import DynamoDBService
+from recor_layer.services.iml.iml_service import ImlService
+from recor_layer.services.woocommerce.woocommerce_service import WooCommerceService
+from recor_product_transformer.libs.services import product_transformer_service
+from recor_product_transformer.libs.services.product_transformer_service import (
+    ProductTransformerService,
+)
+
+
+class FakeDynamoDBService:
+    def __init__(self, item_id_map):
+        self.item_id_map = item_id_map
+        self.deleted_keys = []
+        self.put_items = []
+
+    def get_batch_items(self, table_name, keys, attributes=None):
+        return [
+            {"item_id": item_id, "woocommerce_product_id": self.item_id_map[item_id]}
+            for item_id in (key["item_id"] for key in keys)
+            if item_id in self.item_id_map
+        ]
+
+    def delete_batch_items(self, table_name, keys):
+        self.deleted_keys.extend(keys)
+
+    def put_batch_items(self, table_name, items, key_names=None):
+        self.put_items.extend(items)
+
+    def batch_summary(self):
+        return ""
+
+
+class FakeWooCommerceService:
+    def __init__(self, failed_delete_ids=()):
+        self.failed_delete_ids = set(failed_delete_ids)
+        self.calls = []
+
+    def batch_update_products(self, new_products, old_products, delete_product_ids):
+        self.calls.append((new_products, old_products, delete_product_ids))
+        return {
+            "create": [
+                {"id": 1000 + i, "slug": product.slug}
+                for i, product in enumerate(new_products)
+            ],
+            "update": [{"id": product.id} for product in old_products],
+            "delete": [
+                {"id": product_id, "error": {"code": "woocommerce_rest_invalid_id"}}
+                if product_id in self.failed_delete_ids
+                else {"id": product_id}
+                for product_id in delete_product_ids
+            ],
+        }
+
+
+def _product(short_code, update_seq, deleted=False, category_ids=()):
+    product = {
+        "short_code": short_code,
+        "update_seq": update_seq,
+        "category_id": list(category_ids),
+    }
+    if deleted:
+        product["deleted"] = True
+    return product
+
+
+def _category_ids(product):
+    return [category.id for category in product.categories]
+
+
+class TestProductTransformerService(unittest.TestCase):
+    def setUp(self):
+        product_transformer_service._category_ancestor_index = None
+
+    def _service(self, item_id_map, failed_delete_ids=(), category_id_map=None, **env):
+        self.dynamodb_service = FakeDynamoDBService(item_id_map)
+        self.woocommerce_service = FakeWooCommerceService(failed_delete_ids)
+        self.iml_service = mock.create_autospec(ImlService, instance=True)
+        self.iml_service.get_category_list.return_value = [
+            {"category_id": 1, "parent_id": -1},
+            {"category_id": 2, "parent_id": 1},
+            {"category_id": 3, "parent_id": 2},
+        ]
+        instances = {
+            DynamoDBService: self.dynamodb_service,
+            WooCommerceService: self.woocommerce_service,
+            ImlService: self.iml_service,
+        }
+        registry = mock.Mock(get=lambda factory, *args: instances[factory])
+        with mock.patch.object(
+            product_transformer_service, "registry", registry
+        ), mock.patch.dict("os.environ", env):
+            service = ProductTransformerService()
+        category_id_map = category_id_map or {}
+        self.category_lookups = []
+
+        def fetch_existing_iml_category_map(category_ids):
+            self.category_lookups.append(category_ids)
+            return {
+                category_id: category_id_map[category_id]
+                for category_id in category_ids
+                if category_id in category_id_map
+            }
+
+        service._fetch_existing_iml_category_map = fetch_existing_iml_category_map
+        return service
+
+    def test_unmapped_deleted_items_are_skipped(self):
+        service = self._service({})
+
+        service.run([_product("1", 5, deleted=True)])
+
+        ((new_products, old_products, delete_product_ids),) = (
+            self.woocommerce_service.calls
+        )
+        self.assertEqual(([], [], []), (new_products, old_products, delete_product_ids))
+        self.assertEqual([], self.dynamodb_service.deleted_keys)
+
+    def test_mappings_are_removed_only_after_a_confirmed_delete(self):
+        service = self._service({"1": 10, "2": 20, "3": 30}, failed_delete_ids={20})
+
+        service.run(
+            [
+                _product("1", 5, deleted=True),
+                _product("2", 6, deleted=True),
+                _product("3", 7),
+            ]
+        )
+
+        ((new_products, old_products, delete_product_ids),) = (
+            self.woocommerce_service.calls
+        )
+        self.assertEqual([], new_products)
+        self.assertEqual([30], [product.id for product in old_products])
+        self.assertEqual([10, 20], sorted(delete_product_ids))
+        self.assertEqual([{"item_id": "1"}], self.dynamodb_service.deleted_keys)
+
+    def test_keeps_only_the_newest_update_seq_of_each_item(self):
+        service = self._service({"1": 10, "2": 20})
+
+        service.run(
+            [
+                _product("1", 7),
+                _product("1", 5, deleted=True),  # Older than the update
+                _product("2", 6),
+                _product("2", 8, deleted=True),  # Newer than the update
+                _product("3", 1),
+                _product("3", 2),
+            ]
+        )
+
+        ((new_products, old_products, delete_product_ids),) = (
+            self.woocommerce_service.calls
+        )
+        self.assertEqual(["3"], [product.slug for product in new_products])
+        self.assertEqual([10], [product.id for product in old_products])
+        self.assertEqual([20], delete_product_ids)
+        self.assertEqual([{"item_id": "2"}], self.dynamodb_service.deleted_keys)
+        self.assertEqual(
+            [{"item_id": "3", "woocommerce_product_id": 1000}],
+            self.dynamodb_service.put_items,
+        )
+
+    def test_categories_are_not_expanded_by_default(self):
+        service = self._service({}, category_id_map={"1": 100, "2": 200, "3": 300})
+
+        service.run([_product("1", 1, category_ids=[3])])
+
+        ((new_products, _, _),) = self.woocommerce_service.calls
+        self.assertEqual([300], _category_ids(new_products[0]))
+        self.assertEqual([{"3"}], self.category_lookups)
+        self.iml_service.get_category_list.assert_not_called()
+
+    def test_expands_the_ancestor_categories(self):
+        service = self._service(
+            {"2": 20},
+            category_id_map={"1": 100, "2": 200, "3": 300},
+            IML_EXPAND_CATEGORY_ANCESTORS="true",
+        )
+
+        service.run(
+            [
+                _product("1", 1, category_ids=[3]),
+                _product("2", 2, category_ids=[2, 1]),
+            ]
+        )
+        service.run([_product("3", 3, category_ids=[2])])
+
+        (new_products, old_products, _), (more_new_products, _, _) = (
+            self.woocommerce_service.calls
+        )
+        self.assertEqual([300, 200, 100], _category_ids(new_products[0]))
+        self.assertEqual([200, 100], _category_ids(old_products[0]))
+        self.assertEqual([200, 100], _category_ids(more_new_products[0]))
+        self.assertEqual({"1", "2", "3"}, self.category_lookups[0])
+        # The index is kept for the category cache TTL
+        self.iml_service.get_category_list.assert_called_once_with()
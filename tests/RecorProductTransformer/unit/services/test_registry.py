@@ -0,0 +1,46 @@
+import threading
+import unittest
+
+from recor_layer.services.registry import Registry
+
+
+class Client:
+    instances = 0
+
+    def __init__(self, region_name="us-east-1"):
+        Client.instances += 1
+        self.region_name = region_name
+
+
+class TestRegistry(unittest.TestCase):
+    def setUp(self):
+        Client.instances = 0
+        self.registry = Registry()
+
+    def test_get_builds_each_instance_once(self):
+        clients = []
+        threads = [
+            threading.Thread(target=lambda: clients.append(self.registry.get(Client)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(Client.instances, 1)
+        self.assertTrue(all(client is clients[0] for client in clients))
+        self.assertIn("Client", self.registry.init_seconds)
+
+    def test_get_keys_instances_by_arguments(self):
+        east = self.registry.get(Client, "us-east-1")
+        west = self.registry.get(Client, "us-west-2")
+
+        self.assertIsNot(east, west)
+        self.assertIs(east, self.registry.get(Client, "us-east-1"))
+
+    def test_reset(self):
+        client = self.registry.get(Client)
+        self.registry.reset()
+
+        self.assertIsNot(client, self.registry.get(Client))
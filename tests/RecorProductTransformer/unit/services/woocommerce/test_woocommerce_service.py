@@ -0,0 +1,68 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from recor_layer.services.woocommerce.woocommerce_service import (
+    MAX_BATCH_OBJECTS,
+    WooCommerceBatchError,
+    WooCommerceService,
+)
+
+
+class FakeBatchUpdateProductsRequest:
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.chunk_sizes = []
+
+    async def run_async(self, new_products=None, old_products=None, delete_product_ids=None):
+        self.chunk_sizes.append(
+            len(new_products) + len(old_products) + len(delete_product_ids)
+        )
+        if self.fail_on is not None and self.fail_on in delete_product_ids:
+            raise Exception("chunk failed")
+        # Finish chunks out of order
+        await asyncio.sleep(0.01 * (len(new_products) % 3))
+        return {
+            "create": [{"id": product["slug"]} for product in new_products],
+            "update": [{"id": product["id"]} for product in old_products],
+            "delete": [{"id": product_id} for product_id in delete_product_ids],
+        }
+
+
+class TestWooCommerceService(unittest.TestCase):
+    def setUp(self):
+        with mock.patch.dict(
+            "os.environ", {"WOOCOMMERCE_BASE_URL": "https://shop.example.com"}
+        ):
+            self.service = WooCommerceService()
+        self.service.max_concurrency = 3
+
+    def test_batch_update_products_chunks_and_keeps_input_order(self):
+        request = FakeBatchUpdateProductsRequest()
+        self.service.batch_update_products_request = request
+        new_products = [{"slug": f"new-{i}"} for i in range(150)]
+        old_products = [{"id": i} for i in range(120)]
+
+        response = self.service.batch_update_products(
+            new_products, old_products, delete_product_ids=[1000, 1001]
+        )
+
+        self.assertTrue(all(size <= MAX_BATCH_OBJECTS for size in request.chunk_sizes))
+        self.assertEqual(sum(request.chunk_sizes), 272)
+        self.assertEqual(
+            [product["id"] for product in response["create"]],
+            [product["slug"] for product in new_products],
+        )
+        self.assertEqual([product["id"] for product in response["update"]], list(range(120)))
+        self.assertEqual([product["id"] for product in response["delete"]], [1000, 1001])
+
+    def test_batch_update_products_failed_chunk_keeps_other_results(self):
+        self.service.batch_update_products_request = FakeBatchUpdateProductsRequest(
+            fail_on=1000
+        )
+        new_products = [{"slug": f"new-{i}"} for i in range(150)]
+
+        with self.assertRaises(WooCommerceBatchError) as raised:
+            self.service.batch_update_products(new_products, [], delete_product_ids=[1000])
+
+        self.assertEqual(len(raised.exception.response["create"]), MAX_BATCH_OBJECTS)
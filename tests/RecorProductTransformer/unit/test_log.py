@@ -0,0 +1,41 @@
+import io
+import unittest
+
+from recor_layer.log import INFO, WARNING, Logger, summarize
+
+
+class Unprintable:
+    def __repr__(self):
+        raise AssertionError("formatted a disabled log message")
+
+
+class TestLogger(unittest.TestCase):
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.log = Logger(level=INFO, max_payload_chars=80, stream=self.stream)
+
+    def test_writes_prefixed_messages_at_enabled_levels(self):
+        self.log.debug("body: %s", Unprintable())
+        self.log.attempt("Batch of %d products", 100)
+        self.log.warning("rate %.2f/s", 2.5)
+
+        self.assertEqual(
+            self.stream.getvalue(), "ATTEMPT: Batch of 100 products\nWARNING: rate 2.50/s\n"
+        )
+
+    def test_disabled_levels_are_not_formatted(self):
+        self.log.level = WARNING
+
+        self.log.success("response: %s", Unprintable())
+
+        self.assertEqual(self.stream.getvalue(), "")
+
+    def test_payloads_are_summarized_and_capped(self):
+        products = [{"id": i, "name": "x" * 50} for i in range(100)]
+
+        self.assertTrue(
+            summarize({"create": products}, 1000).startswith("{'create': [100 items: ")
+        )
+        self.assertTrue(summarize(products, 80).endswith("more chars)"))
+        self.assertEqual(summarize(b"x" * 100, 10), "xxxxxxxxxx... (90 more bytes)")
+        self.assertEqual(summarize(7, 10), 7)
@@ -0,0 +1,74 @@
+import unittest
+
+from recor_layer.metrics import MemorySink, Metrics
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.sink = MemorySink()
+        self.metrics = Metrics(
+            namespace="Test", dimensions={"Function": "f"}, sink=self.sink, clock=self.clock
+        )
+
+    def test_spans_are_flushed_as_one_emf_document(self):
+        with self.metrics.span("transform", items=100) as span:
+            self.clock.now += 0.5
+            span.add(bytes=2048)
+        with self.metrics.span("transform", items=100):
+            self.clock.now += 0.5
+        self.metrics.count("products_created", 3)
+
+        document = self.metrics.flush()
+
+        self.assertEqual(self.sink.documents, [document])
+        directive = document["_aws"]["CloudWatchMetrics"][0]
+        self.assertEqual(directive["Namespace"], "Test")
+        self.assertEqual(directive["Dimensions"], [["Function"]])
+        self.assertEqual(
+            {metric["Name"] for metric in directive["Metrics"]},
+            {
+                "transform.Calls",
+                "transform.Duration",
+                "transform.Items",
+                "transform.Bytes",
+                "transform.ItemsPerSecond",
+                "transform.BytesPerSecond",
+                "products_created",
+            },
+        )
+        self.assertEqual(document["Function"], "f")
+        self.assertEqual(document["transform.Calls"], 2)
+        self.assertEqual(document["transform.Duration"], 1000)
+        self.assertEqual(document["transform.ItemsPerSecond"], 200)
+        self.assertEqual(document["products_created"], 3)
+        self.assertIsNone(self.metrics.flush())
+
+    def test_failed_span_counts_an_error(self):
+        with self.assertRaises(ValueError):
+            with self.metrics.span("woocommerce_batch"):
+                raise ValueError("failed")
+
+        self.assertEqual(self.metrics.flush()["woocommerce_batch.Errors"], 1)
+
+    def test_timed_iter_counts_only_the_time_spent_producing_items(self):
+        def produce():
+            for item in range(3):
+                self.clock.now += 0.1
+                yield item
+
+        for _ in self.metrics.timed_iter("iml_parse", produce(), lambda: 300):
+            self.clock.now += 1
+
+        document = self.metrics.flush()
+        self.assertEqual(document["iml_parse.Items"], 3)
+        self.assertEqual(document["iml_parse.Bytes"], 300)
+        self.assertAlmostEqual(document["iml_parse.Duration"], 300)
@@ -1,23 +1,75 @@
-import copy
+import ast
 import json
 import os
 from unittest import TestCase
 
-from recor_layer.transformers.iml.iml_item_transformer import ImlItemTransformer
+from recor_layer.transformers.iml.iml_item_transformer import (
+    ImlItemTransformer,
+    build_category_ancestor_index,
+)
 
 SAMPLE_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_files")
 
 
+def load_sample(file_name):
+    with open(os.path.join(SAMPLE_DATA_DIR, file_name), "r") as fp:
+        if file_name.endswith(".json"):
+            return json.loads(fp.read())
+        return ast.literal_eval(fp.read())
+
+
 class TestImlProductTransformer(TestCase):
+    def setUp(self):
+        self.test_product_1 = load_sample("test_118748_iml_item.json")
+        self.expected_product_1 = load_sample("test_118748_woocommerce_product.py")
+        self.test_transformer = ImlItemTransformer()
 
     def test_transform_product(self):
-        with open(
-            os.path.join(SAMPLE_DATA_DIR, "test_118748_iml_item.json"), "r"
-        ) as fp:
-            test_product_1 = json.loads(fp.read())
+        category_id_map = {
+            str(category["id"]): category["id"]
+            for category in self.expected_product_1["categories"]
+        }
+
+        product = self.test_transformer.transform(
+            {**self.test_product_1, ImlItemTransformer.CATEGORY_ID_MAP: category_id_map}
+        )
+
+        for field in ("type", "slug", "sku", "name", "description", "stock_quantity"):
+            self.assertEqual(self.expected_product_1[field], getattr(product, field))
+        self.assertEqual(
+            [category["id"] for category in self.expected_product_1["categories"]],
+            [category.id for category in product.categories],
+        )
+
+    def test_transform_many_resolves_only_the_item_categories(self):
+        category_id_map = {str(i): 100 + i for i in range(1000)}
+        category_id_map["4"] = category_id_map["3"]  # Merged WooCommerce categories
+        raw_json = {**self.test_product_1, "category_id": [3, 4, 5, 3, 999999]}
+
+        (product,) = self.test_transformer.transform_many(
+            [raw_json], {ImlItemTransformer.CATEGORY_ID_MAP: category_id_map}
+        )
+
+        self.assertEqual([103, 105], [category.id for category in product.categories])
+        self.assertNotIn(ImlItemTransformer.CATEGORY_ID_MAP, raw_json)
+
+    def test_transform_many_expands_ancestor_categories(self):
+        ancestor_index = build_category_ancestor_index(
+            {"10": "25", "25": "3", "3": "-1", "4": "-1", "5": "4", "7": "8", "8": "7"}
+        )
+        category_id_map = {str(i): 100 + i for i in range(30)}
 
-        test_transformer = ImlItemTransformer()
-        raw_json = test_transformer.transform(test_product_1)
+        (product,) = self.test_transformer.transform_many(
+            [{**self.test_product_1, "category_id": [10, 5, 7]}],
+            {
+                ImlItemTransformer.CATEGORY_ID_MAP: category_id_map,
+                ImlItemTransformer.CATEGORY_ANCESTOR_INDEX: ancestor_index,
+            },
+        )
 
-        expected_json = copy.deepcopy(test_product_1)
-        self.assertEqual(expected_json, raw_json)
+        self.assertEqual(ancestor_index["10"], ("25", "3"))
+        self.assertEqual(ancestor_index["7"], ("8",))
+        self.assertEqual(
+            [110, 125, 103, 105, 104, 107, 108],
+            [category.id for category in product.categories],
+        )